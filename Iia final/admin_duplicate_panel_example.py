@@ -62,7 +62,7 @@ class AdminDuplicatePanel:
         button_frame = ttk.Frame(main_frame)
         button_frame.pack(fill=tk.X, padx=5, pady=10)
 
-        self.refresh_btn = ttk.Button(button_frame, text="🔄 Refresh Stats", command=self.refresh_stats)
+        self.refresh_btn = ttk.Button(button_frame, text="🔄 Refresh Stats", command=lambda: self.refresh_stats(rescan=True))
         self.refresh_btn.pack(side=tk.LEFT, padx=5)
 
         self.details_btn = ttk.Button(button_frame, text="📋 View Details", command=self.show_details)
@@ -75,7 +75,7 @@ class AdminDuplicatePanel:
         self.status_label = tk.Label(main_frame, text="Ready", fg="green", font=("Arial", 9))
         self.status_label.pack(anchor="w", padx=5, pady=5)
 
-        # Load initial stats
+        # Load initial stats (the last saved scan, so the panel opens instantly)
         self.refresh_stats()
 
     def _create_stat_box(self, parent, label, key, row, col):
@@ -87,13 +87,13 @@ class AdminDuplicatePanel:
         self.stat_labels[key] = tk.Label(frame, text="--", font=("Arial", 16, "bold"))
         self.stat_labels[key].pack()
 
-    def refresh_stats(self):
-        """Refresh statistics from database"""
+    def refresh_stats(self, rescan: bool = False):
+        """Refresh statistics from the stored scan, or rescan the databases"""
         try:
-            self.status_label.config(text="⏳ Loading...", fg="orange")
+            self.status_label.config(text="⏳ Scanning databases..." if rescan else "⏳ Loading...", fg="orange")
             self.parent.update()
 
-            self.last_stats = self.widget.get_duplicate_stats(refresh=True)
+            self.last_stats = self.widget.get_duplicate_stats(refresh=rescan)
 
             # Update stat displays
             for key, label_widget in self.stat_labels.items():
@@ -213,7 +213,7 @@ class AdminDuplicatePanel:
 
             from duplicate_analysis_report import DuplicateAnalysisReport
             report = DuplicateAnalysisReport()
-            analysis = report.analyze_duplicates()
+            analysis = report.stored_or_fresh_report()
             report.export_report_csv(analysis)
 
             messagebox.showinfo("Export Successful", "Report exported to CSV file!")
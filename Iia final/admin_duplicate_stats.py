@@ -4,12 +4,14 @@ Admin Dashboard Widget - Duplicate Statistics Display
 
 Shows duplicate counts and cancellation status in the admin dashboard.
 Can be embedded into the main app or used as standalone monitoring tool.
+Reads the last saved scan from the duplicate store; pass refresh=True to rescan.
 """
 
+import sqlite3
 import sys
 import os
 from datetime import datetime
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
@@ -29,14 +31,17 @@ class DuplicateStatsWidget:
         Get current duplicate statistics
         
         Args:
-            refresh: If True, re-analyze database. If False, use cached results.
+            refresh: If True, re-analyze database. If False, use the last saved scan
+                     (from the duplicate store), scanning only if there is none.
         
         Returns:
             Dictionary with duplicate statistics
         """
-        if refresh or self.last_report is None:
+        if refresh:
             self.last_report = self.analyzer.analyze_duplicates()
-            self.last_update = datetime.now()
+        elif self.last_report is None:
+            self.last_report = self._stored_summary() or self.analyzer.analyze_duplicates()
+        self.last_update = datetime.fromisoformat(self.last_report["timestamp"])
 
         return {
             "total_duplicates": self.last_report["total_duplicates_found"],
@@ -53,23 +58,55 @@ class DuplicateStatsWidget:
             "last_updated": self.last_update.isoformat() if self.last_update else None,
         }
 
-    def get_active_duplicates_list(self) -> list:
-        """Get list of active duplicates that need attention"""
+    def _stored_summary(self) -> Optional[Dict[str, Any]]:
+        """Counters of the last saved scan (no pair lists), None if nothing is stored"""
+        if self.analyzer.store is None:
+            return None
+        try:
+            return self.analyzer.store.summary()
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not read stored duplicate stats: {e}")
+            return None
+
+    def _duplicate_details(self, key: str, status: str, limit: int = None) -> list:
         if self.last_report is None:
-            self.get_duplicate_stats(refresh=True)
-        
+            self.get_duplicate_stats()
+
         if self.last_report is None:
             return []
-        return self.last_report.get("active_details", [])
-
-    def get_cancelled_duplicates_list(self) -> list:
+        if key not in self.last_report and self.analyzer.store is not None:
+            # Stored summaries carry counts only; the pairs are read from the store on demand
+            try:
+                return self.analyzer.store.pairs(status=status, limit=limit)
+            except sqlite3.Error as e:
+                print(f"⚠️ Could not read stored duplicates: {e}")
+                return []
+        details = self.last_report.get(key, [])
+        return details[:limit] if limit is not None else details
+
+    def get_active_duplicates_list(self, limit: int = None) -> list:
+        """Get list of active duplicates that need attention (most similar first when stored)"""
+        return self._duplicate_details("active_details", "active", limit)
+
+    def get_cancelled_duplicates_list(self, limit: int = None) -> list:
         """Get list of cancelled duplicates"""
-        if self.last_report is None:
-            self.get_duplicate_stats(refresh=True)
-        
-        if self.last_report is None:
+        return self._duplicate_details("cancelled_details", "cancelled", limit)
+
+    def get_duplicates_of(self, source: str, provider_id: int) -> List[Dict[str, Any]]:
+        """
+        Stored duplicate pairs involving one provider
+
+        Args:
+            source: 'primary' for a company, 'secondary' for an employee
+            provider_id: company_id or employee_id
+        """
+        if self.analyzer.store is None:
+            return []
+        try:
+            return self.analyzer.store.duplicates_of(source, provider_id)
+        except sqlite3.Error as e:
+            print(f"⚠️ Could not read stored duplicates: {e}")
             return []
-        return self.last_report.get("cancelled_details", [])
 
     def print_dashboard_summary(self):
         """Print a simple dashboard summary"""
@@ -110,7 +147,7 @@ class DuplicateStatsWidget:
         # Show sample active duplicates
         if stats["active_duplicates"] > 0:
             print("\n📋 SAMPLE ACTIVE DUPLICATES (Top 5):")
-            active_dups = self.get_active_duplicates_list()[:5]
+            active_dups = self.get_active_duplicates_list(limit=5)
             for idx, dup in enumerate(active_dups, 1):
                 if dup["type"] == "cross-database":
                     print(
@@ -133,7 +170,7 @@ def print_quick_stats():
     print("=" * 60)
 
     widget = DuplicateStatsWidget()
-    stats = widget.get_duplicate_stats(refresh=True)
+    stats = widget.get_duplicate_stats()
 
     print(f"\n📈 Results:")
     print(f"   Total Providers: {stats['total_providers']}")
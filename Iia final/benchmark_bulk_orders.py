@@ -0,0 +1,113 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row vs bulk order writes on the primary database
+
+Creates --orders orders with create_order_permanent (one INSERT and commit
+per order) and the same number with create_orders_bulk (one multi-row INSERT
+per chunk), then completes each set with update_order_status_permanent and
+update_order_statuses_bulk, and prints orders/second for every path. Both
+bulk calls must report every row as created / updated.
+
+Runs against the configured primary database. The benchmark orders carry a
+marker in customer_notes and are deleted afterwards (--keep leaves them).
+
+    python benchmark_bulk_orders.py --orders 2000
+    python benchmark_bulk_orders.py --orders 20000 --chunk-size 1000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from distributed_database_manager import DistributedDatabaseManager
+
+MARKER = 'benchmark_bulk_orders'
+
+
+def make_orders(count: int, customer_id: int):
+    return [
+        {
+            'customer_id': customer_id,
+            'provider_id': i % 1000,
+            'provider_type': 'company' if i % 2 else 'individual',
+            'service_type': ('plumbing', 'electrical', 'painting', 'cleaning')[i % 4],
+            'service_description': f'Benchmark order {i}',
+            'urgency': 'medium',
+            'estimated_cost': 100 + i % 50,
+            'customer_notes': MARKER,
+        }
+        for i in range(count)
+    ]
+
+
+def timed(fn):
+    started = time.perf_counter()
+    # The per-row paths print one line per order
+    with contextlib.redirect_stdout(io.StringIO()):
+        result = fn()
+    return result, time.perf_counter() - started
+
+
+def report(label: str, count: int, seconds: float, baseline: float = None):
+    speedup = f"  x{baseline / seconds:.1f}" if baseline else ""
+    print(f"  {label:<34}{seconds:>8.2f} s{count / seconds:>12,.0f} orders/s{speedup}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--orders', type=int, default=2000, help='orders per path')
+    parser.add_argument('--chunk-size', type=int, default=None, help='rows per bulk transaction (ORDER_CONFIG default)')
+    parser.add_argument('--customer-id', type=int, default=1)
+    parser.add_argument('--keep', action='store_true', help='keep the benchmark orders')
+    args = parser.parse_args()
+
+    db_manager = DistributedDatabaseManager()
+    if not db_manager.primary_pool:
+        print("❌ No connection to the primary database")
+        sys.exit(1)
+
+    orders = make_orders(args.orders, args.customer_id)
+    print("=" * 72)
+    print(f"Order writes: {args.orders} orders per path")
+    print("=" * 72)
+    try:
+        per_row_ids, per_row_create = timed(lambda: [
+            db_manager.create_order_permanent(
+                order['customer_id'], order['provider_id'], order['provider_type'], order['service_type'],
+                order['service_description'], order['urgency'], order['estimated_cost'], order['customer_notes'])
+            for order in orders
+        ])
+        report("create_order_permanent", args.orders, per_row_create)
+
+        outcomes, bulk_create = timed(lambda: db_manager.create_orders_bulk(orders, args.chunk_size))
+        report("create_orders_bulk", args.orders, bulk_create, per_row_create)
+        bulk_ids = [outcome['order_id'] for outcome in outcomes if outcome['status'] == 'created']
+
+        _, per_row_update = timed(lambda: [
+            db_manager.update_order_status_permanent(order_id, 'completed') for order_id in per_row_ids if order_id
+        ])
+        report("update_order_status_permanent", args.orders, per_row_update)
+
+        updates, bulk_update = timed(lambda: db_manager.update_order_statuses_bulk(
+            [{'order_id': order_id, 'status': 'completed'} for order_id in bulk_ids], args.chunk_size))
+        report("update_order_statuses_bulk", args.orders, bulk_update, per_row_update)
+
+        updated = sum(outcome['status'] == 'updated' for outcome in updates)
+        ok = len(bulk_ids) == args.orders and updated == args.orders and all(per_row_ids)
+        print(f"\n  {'✅' if ok else '❌'} created {len(bulk_ids)}/{args.orders} bulk, "
+              f"{sum(map(bool, per_row_ids))}/{args.orders} per row; updated {updated}/{args.orders} bulk")
+    finally:
+        if not args.keep:
+            deleted = db_manager._execute_write(  # pylint: disable=protected-access
+                "DELETE FROM ORDER_TABLE WHERE customer_notes = %s", (MARKER,), 'primary')
+            print(f"  🧹 Removed {deleted} benchmark orders")
+        db_manager.close_connections()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-result vs batched cross-source enrichment
+
+Builds --size primary results and --size secondary results (the same name
+generator as benchmark_incremental_duplicates.py, with part of the secondary
+names being variants of primary ones), then enriches every primary result
+against the secondary list twice: with enhance_result_with_cross_source_info
+per result, and with one enhance_results_with_cross_source_info call. The
+matches of both runs are compared entry by entry.
+
+    python benchmark_cross_source_enrichment.py --size 2000
+"""
+
+import argparse
+import copy
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_incremental_duplicates import make_name
+from string_similarity_matcher import StringSimplicityMatcher
+
+VARIANTS = [' LLC', ' Services', ' Co.', ' & Sons', 's', '']
+
+
+def make_results(size: int, seed: int):
+    rng = random.Random(seed)
+    primary = [{'id': i, 'name': make_name(rng), 'data_source': 'Primary', 'rating': round(rng.uniform(1, 5), 1)}
+               for i in range(size)]
+    secondary = []
+    for i in range(size):
+        # A fifth of the workers are listed under (a variant of) a company's name
+        name = rng.choice(primary)['name'] + rng.choice(VARIANTS) if rng.random() < 0.2 else make_name(rng)
+        secondary.append({'id': i, 'name': name, 'data_source': 'Secondary', 'rating': round(rng.uniform(1, 5), 1)})
+    return primary, secondary
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--size', type=int, default=2000, help='results per source')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    primary, secondary = make_results(args.size, args.seed)
+    per_result, batched = copy.deepcopy(primary), copy.deepcopy(primary)
+
+    StringSimplicityMatcher.clear_canonical_cache()
+    started = time.perf_counter()
+    for result in per_result:
+        StringSimplicityMatcher.enhance_result_with_cross_source_info(result, secondary)
+    loop_seconds = time.perf_counter() - started
+
+    StringSimplicityMatcher.clear_canonical_cache()
+    started = time.perf_counter()
+    StringSimplicityMatcher.enhance_results_with_cross_source_info(batched, secondary)
+    batch_seconds = time.perf_counter() - started
+
+    matched = sum('cross_source_match' in result for result in batched)
+    same = per_result == batched
+
+    print("=" * 60)
+    print(f"Cross-source enrichment: {args.size} x {args.size} providers")
+    print("=" * 60)
+    print(f"  per-result loop   {loop_seconds:>8.2f} s")
+    print(f"  batched           {batch_seconds:>8.2f} s   (x{loop_seconds / batch_seconds:.1f})")
+    print(f"  matched results   {matched:>8}")
+    print(f"  {'✅ identical matches' if same else '❌ MATCHES DIFFER'}")
+
+
+if __name__ == "__main__":
+    main()
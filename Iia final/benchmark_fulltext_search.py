@@ -0,0 +1,211 @@
+#!/usr/bin/env python3
+"""
+Benchmark: FULLTEXT vs LIKE provider search, with an EXPLAIN regression check
+
+The EXPLAIN check runs explain_search_queries() for every service type below
+and fails (exit status 1) when a node's migration did not install the
+FULLTEXT indexes, an EXPLAIN fails, or a search plan scans a whole providers
+table. With --explain-only nothing is written, so it can run after every
+schema or query change.
+
+The benchmark seeds --providers providers (half companies on the primary,
+half employees on the secondary, built from a small trade vocabulary so each
+search matches a realistic share), runs the EXPLAIN check on the seeded
+tables, then times every search with the FULLTEXT query and with the old LIKE
+query (fulltext_ready switched off for the run). Seeded rows carry the email
+domain below and are deleted afterwards (--keep leaves them).
+
+    python benchmark_fulltext_search.py --explain-only
+    python benchmark_fulltext_search.py --providers 100000 --repeat 5
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mysql.connector import Error
+
+from distributed_database_manager import DistributedDatabaseManager
+
+SEED_DOMAIN = 'benchmark.invalid'
+
+SEARCHES = ['plumbing', 'electrical', 'painting', 'hvac repair', 'landscaping', 'emergency roof leak']
+
+TRADES = {
+    'Plumbing': ['pipe repair', 'drain cleaning', 'water heater', 'leak detection'],
+    'Electrical': ['wiring', 'panel upgrade', 'lighting', 'outlet repair'],
+    'Painting': ['interior painting', 'exterior painting', 'drywall', 'staining'],
+    'HVAC': ['hvac repair', 'air conditioning', 'furnace', 'duct cleaning'],
+    'Landscaping': ['lawn care', 'tree trimming', 'irrigation', 'garden design'],
+    'Roofing': ['roof leak', 'shingles', 'gutters', 'emergency roof repair'],
+    'Cleaning': ['deep cleaning', 'carpet cleaning', 'window cleaning', 'move out'],
+    'Carpentry': ['cabinets', 'decks', 'framing', 'trim work'],
+}
+REGIONS = ['Downtown', 'Northside', 'Southside', 'Eastside', 'Westside', 'Suburbs']
+
+
+def company_rows(count: int, rng: random.Random):
+    for i in range(count):
+        trade = rng.choice(list(TRADES))
+        areas = ", ".join(rng.sample(TRADES[trade], 2))
+        yield (f"{rng.choice(REGIONS)} {trade} Pros {i}", trade, f"{trade} services: {areas}",
+               round(rng.uniform(1, 5), 2), rng.randint(0, 500), '555-0100', f"company{i}@{SEED_DOMAIN}", '',
+               areas, ", ".join(rng.sample(REGIONS, 2)))
+
+
+def employee_rows(count: int, rng: random.Random):
+    for i in range(count):
+        trade = rng.choice(list(TRADES))
+        skills = rng.sample(TRADES[trade], 2)
+        yield (f"Worker {i}", f"worker{i}@{SEED_DOMAIN}", '555-0101', trade.lower(),
+               rng.choice(['Basic', 'Professional', 'Master']), rng.randint(0, 25), round(rng.uniform(1, 5), 2),
+               rng.randint(0, 400), f"Experienced in {skills[0]} and {skills[1]}", rng.randint(30, 120),
+               ", ".join(rng.sample(REGIONS, 2)), rng.random() < 0.2,
+               'Available' if rng.random() < 0.8 else 'Busy')
+
+
+SEED_STATEMENTS = {
+    'primary': """
+        INSERT INTO companies (company_name, business_type, description, rating, total_reviews,
+                               phone, email, website, specialization_areas, service_regions)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+    'secondary': """
+        INSERT INTO employee (name, email, phone, specialization, certification_level, experience_years,
+                              rating, total_completed_orders, bio, avg_cost_per_hour, preferred_regions,
+                              emergency_service, availability_status)
+        VALUES (%s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s, %s)
+    """,
+}
+
+
+def seed(db_manager: DistributedDatabaseManager, providers: int, seed_value: int):
+    rng = random.Random(seed_value)
+    rows = {'primary': list(company_rows(providers // 2, rng)),
+            'secondary': list(employee_rows(providers - providers // 2, rng))}
+    for node, node_rows in rows.items():
+        with db_manager._get_pool(node).connection() as connection:  # pylint: disable=protected-access
+            cursor = connection.cursor()
+            try:
+                for chunk in DistributedDatabaseManager._chunks(node_rows, 1000):  # pylint: disable=protected-access
+                    cursor.executemany(SEED_STATEMENTS[node], chunk)
+                if node == 'primary':
+                    # Map the seeded companies to services the same way the migration backfill did
+                    cursor.execute(f"""
+                        INSERT IGNORE INTO COMPANY_SERVICES (company_id, service_id)
+                        SELECT c.company_id, s.service_id
+                        FROM companies c
+                        JOIN SERVICE_TYPE s ON c.business_type LIKE CONCAT('%', s.category, '%')
+                        WHERE c.email LIKE '%@{SEED_DOMAIN}'
+                    """)
+                # Refresh statistics so the plans are the ones a full table would get
+                cursor.execute("ANALYZE TABLE companies" if node == 'primary' else "ANALYZE TABLE employee")
+                cursor.fetchall()
+                connection.commit()
+            finally:
+                cursor.close()
+
+
+def remove_seeded(db_manager: DistributedDatabaseManager) -> int:
+    """Delete the seeded providers (and their service mappings); returns the providers removed"""
+    pattern = (f"%@{SEED_DOMAIN}",)
+    write = db_manager._execute_write  # pylint: disable=protected-access
+    write("DELETE cs FROM COMPANY_SERVICES cs JOIN companies c ON c.company_id = cs.company_id "
+          "WHERE c.email LIKE %s", pattern, 'primary')
+    return (write("DELETE FROM companies WHERE email LIKE %s", pattern, 'primary')
+            + write("DELETE FROM employee WHERE email LIKE %s", pattern, 'secondary'))
+
+
+def explain_check(db_manager: DistributedDatabaseManager) -> bool:
+    """EXPLAIN every search; False when an indexed search regressed to a table scan"""
+    print("EXPLAIN regression check:")
+    ok = True
+    for service_type in SEARCHES:
+        for node, result in db_manager.explain_search_queries(service_type).items():
+            if result['status'] == 'offline':
+                print(f"  ℹ️ {node:<10} {service_type:<22} node offline - skipped")
+                continue
+            if result['status'] == 'error':
+                ok = False
+                print(f"  ❌ {node:<10} {service_type:<22} EXPLAIN failed: {result['reason']}")
+            elif not result['fulltext']:
+                ok = False
+                print(f"  ❌ {node:<10} {service_type:<22} FULLTEXT indexes missing (LIKE fallback)")
+            elif result['full_scans']:
+                ok = False
+                print(f"  ❌ {node:<10} {service_type:<22} full table scan on {', '.join(result['full_scans'])}")
+            else:
+                access = sorted({row.get('type') for row in result['plan'] if row.get('type')})
+                print(f"  ✅ {node:<10} {service_type:<22} access: {', '.join(access)}")
+    return ok
+
+
+def time_searches(db_manager: DistributedDatabaseManager, repeat: int):
+    """ms per query and rows returned, FULLTEXT vs LIKE, per node"""
+    builders = {'primary': db_manager._company_search_sql,  # pylint: disable=protected-access
+                'secondary': db_manager._employee_search_sql}  # pylint: disable=protected-access
+    indexed = dict(db_manager.fulltext_ready)
+    print(f"\n  {'node':<10}{'search':<22}{'FULLTEXT ms':>12}{'rows':>6}{'LIKE ms':>10}{'rows':>6}{'speedup':>9}")
+    for node, builder in builders.items():
+        for service_type in SEARCHES:
+            timings = {}
+            for mode in ('fulltext', 'like'):
+                db_manager.fulltext_ready[node] = indexed[node] and mode == 'fulltext'
+                query, params = builder(service_type)
+                try:
+                    started = time.perf_counter()
+                    for _ in range(repeat):
+                        rows = db_manager.execute_query(query, tuple(params) if params else None, node,
+                                                        raise_errors=True)
+                    timings[mode] = ((time.perf_counter() - started) / repeat * 1000, len(rows))
+                finally:
+                    db_manager.fulltext_ready[node] = indexed[node]
+            (fulltext_ms, fulltext_rows), (like_ms, like_rows) = timings['fulltext'], timings['like']
+            print(f"  {node:<10}{service_type:<22}{fulltext_ms:>12.1f}{fulltext_rows:>6}"
+                  f"{like_ms:>10.1f}{like_rows:>6}{like_ms / fulltext_ms:>8.1f}x")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--providers', type=int, default=100_000, help='providers to seed (half per node)')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per search and mode')
+    parser.add_argument('--seed', type=int, default=11)
+    parser.add_argument('--explain-only', action='store_true', help='only the EXPLAIN check, no seeding')
+    parser.add_argument('--keep', action='store_true', help='keep the seeded providers')
+    args = parser.parse_args()
+
+    db_manager = DistributedDatabaseManager()
+    if not (db_manager.primary_pool and db_manager.secondary_pool):
+        print("❌ Both the primary and the secondary database are needed")
+        sys.exit(1)
+
+    print("=" * 78)
+    print("Provider search: " + ("EXPLAIN check" if args.explain_only else f"{args.providers:,} seeded providers"))
+    print("=" * 78)
+    ok = True
+    try:
+        if not args.explain_only:
+            started = time.perf_counter()
+            seed(db_manager, args.providers, args.seed)
+            print(f"💾 Seeded {args.providers:,} providers in {time.perf_counter() - started:.1f} s\n")
+        ok = explain_check(db_manager)
+        if not args.explain_only:
+            time_searches(db_manager, args.repeat)
+    except Error as e:
+        print(f"❌ Benchmark failed: {e}")
+        ok = False
+    finally:
+        if not (args.explain_only or args.keep):
+            print(f"\n🧹 Removed {remove_seeded(db_manager):,} seeded providers")
+        db_manager.close_connections()
+
+    print(f"\n{'✅ search plans use the FULLTEXT indexes' if ok else '❌ SEARCH PLAN REGRESSION'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
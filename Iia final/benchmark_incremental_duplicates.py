@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+Benchmark: incremental duplicate scan vs the provider baseline
+
+Builds a baseline duplicate store (the provider snapshot of a full scan) for
+--providers generated companies/employees, then changes --changed of them
+(renames, availability changes, new and deleted providers) and times
+DuplicateAnalysisReport.analyze_incremental against it. The providers come
+from an in-memory stand-in for the database manager, so only the scan itself
+is measured. --full also times a full analyze_duplicates for comparison
+(slow at the default size).
+
+    python benchmark_incremental_duplicates.py --providers 500000 --changed 1000
+    python benchmark_incremental_duplicates.py --providers 20000 --changed 1000 --full
+"""
+
+import argparse
+import io
+import os
+import random
+import sys
+import tempfile
+import time
+from contextlib import redirect_stdout
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+
+SYLLABLES = ['ka', 'lo', 'mi', 'ren', 'tor', 'sa', 'vel', 'din', 'mar', 'co', 'ber', 'lin', 'ta', 'gro',
+             'fen', 'hal', 'ri', 'son', 'pe', 'dra', 'kel', 'nor', 'vi', 'les', 'mon', 'ash', 'bel', 'cro']
+TRADES = ['Plumbing', 'Electric', 'Roofing', 'Cleaning', 'Landscaping', 'Painting', 'HVAC', 'Handyman',
+          'Moving', 'Carpentry', 'Locksmith', 'Pest Control']
+SUFFIXES = ['', '', ' LLC', ' Services', ' Co.', ' Inc']
+
+
+class SyntheticProviders:
+    """Answers the report's provider queries from in-memory rows with an updated_at counter"""
+
+    def __init__(self):
+        self.companies = {}
+        self.employees = {}
+        self.clock = 0
+
+    def touch(self, row):
+        self.clock += 1
+        row['updated_at'] = self.clock
+
+    def _rows(self, connection_name):
+        return self.companies if connection_name == 'primary' else self.employees
+
+    def execute_query(self, query, params=None, connection_name='primary', modify=False):
+        if 'high_water' in query:
+            return [{'high_water': max((row['updated_at'] for row in self._rows(connection_name).values()), default=0)}]
+        return []
+
+    def iter_query(self, query, params=None, connection_name='primary', row_type='dict', batch_size=None):
+        rows = self._rows(connection_name)
+        if row_type == 'tuple':
+            return ((provider_id,) for provider_id in list(rows))
+        if params:
+            since = int(params[0])
+            return (dict(row) for row in list(rows.values()) if row['updated_at'] >= since)
+        return (dict(row) for row in list(rows.values()))
+
+
+def make_name(rng: random.Random) -> str:
+    def word():
+        return ''.join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3))).capitalize()
+    return f"{word()} {word()} {rng.choice(TRADES)}{rng.choice(SUFFIXES)}"
+
+
+def populate(db: SyntheticProviders, providers: int, rng: random.Random):
+    for provider_id in range(1, providers // 2 + 1):
+        db.companies[provider_id] = {'company_id': provider_id, 'company_name': make_name(rng),
+                                     'rating': round(rng.uniform(1, 5), 1)}
+        db.touch(db.companies[provider_id])
+        db.employees[provider_id] = {'employee_id': provider_id, 'name': make_name(rng),
+                                     'rating': round(rng.uniform(1, 5), 1),
+                                     'availability_status': rng.choice(['available', 'busy', 'offline'])}
+        db.touch(db.employees[provider_id])
+    # Some genuine duplicates: employees registered under their company's name
+    for provider_id in rng.sample(range(1, providers // 2 + 1), max(1, providers // 100)):
+        db.employees[provider_id]['name'] = db.companies[provider_id]['company_name']
+
+
+def apply_changes(db: SyntheticProviders, changed: int, rng: random.Random):
+    """40% renames, 30% availability changes, 20% new providers, 10% deletions"""
+    next_id = max(db.companies) + 1
+    for _ in range(changed * 4 // 10):
+        rows = db.companies if rng.random() < 0.5 else db.employees
+        row = rows[rng.choice(list(rows))]
+        row['company_name' if 'company_id' in row else 'name'] = make_name(rng)
+        db.touch(row)
+    for _ in range(changed * 3 // 10):
+        row = db.employees[rng.choice(list(db.employees))]
+        row['availability_status'] = 'available' if row['availability_status'] != 'available' else 'busy'
+        db.touch(row)
+    for _ in range(changed * 2 // 10):
+        if rng.random() < 0.5:
+            db.companies[next_id] = {'company_id': next_id, 'company_name': make_name(rng), 'rating': 4.0}
+            db.touch(db.companies[next_id])
+        else:
+            db.employees[next_id] = {'employee_id': next_id, 'name': make_name(rng), 'rating': 4.0,
+                                     'availability_status': 'available'}
+            db.touch(db.employees[next_id])
+        next_id += 1
+    for _ in range(changed // 10):
+        rows = db.companies if rng.random() < 0.5 else db.employees
+        del rows[rng.choice(list(rows))]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--providers', type=int, default=500000, help='baseline providers (half companies, half employees)')
+    parser.add_argument('--changed', type=int, default=1000, help='providers changed before the incremental pass')
+    parser.add_argument('--full', action='store_true', help='also time a full scan of the changed data')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    config.DUPLICATE_STORE_CONFIG['db_file'] = os.path.join(tempfile.mkdtemp(), 'benchmark_duplicates.sqlite3')
+    import duplicate_analysis_report
+    from duplicate_analysis_report import DuplicateAnalysisReport
+
+    rng = random.Random(args.seed)
+    db = SyntheticProviders()
+    populate(db, args.providers, rng)
+    duplicate_analysis_report.DistributedDatabaseManager = lambda: db
+    analyzer = DuplicateAnalysisReport()
+
+    # Baseline: the snapshot a nightly full scan leaves behind (its pair search is not run here)
+    started = time.perf_counter()
+    analyzer.store.replace_providers(
+        {
+            'primary': [analyzer._snapshot_entry('primary', row) for row in db.companies.values()],
+            'secondary': [analyzer._snapshot_entry('secondary', row) for row in db.employees.values()],
+        },
+        {'primary': db.clock, 'secondary': db.clock},
+    )
+    analyzer.store.replace_all([], len(db.companies), len(db.employees))
+    snapshot_seconds = time.perf_counter() - started
+
+    apply_changes(db, args.changed, rng)
+    started = time.perf_counter()
+    with redirect_stdout(io.StringIO()):
+        result = analyzer.analyze_incremental()
+    incremental_seconds = time.perf_counter() - started
+
+    print("=" * 60)
+    print(f"Incremental duplicate scan: {args.changed} changes vs {args.providers} providers")
+    print("=" * 60)
+    print(f"  baseline snapshot write           {snapshot_seconds:>9.2f} s")
+    print(f"  incremental pass                  {incremental_seconds:>9.2f} s")
+    print(f"    changed / removed providers     {result['changed_providers']:>9} / {result['removed_providers']}")
+    print(f"    pairs added / updated / retired {result['pairs_added']:>9} / {result['pairs_updated']} / {result['pairs_retired']}")
+    print(f"    stored size                     {os.path.getsize(analyzer.store.path) / 1e6:>9.1f} MB")
+
+    if args.full:
+        started = time.perf_counter()
+        with redirect_stdout(io.StringIO()):
+            analyzer.analyze_duplicates()
+        print(f"  full scan (same data)             {time.perf_counter() - started:>9.2f} s")
+
+
+if __name__ == "__main__":
+    main()
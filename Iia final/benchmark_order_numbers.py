@@ -0,0 +1,156 @@
+#!/usr/bin/env python3
+"""
+Benchmark: concurrent booking with block-allocated order numbers
+
+--bookers threads book --orders orders in total, spread over --instances
+allocators (one per app instance sharing the counter row), and every order
+number is checked for uniqueness.
+
+By default the ORDER_SEQUENCE row is simulated in memory (each block
+reservation is an atomic update costing --latency-ms, like a round trip), so
+the allocator alone is measured and no database is needed. With --mysql the
+bookers call create_order_permanent against the configured primary database,
+one DistributedDatabaseManager per instance; uniqueness is then checked on
+the order numbers stored in ORDER_TABLE, and the benchmark orders (tagged in
+customer_notes) are deleted afterwards unless --keep is given.
+
+    python benchmark_order_numbers.py --bookers 16 --orders 20000
+    python benchmark_order_numbers.py --mysql --bookers 16 --orders 2000
+"""
+
+import argparse
+import contextlib
+import io
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from config import ORDER_CONFIG
+from sequence_allocator import BlockSequenceAllocator
+
+MARKER = 'benchmark_order_numbers'
+
+
+class SimulatedCounterPool:
+    """Stands in for a NodeConnectionPool holding the ORDER_SEQUENCE row"""
+
+    def __init__(self, latency: float):
+        self.latency = latency
+        self.next_value = 1
+        self.round_trips = 0
+        self._row_lock = threading.Lock()  # the row lock MySQL takes for the UPDATE
+
+    @contextlib.contextmanager
+    def connection(self):
+        yield self
+
+    def cursor(self):
+        return _SimulatedCursor(self)
+
+    def commit(self):
+        pass
+
+
+class _SimulatedCursor:
+    def __init__(self, pool: SimulatedCounterPool):
+        self.pool = pool
+        self.rowcount = 0
+        self.lastrowid = None
+
+    def execute(self, query: str, params=None):
+        # UPDATE ORDER_SEQUENCE SET next_value = LAST_INSERT_ID(next_value) + %s WHERE name = %s
+        time.sleep(self.pool.latency)
+        with self.pool._row_lock:  # pylint: disable=protected-access
+            self.lastrowid = self.pool.next_value
+            self.pool.next_value += params[0]
+            self.pool.round_trips += 1
+        self.rowcount = 1
+
+    def close(self):
+        pass
+
+
+def book_simulated(args):
+    """Order numbers from --instances allocators sharing one simulated counter row"""
+    pool = SimulatedCounterPool(args.latency_ms / 1000)
+    allocators = [BlockSequenceAllocator(pool, 'order_number', args.block_size) for _ in range(args.instances)]
+
+    def book(i):
+        return allocators[i % len(allocators)].next_value()
+
+    with ThreadPoolExecutor(max_workers=args.bookers) as executor:
+        started = time.perf_counter()
+        numbers = list(executor.map(book, range(args.orders)))
+        seconds = time.perf_counter() - started
+    return numbers, seconds, pool.round_trips
+
+
+def book_mysql(args):
+    """Real bookings through create_order_permanent, one manager per instance"""
+    from distributed_database_manager import DistributedDatabaseManager
+
+    managers = [DistributedDatabaseManager() for _ in range(args.instances)]
+    if not all(manager.primary_pool and manager.order_numbers for manager in managers):
+        print("❌ No connection to the primary database")
+        sys.exit(1)
+
+    def book(i):
+        manager = managers[i % len(managers)]
+        return manager.create_order_permanent(
+            args.customer_id, i % 1000, 'company', 'plumbing', f'Benchmark booking {i}', 'medium', 100.0, MARKER)
+
+    try:
+        with ThreadPoolExecutor(max_workers=args.bookers) as executor, \
+                contextlib.redirect_stdout(io.StringIO()):  # one line per order otherwise
+            started = time.perf_counter()
+            list(executor.map(book, range(args.orders)))
+            seconds = time.perf_counter() - started
+
+        # What was actually stored (a failed booking is simply missing)
+        rows = managers[0].execute_query(
+            "SELECT order_number FROM ORDER_TABLE WHERE customer_notes = %s", (MARKER,))
+        numbers = [row['order_number'] for row in rows]
+        return numbers, seconds, sum(manager.order_numbers.blocks_reserved for manager in managers)
+    finally:
+        if not args.keep:
+            deleted = managers[0]._execute_write(  # pylint: disable=protected-access
+                "DELETE FROM ORDER_TABLE WHERE customer_notes = %s", (MARKER,), 'primary')
+            print(f"  🧹 Removed {deleted} benchmark orders")
+        for manager in managers:
+            manager.close_connections()
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--bookers', type=int, default=16, help='parallel booking threads')
+    parser.add_argument('--orders', type=int, default=20000, help='orders booked in total')
+    parser.add_argument('--instances', type=int, default=2, help='allocators / app instances sharing the counter')
+    parser.add_argument('--block-size', type=int, default=ORDER_CONFIG.get('number_block_size', 50))
+    parser.add_argument('--latency-ms', type=float, default=1.0, help='simulated round trip per block reservation')
+    parser.add_argument('--mysql', action='store_true', help='book real orders on the primary database')
+    parser.add_argument('--customer-id', type=int, default=1)
+    parser.add_argument('--keep', action='store_true', help='keep the benchmark orders (--mysql)')
+    args = parser.parse_args()
+
+    print("=" * 64)
+    print(f"Concurrent booking: {args.orders} orders, {args.bookers} bookers, {args.instances} instance(s)"
+          f"{'' if args.mysql else ' (simulated counter row)'}")
+    print("=" * 64)
+    numbers, seconds, round_trips = (book_mysql if args.mysql else book_simulated)(args)
+
+    booked = [number for number in numbers if number is not None]
+    duplicates = len(booked) - len(set(booked))
+    rate = 'inserts/s' if args.mysql else 'numbers/s'
+    print(f"  {len(booked)} orders in {seconds:.2f} s   {len(booked) / seconds:,.0f} {rate}")
+    print(f"  {round_trips} block reservations ({args.block_size} numbers each)")
+    ok = not duplicates and len(booked) == args.orders
+    print(f"  {'✅ all order numbers unique' if ok else f'❌ {duplicates} DUPLICATES, {args.orders - len(booked)} FAILED'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
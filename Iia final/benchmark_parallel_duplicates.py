@@ -0,0 +1,79 @@
+#!/usr/bin/env python3
+"""
+Benchmark: serial vs multiprocess full duplicate scan
+
+Generates --providers company/employee names (the same generator as
+benchmark_incremental_duplicates.py) and times the two pair searches of a
+full duplicate report -- companies x employees at 80% and each side with
+itself at 90% -- with 1, 2, 4, ... up to --max-workers processes. Every
+parallel result is checked pair for pair against the serial one.
+
+Speedups need free cores: on a single-core machine the parallel runs only
+show the pool overhead.
+
+    python benchmark_parallel_duplicates.py --providers 4000
+    python benchmark_parallel_duplicates.py --providers 20000 --max-workers 8
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from benchmark_incremental_duplicates import make_name
+from duplicate_analysis_report import DuplicateAnalysisReport
+from string_similarity_matcher import StringSimplicityMatcher
+
+
+def full_scan_pairs(companies, employees, workers: int):
+    find = StringSimplicityMatcher.find_similar_pairs
+    return (
+        find(companies, employees, DuplicateAnalysisReport.CROSS_DATABASE_THRESHOLD, workers=workers),
+        find(companies, similarity_threshold=DuplicateAnalysisReport.WITHIN_DATABASE_THRESHOLD, workers=workers),
+        find(employees, similarity_threshold=DuplicateAnalysisReport.WITHIN_DATABASE_THRESHOLD, workers=workers),
+    )
+
+
+def worker_counts(maximum: int):
+    counts, workers = [], 1
+    while workers < maximum:
+        counts.append(workers)
+        workers *= 2
+    return counts + [maximum]
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--providers', type=int, default=4000, help='names (half companies, half employees)')
+    parser.add_argument('--max-workers', type=int, default=os.cpu_count() or 1)
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    rng = random.Random(args.seed)
+    companies = [make_name(rng) for _ in range(args.providers // 2)]
+    employees = [make_name(rng) for _ in range(args.providers // 2)]
+    # Some genuine duplicates: employees registered under a company's name
+    for i in rng.sample(range(len(employees)), max(1, args.providers // 100)):
+        employees[i] = companies[i]
+
+    print("=" * 60)
+    print(f"Full duplicate scan: {args.providers} providers, {os.cpu_count()} CPU(s)")
+    print("=" * 60)
+    serial, serial_seconds = None, None
+    for workers in worker_counts(args.max_workers):
+        StringSimplicityMatcher.clear_canonical_cache()
+        started = time.perf_counter()
+        pairs = full_scan_pairs(companies, employees, workers)
+        seconds = time.perf_counter() - started
+        if serial is None:
+            serial, serial_seconds = pairs, seconds
+        status = "✅ same pairs" if pairs == serial else "❌ PAIRS DIFFER"
+        print(f"  {workers:>3} worker(s)  {seconds:>8.2f} s  x{serial_seconds / seconds:>5.2f}  "
+              f"{sum(len(found) for found in pairs):>7} pairs  {status}")
+
+
+if __name__ == "__main__":
+    main()
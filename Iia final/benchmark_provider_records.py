@@ -0,0 +1,119 @@
+#!/usr/bin/env python3
+"""
+Benchmark: building and sorting provider results as dicts vs Provider records
+
+Generates company/employee rows shaped like the search queries return, then
+measures time and traced memory for turning them into result rows (the old
+per-row dicts vs provider_record.Provider) and sorting them by rating.
+
+    python benchmark_provider_records.py --providers 50000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+import tracemalloc
+from decimal import Decimal
+from operator import attrgetter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from provider_record import Provider
+
+
+def make_rows(count: int, seed: int = 7):
+    rng = random.Random(seed)
+    companies, employees = [], []
+    for i in range(count):
+        if i % 2:
+            companies.append({
+                'company_id': i, 'company_name': f'Company {i}', 'business_type': 'Plumbing',
+                'rating': Decimal(str(round(rng.uniform(1, 5), 2))), 'description': 'Residential plumbing',
+                'service_regions': 'Downtown', 'avg_hourly_rate': Decimal('85.00'),
+                'specialization_areas': 'pipes, leaks', 'service_name': 'Plumbing', 'total_reviews': rng.randint(0, 300),
+                'phone': '555-0100', 'email': f'c{i}@example.com', 'website': '', 'relevance': rng.random(),
+            })
+        else:
+            employees.append({
+                'employee_id': i, 'user_name': f'Worker {i}', 'specialization': 'plumbing',
+                'rating': Decimal(str(round(rng.uniform(1, 5), 2))), 'bio': 'Licensed plumber',
+                'preferred_regions': 'Suburbs', 'avg_cost_per_hour': Decimal('60.00'), 'experience_years': rng.randint(0, 20),
+                'total_completed_orders': rng.randint(0, 400), 'phone': '555-0101', 'email': f'w{i}@example.com',
+                'certification_level': 'Professional', 'emergency_service': i % 3 == 0, 'relevance': rng.random(),
+            })
+    return companies, employees
+
+
+def build_dicts(companies, employees):
+    """The per-row dict rebuild get_cross_laptop_results used to do"""
+    results = []
+    for company in companies:
+        results.append({
+            'id': company['company_id'], 'name': company['company_name'], 'type': 'Company',
+            'business_type': company['business_type'], 'rating': company['rating'],
+            'description': company['description'], 'service_regions': company['service_regions'],
+            'avg_cost': company['avg_hourly_rate'], 'specialization': company['specialization_areas'],
+            'data_source': 'Primary', 'service_name': company.get('service_name', 'General Service'),
+            'total_reviews': company['total_reviews'], 'phone': company['phone'], 'email': company['email'],
+            'relevance': float(company.get('relevance') or 0.0),
+        })
+    for employee in employees:
+        job_type = employee.get('job_type') or employee.get('specialization', 'General')
+        results.append({
+            'id': employee['employee_id'], 'name': employee['user_name'], 'type': 'Individual Worker',
+            'business_type': job_type, 'rating': employee.get('rating', 0), 'description': employee.get('bio', ''),
+            'service_regions': employee.get('preferred_regions', ''), 'avg_cost': employee.get('avg_cost_per_hour', 0),
+            'specialization': employee.get('specialization', ''), 'data_source': 'Secondary',
+            'service_name': employee.get('service_name') or job_type,
+            'experience_years': employee.get('experience_years', 0),
+            'total_orders': employee.get('total_completed_orders', 0), 'phone': employee.get('phone', ''),
+            'email': employee.get('email', ''), 'certification_level': employee.get('certification_level', ''),
+            'emergency_service': employee.get('emergency_service', 0),
+            'relevance': float(employee.get('relevance') or 0.0),
+        })
+    return results
+
+
+def build_providers(companies, employees):
+    results = [Provider.from_company_row(company) for company in companies]
+    results.extend(Provider.from_employee_row(employee) for employee in employees)
+    return results
+
+
+def measure(label, build, sort_key, companies, employees):
+    tracemalloc.start()
+    started = time.perf_counter()
+    results = build(companies, employees)
+    built = time.perf_counter()
+    _, build_peak = tracemalloc.get_traced_memory()
+
+    results.sort(key=sort_key, reverse=True)
+    sorted_at = time.perf_counter()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<18}{len(results):>10,}{(built - started) * 1000:>12.1f}{(sorted_at - built) * 1000:>11.1f}"
+          f"{build_peak / 1e6:>14.1f}{peak / 1e6:>12.1f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--providers', type=int, default=50_000)
+    args = parser.parse_args()
+
+    companies, employees = make_rows(args.providers)
+
+    print("=" * 77)
+    print(f"Provider record benchmark ({args.providers:,} providers)")
+    print("=" * 77)
+    print(f"{'representation':<18}{'rows':>10}{'build ms':>12}{'sort ms':>11}{'build peak MB':>14}{'peak MB':>12}")
+    measure('dict per row', build_dicts, lambda r: r.get('rating', 0), companies, employees)
+    # New code reads attributes; the dict-style .get() view costs a Python-level call per row
+    measure('Provider', build_providers, attrgetter('rating'), companies, employees)
+    measure('Provider (.get)', build_providers, lambda r: r.get('rating', 0), companies, employees)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-row vs NumPy scoring of federated results
+
+First checks on a fixture set (every urgency / provider-type combination,
+Decimal/str/int ratings, missing fields) that the vectorized scores, factor
+breakdowns and ordering are identical to the per-row loop, and that the
+argpartition top-k equals the head of the full ranking. Then times both
+paths at 10k and 100k candidates.
+
+    python benchmark_provider_scoring.py --sizes 10000 100000 --limit 20
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+from decimal import Decimal
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import provider_scoring
+from provider_record import Provider
+from provider_scoring import rank_providers, score_providers_python, score_providers_vectorized
+
+ANALYSES = [
+    {'urgency': urgency, 'recommended_provider_type': provider_type}
+    for urgency in ('emergency', 'high', 'medium', 'low')
+    for provider_type in ('company', 'individual', 'both')
+]
+
+
+def make_candidates(count: int, seed: int = 11, dict_share: float = 0.3):
+    rng = random.Random(seed)
+    candidates = []
+    for i in range(count):
+        kind = rng.random()
+        rating = rng.choice([
+            Decimal(str(round(rng.uniform(0, 5), 2))), round(rng.uniform(0, 5), 2), rng.randint(0, 5),
+            str(round(rng.uniform(0, 5), 1)),
+        ])
+        if kind < 0.45:
+            row = {'company_id': i, 'company_name': f'Company {i}', 'rating': rating,
+                   'total_reviews': rng.choice([0, 19, 20, 49, 50, 99, 100, 250])}
+            provider = Provider.from_company_row(row)
+        else:
+            row = {'employee_id': i, 'user_name': f'Worker {i}', 'rating': rating,
+                   'experience_years': rng.choice([0, 1, 2, 5, 9, 10, 15]),
+                   'total_completed_orders': rng.choice([0, 19, 20, 50, 99, 100, 300]),
+                   'certification_level': rng.choice(['Master', 'Professional', 'Basic', 'None', '']),
+                   'emergency_service': rng.random() < 0.3}
+            # Admin listings label workers 'Employee'; they score as non-company, non-worker rows
+            provider = Provider.from_employee_row(row, type='Employee') if kind > 0.95 else Provider.from_employee_row(row)
+        if rng.random() < 0.5:
+            provider['avg_response_time_hours'] = rng.choice([1, 2, 3, 6, 7, 12, 13, 48])
+        candidates.append(provider.to_dict() if rng.random() < dict_share else provider)
+    return candidates
+
+
+def check_parity(count: int = 5000):
+    for analysis in ANALYSES:
+        expected = score_providers_python(make_candidates(count), analysis)
+        actual, _ = score_providers_vectorized(make_candidates(count), analysis)
+        for want, got in zip(expected, actual):
+            assert want['comprehensive_score'] == got['comprehensive_score'], (analysis, want, got)
+            assert want['scoring_factors'] == got['scoring_factors'], (analysis, want, got)
+
+        reference = sorted(expected, key=lambda x: x.get('comprehensive_score', 0), reverse=True)
+        ranked = rank_providers(make_candidates(count), analysis)
+        assert [r['id'] for r in ranked] == [r['id'] for r in reference], analysis
+        for limit in (0, 1, 20, 500, count + 5):
+            top = rank_providers(make_candidates(count), analysis, limit)
+            assert [r['id'] for r in top] == [r['id'] for r in reference[:limit]], (analysis, limit)
+    print(f"✅ Parity: identical scores, factors and order on {len(ANALYSES)} analyses x {count} candidates")
+
+
+def timed(fn):
+    started = time.perf_counter()
+    fn()
+    return (time.perf_counter() - started) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[10_000, 100_000])
+    parser.add_argument('--limit', type=int, default=20, help='top-k size for the partial-selection column')
+    args = parser.parse_args()
+
+    if provider_scoring.np is None:
+        print("NumPy is not installed; only the per-row path is available.")
+        return
+
+    check_parity()
+
+    analysis = {'urgency': 'high', 'recommended_provider_type': 'individual'}
+    print("=" * 72)
+    print(f"{'candidates':>12}{'per-row sort ms':>18}{'numpy sort ms':>16}{f'numpy top-{args.limit} ms':>18}")
+    print("=" * 72)
+    for size in args.sizes:
+        # Search results are Provider records; the parity check above also covers plain dicts
+        candidates = make_candidates(size, dict_share=0.0)
+
+        def per_row():
+            scored = score_providers_python(list(candidates), analysis)
+            scored.sort(key=lambda x: x.get('comprehensive_score', 0), reverse=True)
+
+        loop_ms = timed(per_row)
+        full_ms = timed(lambda: rank_providers(list(candidates), analysis))
+        top_ms = timed(lambda: rank_providers(list(candidates), analysis, args.limit))
+        print(f"{size:>12,}{loop_ms:>18.1f}{full_ms:>16.1f}{top_ms:>18.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: peak memory of execute_query (fetchall) vs iter_query (streaming)
+
+Each mode runs in its own child process so ru_maxrss is a clean per-mode peak.
+By default the rows come from a generated 1,000,000-row employee-shaped result
+(digit cross join, no table needed); pass --table employee to scan the real
+secondary table instead.
+
+    python benchmark_query_streaming.py --rows 1000000
+    python benchmark_query_streaming.py --table employee --batch-size 5000
+"""
+
+import argparse
+import json
+import os
+import resource
+import subprocess
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+MODES = ['fetchall', 'stream-dict', 'stream-record', 'stream-tuple']
+
+
+def synthetic_employee_query(rows: int) -> str:
+    """SELECT producing `rows` employee-like rows from a cross join of digit tables"""
+    digits = "(SELECT 0 d UNION ALL SELECT 1 UNION ALL SELECT 2 UNION ALL SELECT 3 UNION ALL SELECT 4 " \
+             "UNION ALL SELECT 5 UNION ALL SELECT 6 UNION ALL SELECT 7 UNION ALL SELECT 8 UNION ALL SELECT 9)"
+    width = max(1, len(str(max(rows - 1, 1))))
+    tables = ", ".join(f"{digits} t{i}" for i in range(width))
+    number = " + ".join(f"t{i}.d * {10 ** i}" for i in range(width))
+    return f"""
+    SELECT n + 1 AS employee_id,
+           CONCAT('Employee ', n) AS name,
+           CONCAT('employee', n, '@example.com') AS email,
+           'plumbing' AS specialization,
+           4.5 AS rating,
+           n % 500 AS total_completed_orders,
+           'available' AS availability_status
+    FROM (SELECT {number} AS n FROM {tables}) seq
+    WHERE n < {int(rows)}
+    """
+
+
+def peak_rss_mb() -> float:
+    # Linux reports KiB, macOS bytes
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    return peak / (1024 * 1024) if sys.platform == 'darwin' else peak / 1024
+
+
+def run_mode(mode: str, query: str, connection_name: str, batch_size: int) -> dict:
+    """Consume the whole result the way a report would: keep one object per row"""
+    from distributed_database_manager import DistributedDatabaseManager
+
+    db_manager = DistributedDatabaseManager()
+    baseline = peak_rss_mb()
+    started = time.perf_counter()
+
+    if mode == 'fetchall':
+        # What the reports used to do: fetchall() dicts, then copy each row into another dict
+        rows = [dict(row) for row in db_manager.execute_query(query, None, connection_name)]
+    else:
+        row_type = mode.split('-', 1)[1]
+        rows = list(db_manager.iter_query(query, None, connection_name, row_type=row_type, batch_size=batch_size))
+
+    elapsed = time.perf_counter() - started
+    result = {
+        'mode': mode,
+        'rows': len(rows),
+        'seconds': round(elapsed, 2),
+        'baseline_rss_mb': round(baseline, 1),
+        'peak_rss_mb': round(peak_rss_mb(), 1),
+    }
+    db_manager.close_connections()
+    return result
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--rows', type=int, default=1_000_000, help='rows in the generated result')
+    parser.add_argument('--table', help='scan this secondary table instead of generated rows')
+    parser.add_argument('--batch-size', type=int, default=1000, help='fetchmany batch size for streaming modes')
+    parser.add_argument('--modes', nargs='+', choices=MODES, default=MODES)
+    parser.add_argument('--child', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    query = f"SELECT * FROM {args.table}" if args.table else synthetic_employee_query(args.rows)
+
+    if args.child:
+        print(json.dumps(run_mode(args.child, query, 'secondary', args.batch_size)))
+        return
+
+    print("=" * 70)
+    print(f"Query streaming benchmark ({args.table or f'{args.rows:,} generated rows'})")
+    print("=" * 70)
+    print(f"{'mode':<15}{'rows':>12}{'seconds':>10}{'peak RSS MB':>14}{'over baseline':>15}")
+
+    for mode in args.modes:
+        command = [sys.executable, os.path.abspath(__file__), '--child', mode,
+                   '--rows', str(args.rows), '--batch-size', str(args.batch_size)]
+        if args.table:
+            command += ['--table', args.table]
+        output = subprocess.run(command, capture_output=True, text=True)
+        lines = [line for line in output.stdout.splitlines() if line.startswith('{')]
+        if output.returncode != 0 or not lines:
+            print(f"{mode:<15} failed: {output.stderr.strip()[-200:]}")
+            continue
+
+        result = json.loads(lines[-1])
+        growth = result['peak_rss_mb'] - result['baseline_rss_mb']
+        print(f"{mode:<15}{result['rows']:>12,}{result['seconds']:>10}{result['peak_rss_mb']:>14}{growth:>15.1f}")
+
+
+if __name__ == "__main__":
+    main()
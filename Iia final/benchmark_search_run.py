@@ -0,0 +1,154 @@
+#!/usr/bin/env python3
+"""
+Benchmark: database and LLM calls per search with the shared search run
+
+Runs --searches queries through every consumer of a search the way the GUI
+does in advanced mode -- the search worker (get_federated_search_results plus
+the provider-type recommendation), get_intelligent_recommendations, and the
+Analysis dialog (get_prompt_rewrite_analysis,
+get_results_integration_analysis) -- and counts the calls that reach each
+database node and the LLM. Every node search and every LLM prompt must run at
+most once per query.
+
+A second pass makes the secondary node fail: the partial answer must not be
+reused, so the next consumer of the same query queries the secondary again.
+A third pass removes the secondary node (primary-only setup): the answer is
+complete, so the run is shared and the secondary is never queried.
+
+The database nodes are counting stubs (no MySQL needed) and the LLM runs on
+its local fallback, so the counts are those of the pipeline itself.
+
+    python benchmark_search_run.py --searches 20
+"""
+
+import argparse
+import os
+import sys
+import time
+from collections import Counter
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+from mysql.connector import Error
+
+from benchmark_provider_records import make_rows
+from distributed_database_manager import DistributedDatabaseManager
+from distributed_sorting_service import DistributedSortingService
+
+QUERIES = ["leaking kitchen pipe", "rewire garage outlets", "paint two bedrooms", "emergency ac repair",
+           "weekly lawn care", "deep clean apartment", "replace car brakes", "build kitchen cabinets"]
+
+LLM_STAGES = ('analyze_distributed_service_request', 'analyze_cross_database_results', 'suggest_provider_type')
+
+
+class CountingDatabaseManager(DistributedDatabaseManager):
+    """Real federation/dedup code on top of node searches that only count and return fixed rows"""
+
+    def __init__(self, calls: Counter):
+        self.calls = calls
+        self.fail_secondary = False
+        self.company_rows, self.employee_rows = make_rows(20)
+        super().__init__()
+
+    def connect_to_databases(self):
+        # Both nodes configured; the searches below stand in for their queries
+        self.primary_pool = self.secondary_pool = object()
+
+    def search_companies(self, service_type: str, region: str = None, raise_errors: bool = False):
+        self.calls['primary'] += 1
+        return [dict(row) for row in self.company_rows]
+
+    def search_employees(self, service_type: str, region: str = None, raise_errors: bool = False):
+        self.calls['secondary'] += 1
+        if self.fail_secondary:
+            if raise_errors:
+                raise Error(msg="secondary node unreachable")
+            return []
+        return [dict(row) for row in self.employee_rows]
+
+
+def count_llm_calls(llm_service, calls: Counter):
+    """Wrap the LLM entry points so every prompt is counted"""
+    llm_service.use_mock_service = True  # local fallback answers, never the real API
+    for name in LLM_STAGES:
+        method = getattr(llm_service, name)
+
+        def counted(*args, _method=method, _name=name, **kwargs):
+            calls[_name] += 1
+            return _method(*args, **kwargs)
+        setattr(llm_service, name, counted)
+
+
+def search_like_gui(service: DistributedSortingService, query: str):
+    """Advanced search worker, then the recommendations panel and the Analysis dialog"""
+    run = service.get_search_run(query)
+    service.get_federated_search_results(query, limit=50)
+    run.recommendation()
+    service.get_intelligent_recommendations(query, 'both')
+    service.get_prompt_rewrite_analysis(query)
+    service.get_results_integration_analysis(query)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--searches', type=int, default=len(QUERIES), help='distinct queries to run')
+    args = parser.parse_args()
+
+    calls = Counter()
+    db_manager = CountingDatabaseManager(calls)
+    service = DistributedSortingService(db_manager)
+    count_llm_calls(service.llm_service, calls)
+    queries = [f"{QUERIES[i % len(QUERIES)]} {i // len(QUERIES) or ''}".strip() for i in range(args.searches)]
+
+    print("=" * 64)
+    print(f"Calls per search: {len(queries)} queries, every consumer of each")
+    print("=" * 64)
+    worst = Counter()
+    started = time.perf_counter()
+    for query in queries:
+        before = calls.copy()
+        search_like_gui(service, query)
+        for name, count in (calls - before).items():
+            worst[name] = max(worst[name], count)
+    per_search_ms = (time.perf_counter() - started) / len(queries) * 1000
+
+    ok = True
+    for name in ('primary', 'secondary') + LLM_STAGES:
+        status = "✅" if worst[name] <= 1 else "❌"
+        ok = ok and worst[name] <= 1
+        print(f"  {status} {name:<38} max {worst[name]} call(s) per search")
+    print(f"  {per_search_ms:.1f} ms per search (all consumers)")
+
+    print("\nPartial answers (secondary node failing):")
+    db_manager.fail_secondary = True
+    db_manager.invalidate_search_cache('secondary')  # as after a write: the next fetch reaches the nodes
+    query = queries[0]
+    before = calls['secondary']
+    first = service.get_search_run(query).search_results()
+    service.get_results_integration_analysis(query)
+    retried = calls['secondary'] - before
+    partial_ok = first['partial_result'] and retried == 2
+    ok = ok and partial_ok
+    print(f"  {'✅' if partial_ok else '❌'} partial_result={first['partial_result']}, "
+          f"secondary queried {retried} time(s) by two consumers (expected 2)")
+
+    print("\nPrimary-only setup (no secondary node):")
+    db_manager.fail_secondary = False
+    db_manager.secondary_pool = None
+    db_manager.invalidate_search_cache('secondary')
+    query = queries[-1] + " primary only"
+    before = calls.copy()
+    first = service.get_search_run(query).search_results()
+    service.get_results_integration_analysis(query)
+    primary_calls, secondary_calls = calls['primary'] - before['primary'], calls['secondary'] - before['secondary']
+    offline_ok = not first['partial_result'] and primary_calls == 1 and secondary_calls == 0
+    ok = ok and offline_ok
+    print(f"  {'✅' if offline_ok else '❌'} partial_result={first['partial_result']}, "
+          f"primary queried {primary_calls} time(s), secondary {secondary_calls} (expected 1 and 0)")
+
+    print(f"\n{'✅ every node and LLM prompt hit at most once per search, partial answers refetched, offline node not partial' if ok else '❌ CHECK FAILED'}")
+    sys.exit(0 if ok else 1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,110 @@
+#!/usr/bin/env python3
+"""
+Benchmark: similarity scorers on provider names
+
+Scores --pairs realistic name pairs (generated company / worker names, a
+fifth of them variants of each other such as "X Plumbing" / "X Plumbing LLC")
+with every available scorer backend:
+
+    sequence/difflib        SequenceMatcher with its own quick ratios (reference)
+    sequence/python         SequenceMatcher behind the bit-parallel LCS bound
+    sequence/rapidfuzz      SequenceMatcher behind rapidfuzz's Indel bound
+    jaro_winkler/python     pure-Python Jaro-Winkler with pruning
+    jaro_winkler/rapidfuzz  rapidfuzz Jaro-Winkler
+
+and times score() per pair and score_many() for one query against a
+candidate block. Then checks the threshold decisions of each scorer against
+the reference at the thresholds the application uses: the sequence
+backends must agree on every pair (same metric); Jaro-Winkler is a
+different metric and its agreement is shown for comparison only.
+
+    python benchmark_similarity_scorers.py --pairs 20000
+"""
+
+import argparse
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import string_similarity_matcher
+from benchmark_cross_source_enrichment import VARIANTS
+from benchmark_incremental_duplicates import make_name
+from string_similarity_matcher import JaroWinklerScorer, SequenceMatcherScorer, StringSimplicityMatcher
+
+THRESHOLDS = (0.75, 0.80, 0.90)
+
+
+def make_pairs(count: int, seed: int):
+    rng = random.Random(seed)
+    normalize = StringSimplicityMatcher.canonical_name
+    pairs = []
+    for _ in range(count):
+        name = make_name(rng)
+        other = name + rng.choice(VARIANTS) if rng.random() < 0.2 else make_name(rng)
+        pairs.append((normalize(name), normalize(other)))
+    return pairs
+
+
+def available_scorers():
+    scorers = [('sequence/difflib', SequenceMatcherScorer('difflib')),
+               ('sequence/python', SequenceMatcherScorer('python')),
+               ('jaro_winkler/python', JaroWinklerScorer('python'))]
+    if string_similarity_matcher._rapidfuzz_indel is not None:
+        scorers.insert(2, ('sequence/rapidfuzz', SequenceMatcherScorer('rapidfuzz')))
+        scorers.append(('jaro_winkler/rapidfuzz', JaroWinklerScorer('rapidfuzz')))
+    return scorers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--pairs', type=int, default=20000, help='name pairs to score')
+    parser.add_argument('--block', type=int, default=500, help='candidates per score_many() query')
+    parser.add_argument('--seed', type=int, default=11)
+    args = parser.parse_args()
+
+    pairs = make_pairs(args.pairs, args.seed)
+    queries = [left for left, _ in pairs[:20]]
+    block = [right for _, right in pairs[:args.block]]
+    scorers = available_scorers()
+
+    print("=" * 72)
+    print(f"Similarity scorers: {len(pairs)} name pairs, min_score 0.80")
+    print(f"(default: {StringSimplicityMatcher.scorer.name}/{StringSimplicityMatcher.scorer.backend})")
+    print("=" * 72)
+    print(f"  {'scorer':<24}{'score() us/pair':>16}{'score_many() us/pair':>22}")
+    baseline = None
+    for label, scorer in scorers:
+        started = time.perf_counter()
+        for left, right in pairs:
+            scorer.score(left, right, 0.80)
+        per_pair = (time.perf_counter() - started) / len(pairs) * 1e6
+
+        started = time.perf_counter()
+        for query in queries:
+            scorer.score_many(query, block, 0.80)
+        per_candidate = (time.perf_counter() - started) / (len(queries) * len(block)) * 1e6
+
+        baseline = baseline or per_pair
+        print(f"  {label:<24}{per_pair:>10.2f} x{baseline / per_pair:<5.1f}{per_candidate:>16.2f}")
+
+    print("\nThreshold decisions vs sequence/difflib:")
+    reference = scorers[0][1]
+    for label, scorer in scorers[1:]:
+        counts = [
+            sum(
+                (reference.score(left, right, threshold) >= threshold) != (scorer.score(left, right, threshold) >= threshold)
+                for left, right in pairs
+            )
+            for threshold in THRESHOLDS
+        ]
+        # Only the SequenceMatcher backends are expected to agree exactly
+        status = ("✅" if not any(counts) else "❌") if scorer.ratio_bounded else "ℹ️"
+        print(f"  {status} {label:<24} differing pairs  "
+              + "   ".join(f"{threshold:.2f}: {count:>5}" for threshold, count in zip(THRESHOLDS, counts)))
+
+
+if __name__ == "__main__":
+    main()
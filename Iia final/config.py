@@ -18,21 +18,117 @@ DATABASE_CONFIG = {
     }
 }
 
+# Connection pool settings (one pool per database node)
+POOL_CONFIG = {
+    'min_size': 1,            # connections opened eagerly at startup
+    'max_size': 5,            # hard cap on concurrent connections per node
+    'checkout_timeout': 5,    # seconds to wait for a free connection
+    'connect_timeout': 3,     # seconds to wait when opening a new connection
+    'ping_on_checkout': True  # verify liveness (and reconnect) before handing out
+}
+
+# Federated search settings
+FEDERATION_CONFIG = {
+    'node_deadline': 4.0,     # seconds each node gets before its results are dropped as partial
+    'max_workers': 4          # threads used to fan queries out to both nodes
+}
+
+# Order settings
+ORDER_CONFIG = {
+    'number_block_size': 50,  # order numbers reserved per round trip to ORDER_SEQUENCE
+    'bulk_chunk_size': 500    # rows per transaction in the bulk order APIs
+}
+
+# Keyset pagination for order and admin listings
+PAGINATION_CONFIG = {
+    'page_size': 50,          # rows fetched per page
+    'prefetch_at': 0.9        # scroll position (0-1) at which the next page is loaded
+}
+
+# Virtualized Treeviews (virtual_tree.py): only the visible rows plus this buffer are materialized
+VIRTUAL_TREE_CONFIG = {
+    'buffer_rows': 10,        # extra rows kept below the visible ones
+    'wheel_rows': 3           # rows scrolled per mouse-wheel notch
+}
+
+# Streaming reads (DistributedDatabaseManager.iter_query) for large scans
+STREAM_CONFIG = {
+    'fetch_batch_size': 1000  # rows pulled from the server per fetchmany()
+}
+
+# Search result cache settings
+CACHE_CONFIG = {
+    'ttl_seconds': 60,        # how long a cached search stays fresh
+    'max_entries': 256        # LRU bound on cached (node, service_type, region) searches
+}
+
 # LLM Configuration - Google Gemini API
 LLM_CONFIG = {
     "api_key": "USE your own api key",// use your own api key here
     "model": "gemini-2.0-flash-001",  # or gemini-2.5-flash etc.
     "temperature": 0.3,
     "max_tokens": 1024,
+    "request_deadline": 8.0,  # seconds a recommendation request waits for its LLM stages
+}
+
+# LLM response cache (memory LRU + optional SQLite file next to the app)
+LLM_CACHE_CONFIG = {
+    'enabled': True,
+    'ttl_seconds': 3600,                          # answers older than this are asked again
+    'max_entries': 512,                           # in-memory LRU bound
+    'disk_file': 'llm_response_cache.sqlite3',    # set to None to keep the cache in memory only
+    'disk_max_entries': 5000
+}
+
+# Duplicate-analysis results (duplicate_store.py): SQLite file next to the app that the
+# admin stats, panel and CSV export read instead of rescanning both databases
+DUPLICATE_STORE_CONFIG = {
+    'db_file': 'duplicate_pairs.sqlite3',    # set to None to always rescan
 }
 
 
-# Service Categories and Weights for Sorting
+# Ranking weights: each feature's share of the 100-point comprehensive score,
+# in the order the factors are added. Features are declared in RANKING_CONFIG.
 SERVICE_SORTING_WEIGHTS = {
-    'rating': 0.4,
-    'availability': 0.3,
-    'experience': 0.2,
-    'response_time': 0.1
+    'rating': 0.40,
+    'provider_type_match': 0.20,
+    'urgency_score': 0.15,
+    'experience_score': 0.15,
+    'certification_score': 0.10
+}
+
+# Ranking model (provider_scoring.py). Feature values are fractions of the feature's points.
+# Edits to the override file are picked up without restarting the app (edits here need a restart).
+RANKING_CONFIG = {
+    'total_points': 100,
+    'override_file': 'ranking_model.json',    # optional JSON {"weights": {...}, "features": {...}} overrides
+    'reload_check_seconds': 2.0,              # how often the override file is checked for changes
+    'query_log': None,                        # e.g. 'ranking_queries.jsonl' to record searches for ranking_evaluation.py
+    'features': {
+        'rating': {'extractor': 'rating', 'scale': 5.0},
+        'provider_type_match': {'extractor': 'provider_type', 'match': 1.0, 'other': 0.5},
+        'urgency_score': {
+            'extractor': 'response_time',
+            'emergency_urgencies': ['high', 'emergency'],
+            'emergency_service': 1.0,
+            'default_hours': 24,
+            'tiers': {  # urgency -> [max response hours, value]
+                'emergency': [[2, 12 / 15], [6, 8 / 15], [12, 4 / 15]],
+                'high': [[2, 12 / 15], [6, 8 / 15], [12, 4 / 15]],
+                'medium': [[6, 10 / 15], [12, 6 / 15]]
+            }
+        },
+        'experience_score': {
+            'extractor': 'track_record',
+            'company_reviews': [[100, 1.0], [50, 10 / 15], [20, 5 / 15]],   # [min reviews, value]
+            'worker': [[10, 100, 1.0], [5, 50, 10 / 15], [2, 20, 5 / 15]]    # [min years, min orders, value]
+        },
+        'certification_score': {
+            'extractor': 'certification',
+            'levels': {'Master': 1.0, 'Professional': 0.8, 'Basic': 0.5},
+            'company': 0.6
+        }
+    }
 }
 
 # Common Service Types for Enhanced Features
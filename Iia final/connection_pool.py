@@ -0,0 +1,213 @@
+"""
+Per-node MySQL connection pool used by DistributedDatabaseManager.
+
+Each database node (primary / secondary) gets its own bounded pool so the
+GUI, the admin panel and background work can run queries concurrently
+instead of serializing on a single long-lived socket. Broken members are
+detected on checkout (liveness ping) or on error and transparently replaced.
+"""
+
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Any, Dict, Optional
+
+import mysql.connector
+from mysql.connector import Error
+from mysql.connector import errors as mysql_errors
+
+
+class PoolTimeoutError(Error):
+    """Raised when no pooled connection could be checked out in time."""
+
+
+class NodeConnectionPool:
+    """Thread-safe pool of mysql.connector connections for one database node"""
+
+    # Errors that mean the socket itself is unusable and the member must be replaced
+    BROKEN_CONNECTION_ERRORS = (mysql_errors.InterfaceError, mysql_errors.OperationalError)
+
+    def __init__(
+        self,
+        name: str,
+        db_config: Dict[str, Any],
+        min_size: int = 1,
+        max_size: int = 5,
+        checkout_timeout: float = 5.0,
+        ping_on_checkout: bool = True,
+    ):
+        self.name = name
+        self.db_config = db_config.copy()
+        self.min_size = max(0, min_size)
+        self.max_size = max(1, max_size, self.min_size)
+        self.checkout_timeout = checkout_timeout
+        self.ping_on_checkout = ping_on_checkout
+
+        self._idle = deque()
+        self._size = 0  # connections currently owned by the pool (idle + in use)
+        self._in_use = 0
+        self._closed = False
+        self._condition = threading.Condition(threading.Lock())
+
+        # Statistics
+        self._checkouts = 0
+        self._total_wait = 0.0
+        self._max_wait = 0.0
+        self._reconnects = 0
+        self._timeouts = 0
+
+    def connect(self) -> "NodeConnectionPool":
+        """Open the initial min_size members. Raises Error if the node is unreachable."""
+        # Always open at least one member so an unreachable node fails fast here
+        try:
+            for _ in range(max(1, self.min_size)):
+                connection = self._open_connection()
+                with self._condition:
+                    self._size += 1
+                    self._idle.append(connection)
+        except Error:
+            # The caller treats the node as down and never closes this pool; don't leak the members opened so far
+            self.close_all()
+            raise
+        return self
+
+    def _open_connection(self):
+        return mysql.connector.connect(**self.db_config)
+
+    # ------------------------------------------------------------------
+    # CHECKOUT / CHECKIN
+    # ------------------------------------------------------------------
+
+    def checkout(self, timeout: Optional[float] = None):
+        """Borrow a live connection, waiting up to `timeout` seconds for one to free up"""
+        timeout = self.checkout_timeout if timeout is None else timeout
+        started = time.monotonic()
+        deadline = started + timeout
+        connection = None
+        must_open = False
+
+        with self._condition:
+            while True:
+                if self._closed:
+                    raise Error(msg=f"Connection pool '{self.name}' is closed")
+                if self._idle:
+                    connection = self._idle.pop()
+                    break
+                if self._size < self.max_size:
+                    # Reserve a slot and open the socket outside the lock
+                    self._size += 1
+                    must_open = True
+                    break
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    self._timeouts += 1
+                    raise PoolTimeoutError(
+                        msg=f"Timed out after {timeout:.1f}s waiting for a '{self.name}' connection"
+                    )
+                self._condition.wait(remaining)
+            self._in_use += 1
+
+        try:
+            if must_open:
+                connection = self._open_connection()
+            elif self.ping_on_checkout:
+                connection = self._ensure_alive(connection)
+        except Error:
+            with self._condition:
+                self._in_use -= 1
+                self._size -= 1
+                self._condition.notify()
+            raise
+
+        waited = time.monotonic() - started
+        with self._condition:
+            self._checkouts += 1
+            self._total_wait += waited
+            self._max_wait = max(self._max_wait, waited)
+        return connection
+
+    def checkin(self, connection, broken: bool = False):
+        """Return a borrowed connection; broken members are closed and dropped"""
+        if not broken:
+            try:
+                # Never hand out a member with an open transaction/snapshot
+                if connection.in_transaction:
+                    connection.rollback()
+            except Error:
+                broken = True
+
+        with self._condition:
+            self._in_use -= 1
+            if broken or self._closed:
+                self._size -= 1
+            else:
+                self._idle.append(connection)
+            self._condition.notify()
+
+        if broken or self._closed:
+            self._safe_close(connection)
+
+    @contextmanager
+    def connection(self, timeout: Optional[float] = None):
+        """Context manager around checkout/checkin that discards sockets that broke mid-use"""
+        connection = self.checkout(timeout)
+        broken = False
+        try:
+            yield connection
+        except self.BROKEN_CONNECTION_ERRORS:
+            broken = True
+            raise
+        finally:
+            self.checkin(connection, broken=broken)
+
+    def _ensure_alive(self, connection):
+        """Ping a member and transparently replace it if the server dropped it"""
+        try:
+            connection.ping(reconnect=False)
+            return connection
+        except Error:
+            self._safe_close(connection)
+            replacement = self._open_connection()
+            with self._condition:
+                self._reconnects += 1
+            return replacement
+
+    @staticmethod
+    def _safe_close(connection):
+        try:
+            connection.close()
+        except Exception:
+            pass
+
+    # ------------------------------------------------------------------
+    # ADMIN
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        """Snapshot of pool usage for health reporting"""
+        with self._condition:
+            return {
+                'size': self._size,
+                'in_use': self._in_use,
+                'idle': len(self._idle),
+                'min_size': self.min_size,
+                'max_size': self.max_size,
+                'checkouts': self._checkouts,
+                'avg_wait_ms': round(self._total_wait / self._checkouts * 1000, 2) if self._checkouts else 0.0,
+                'max_wait_ms': round(self._max_wait * 1000, 2),
+                'reconnects': self._reconnects,
+                'timeouts': self._timeouts,
+            }
+
+    def close_all(self):
+        """Close idle members now; members still in use are closed on checkin"""
+        with self._condition:
+            self._closed = True
+            idle = list(self._idle)
+            self._idle.clear()
+            self._size -= len(idle)
+            self._condition.notify_all()
+
+        for connection in idle:
+            self._safe_close(connection)
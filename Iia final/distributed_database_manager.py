@@ -1092,66 +1092,116 @@
 import threading
 import time
 import json
-from typing import Any, Dict, List, Optional, Tuple
-import mysql.connector
+import re
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Any, Dict, Iterator, List, Optional, Tuple
 from mysql.connector import Error
-from config import DATABASE_CONFIG
+from config import (
+    DATABASE_CONFIG, POOL_CONFIG, FEDERATION_CONFIG, CACHE_CONFIG, ORDER_CONFIG, STREAM_CONFIG
+)
+from connection_pool import NodeConnectionPool
+from provider_record import Provider
+from query_stream import row_factory
+from result_cache import TTLResultCache
+from sequence_allocator import BlockSequenceAllocator
 from string_similarity_matcher import StringSimplicityMatcher
 
 
 class DistributedDatabaseManager:
     def __init__(self):
-        self.primary_connection = None
-        self.secondary_connection = None
-        self.cache = {}
+        self.primary_pool: Optional[NodeConnectionPool] = None
+        self.secondary_pool: Optional[NodeConnectionPool] = None
+        self.order_numbers: Optional[BlockSequenceAllocator] = None
         self.cache_lock = threading.Lock()
+        self.cache = TTLResultCache(
+            max_entries=CACHE_CONFIG.get('max_entries', 256),
+            ttl_seconds=CACHE_CONFIG.get('ttl_seconds', 60),
+            lock=self.cache_lock,
+            copy_fn=self._copy_search_result
+        )
         self.last_sync_time = 0
-
-        # Initialize connections
+        # Bumped on every write so memoized search runs know they are stale
+        self.data_version = 0
+        # Set per node once its FULLTEXT search indexes are in place
+        self.fulltext_ready = {'primary': False, 'secondary': False}
+
+        # Worker threads used to query both nodes concurrently
+        self.search_executor = ThreadPoolExecutor(
+            max_workers=FEDERATION_CONFIG.get('max_workers', 4),
+            thread_name_prefix='federated-search'
+        )
+
+        # Initialize connection pools
         self.connect_to_databases()
 
+    def _create_pool(self, name: str, db_config: Dict) -> NodeConnectionPool:
+        """Create and pre-fill a connection pool for one database node"""
+        pool_config = db_config.copy()
+        pool_config['connect_timeout'] = POOL_CONFIG.get('connect_timeout', 3)
+        pool_config['connection_timeout'] = POOL_CONFIG.get('connect_timeout', 3)
+        pool = NodeConnectionPool(
+            name,
+            pool_config,
+            min_size=POOL_CONFIG.get('min_size', 1),
+            max_size=POOL_CONFIG.get('max_size', 5),
+            checkout_timeout=POOL_CONFIG.get('checkout_timeout', 5),
+            ping_on_checkout=POOL_CONFIG.get('ping_on_checkout', True),
+        )
+        return pool.connect()
+
+    def _get_pool(self, connection_name: str) -> Optional[NodeConnectionPool]:
+        return self.primary_pool if connection_name == 'primary' else self.secondary_pool
+
     def connect_to_databases(self):
         """Connect to both primary and secondary databases"""
         try:
-            # Connect to primary database (Companies) with fast timeout
-            primary_config = DATABASE_CONFIG['primary'].copy()
-            primary_config['connect_timeout'] = 3
-            primary_config['connection_timeout'] = 3
-            self.primary_connection = mysql.connector.connect(**primary_config)
+            # Connection pool for primary database (Companies) with fast timeout
+            self.primary_pool = self._create_pool('primary', DATABASE_CONFIG['primary'])
 
             # Ensure order and customer tables exist
             self._ensure_order_tables()
 
         except Error as e:
             print(f"Warning: Could not connect to primary database: {e}")
-            self.primary_connection = None
+            self.primary_pool = None
+
+        if self.primary_pool:
+            self._ensure_search_indexes('primary')
+            self.order_numbers = BlockSequenceAllocator(
+                self.primary_pool, 'order_number', ORDER_CONFIG.get('number_block_size', 50)
+            )
 
         try:
-            # Connect to secondary database (Employees) with fast timeout
-            secondary_config = DATABASE_CONFIG['secondary'].copy()
-            secondary_config['connect_timeout'] = 3
-            secondary_config['connection_timeout'] = 3
-            self.secondary_connection = mysql.connector.connect(**secondary_config)
+            # Connection pool for secondary database (Employees) with fast timeout
+            self.secondary_pool = self._create_pool('secondary', DATABASE_CONFIG['secondary'])
         except Error:
             # For single laptop mode, try connecting to localhost
             try:
                 local_config = DATABASE_CONFIG['secondary'].copy()
                 local_config['host'] = 'localhost'
-                local_config['connect_timeout'] = 3
-                local_config['connection_timeout'] = 3
-                self.secondary_connection = mysql.connector.connect(**local_config)
+                self.secondary_pool = self._create_pool('secondary', local_config)
             except Error as e2:
                 print(f"Could not connect to secondary database on localhost: {e2}")
-                self.secondary_connection = None
+                self.secondary_pool = None
+
+        if self.secondary_pool:
+            self._ensure_search_indexes('secondary')
 
     def _ensure_order_tables(self):
         """Ensure order and customer tables exist in primary database"""
-        if not self.primary_connection:
+        if not self.primary_pool:
             return
 
         try:
-            cursor = self.primary_connection.cursor()
+            with self.primary_pool.connection() as connection:
+                self._create_order_tables(connection)
+        except Error as e:
+            print(f"Error creating order tables: {e}")
 
+    def _create_order_tables(self, connection):
+        """Create ORDER_TABLE / CUSTOMER on a checked-out primary connection"""
+        cursor = connection.cursor()
+        try:
             # Create ORDER_TABLE if it doesn't exist
             cursor.execute("""
                 CREATE TABLE IF NOT EXISTS ORDER_TABLE (
@@ -1198,6 +1248,18 @@ class DistributedDatabaseManager:
                 else:
                     print(f"Error creating index: {e}")
 
+            # Counter row for order numbers; seeded past existing ids (MAX on the PK is an index lookup)
+            cursor.execute("""
+                CREATE TABLE IF NOT EXISTS ORDER_SEQUENCE (
+                    name VARCHAR(50) PRIMARY KEY,
+                    next_value BIGINT NOT NULL
+                )
+            """)
+            cursor.execute("""
+                INSERT IGNORE INTO ORDER_SEQUENCE (name, next_value)
+                SELECT 'order_number', COALESCE(MAX(order_id), 0) + 1 FROM ORDER_TABLE
+            """)
+
             # Ensure provider_notes column exists (for backward compatibility)
             try:
                 cursor.execute("ALTER TABLE ORDER_TABLE ADD COLUMN provider_notes TEXT NULL")
@@ -1239,76 +1301,395 @@ class DistributedDatabaseManager:
                                          total_orders, total_spent, preferred_regions, membership_level)
                 VALUES (%s, %s, %s, %s, %s, %s, %s)
             """, sample_customers)
+            connection.commit()
             print("✅ Sample customers created")
 
+        finally:
             cursor.close()
 
+    # Search schema migrations, applied idempotently at startup per node
+    SEARCH_INDEX_MIGRATIONS = {
+        'primary': [
+            """
+            CREATE TABLE IF NOT EXISTS COMPANY_SERVICES (
+                company_id INT NOT NULL,
+                service_id INT NOT NULL,
+                PRIMARY KEY (company_id, service_id),
+                INDEX idx_company_services_service (service_id)
+            )
+            """,
+            "ALTER TABLE companies ADD FULLTEXT INDEX ft_companies_search "
+            "(company_name, business_type, specialization_areas)",
+            "ALTER TABLE SERVICE_TYPE ADD FULLTEXT INDEX ft_service_type_search (service_name, category)",
+            "CREATE INDEX idx_companies_rating ON companies (rating, total_reviews)",
+        ],
+        'secondary': [
+            "ALTER TABLE employee ADD FULLTEXT INDEX ft_employee_search (specialization, bio)",
+            "CREATE INDEX idx_employee_availability_rating ON employee (availability_status, rating)",
+        ],
+    }
+
+    # Composite indexes matching the keyset ORDER BY of each paginated listing
+    PAGINATION_INDEX_MIGRATIONS = {
+        'primary': [
+            "CREATE INDEX idx_order_customer_created ON ORDER_TABLE (customer_id, created_at, order_id)",
+            "CREATE INDEX idx_order_employee_created ON ORDER_TABLE (employee_id, created_at, order_id)",
+            "CREATE INDEX idx_order_status_employee_created ON ORDER_TABLE (status, employee_id, created_at, order_id)",
+            "CREATE INDEX idx_user_registration ON USER (registration_date, user_id)",
+            "CREATE INDEX idx_companies_name ON companies (company_name, company_id)",
+        ],
+        'secondary': [
+            "CREATE INDEX idx_orders_customer_created ON orders (customer_id, created_at, order_id)",
+            "CREATE INDEX idx_employee_created ON employee (created_at, employee_id)",
+        ],
+    }
+
+    # Change tracking read by the incremental duplicate scan (duplicate_analysis_report --incremental)
+    CHANGE_TRACKING_MIGRATIONS = {
+        'primary': [
+            "ALTER TABLE companies ADD COLUMN updated_at TIMESTAMP "
+            "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP",
+            "CREATE INDEX idx_companies_updated ON companies (updated_at)",
+        ],
+        'secondary': [
+            "ALTER TABLE employee ADD COLUMN updated_at TIMESTAMP "
+            "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP",
+            "CREATE INDEX idx_employee_updated ON employee (updated_at)",
+            # Employee names live in USER, so renames are tracked there
+            "ALTER TABLE USER ADD COLUMN updated_at TIMESTAMP "
+            "DEFAULT CURRENT_TIMESTAMP ON UPDATE CURRENT_TIMESTAMP",
+            "CREATE INDEX idx_user_updated ON USER (updated_at)",
+        ],
+    }
+
+    def _ensure_search_indexes(self, connection_name: str):
+        """Add FULLTEXT indexes (and the company/service mapping) used by the search queries"""
+        pool = self._get_pool(connection_name)
+        ready = True
+        try:
+            with pool.connection() as connection:
+                cursor = connection.cursor()
+                try:
+                    ready = self._apply_index_migrations(
+                        cursor, self.SEARCH_INDEX_MIGRATIONS[connection_name], connection_name
+                    )
+                    if connection_name == 'primary':
+                        self._backfill_company_services(cursor)
+
+                    # Listings still work without these (just slower), so they do not affect readiness
+                    self._apply_index_migrations(
+                        cursor, self.PAGINATION_INDEX_MIGRATIONS[connection_name], connection_name
+                    )
+                    # Without them the duplicate scan falls back to full rebuilds
+                    self._apply_index_migrations(
+                        cursor, self.CHANGE_TRACKING_MIGRATIONS[connection_name], connection_name
+                    )
+                    connection.commit()
+                finally:
+                    cursor.close()
         except Error as e:
-            print(f"Error creating order tables: {e}")
+            print(f"Error creating search indexes on {connection_name}: {e}")
+            ready = False
+
+        # Without the indexes MATCH ... AGAINST fails, so searches keep the LIKE queries
+        self.fulltext_ready[connection_name] = ready
+
+    @staticmethod
+    def _apply_index_migrations(cursor, statements: List[str], connection_name: str) -> bool:
+        """Run idempotent DDL statements; returns False if any of them failed"""
+        ok = True
+        for statement in statements:
+            try:
+                cursor.execute(statement)
+            except Error as e:
+                if "Duplicate key name" in str(e) or "Duplicate column name" in str(e) or "already exists" in str(e):
+                    pass  # Index / column already exists, ignore error
+                else:
+                    print(f"Error applying index migration on {connection_name}: {e}")
+                    ok = False
+        return ok
+
+    @staticmethod
+    def _backfill_company_services(cursor):
+        """One-time fill of COMPANY_SERVICES from the old business_type LIKE category join"""
+        cursor.execute("SELECT 1 FROM COMPANY_SERVICES LIMIT 1")
+        if cursor.fetchall():
+            return
+        cursor.execute("""
+            INSERT IGNORE INTO COMPANY_SERVICES (company_id, service_id)
+            SELECT c.company_id, s.service_id
+            FROM companies c
+            JOIN SERVICE_TYPE s ON c.business_type LIKE CONCAT('%', s.category, '%')
+        """)
+
+    @staticmethod
+    def _fulltext_terms(text: str) -> str:
+        """Boolean-mode expression requiring every word as a prefix (like the old '%word%' filters)"""
+        # Words under innodb_ft_min_token_size (3) are never indexed; an empty result means "use LIKE"
+        words = [word for word in re.findall(r"\w+", (text or '').lower()) if len(word) >= 3]
+        return " ".join(f"+{word}*" for word in words)
 
     def execute_query(
         self,
         query: str,
         params: Optional[Tuple] = None,
         connection_name: str = 'primary',
-        modify: bool = False
+        modify: bool = False,
+        raise_errors: bool = False
     ) -> List[Dict]:
-        """Execute query on specified database"""
-        connection = self.primary_connection if connection_name == 'primary' else self.secondary_connection
+        """Execute query on specified database using a pooled connection.
+
+        Errors are printed and give [] unless raise_errors is set, for callers that
+        must tell a failed query from an empty result (e.g. before caching it).
+        """
+        pool = self._get_pool(connection_name)
 
-        if not connection:
+        if not pool:
             print(f"No connection to {connection_name} database")
+            if raise_errors:
+                raise Error(msg=f"No connection to {connection_name} database")
             return []
 
         try:
-            cursor = connection.cursor(dictionary=True)
+            with pool.connection() as connection:
+                cursor = connection.cursor(dictionary=True)
+                try:
+                    if params:
+                        cursor.execute(query, params)
+                    else:
+                        cursor.execute(query)
+
+                    # For INSERT/UPDATE/DELETE operations, commit and return affected rows
+                    if modify:
+                        connection.commit()
+                        result = [{'affected_rows': cursor.rowcount}]
+                    else:
+                        result = cursor.fetchall()
+                finally:
+                    cursor.close()
+            return result
+        except Error as e:
+            print(f"Error executing query on {connection_name}: {e}")
+            if raise_errors:
+                raise
+            return []
+
+    def iter_query(
+        self,
+        query: str,
+        params: Optional[Tuple] = None,
+        connection_name: str = 'primary',
+        row_type: str = 'dict',
+        batch_size: int = None
+    ) -> Iterator[Any]:
+        """Stream a SELECT through an unbuffered cursor, batch_size rows per round trip.
+
+        row_type is 'dict', 'tuple' or 'record' (see query_stream). The pooled connection
+        stays checked out until the generator is exhausted or closed.
+
+        Unlike execute_query this raises Error when the node is unreachable or the query
+        fails, also mid-stream (after the connection is checked back in), so a cut-off
+        listing can never pass for a complete one.
+        """
+        pool = self._get_pool(connection_name)
+
+        if not pool:
+            raise Error(msg=f"No connection to {connection_name} database")
+
+        batch_size = batch_size or STREAM_CONFIG.get('fetch_batch_size', 1000)
+        try:
+            connection = pool.checkout()
+        except Error as e:
+            print(f"Error streaming query on {connection_name}: {e}")
+            raise
+
+        broken = False
+        cursor = None
+        try:
+            cursor = connection.cursor(buffered=False)
             if params:
                 cursor.execute(query, params)
             else:
                 cursor.execute(query)
 
-            # For INSERT/UPDATE/DELETE operations, commit and return affected rows
-            if modify:
+            make_row = row_factory(cursor.column_names, row_type)
+            while True:
+                batch = cursor.fetchmany(batch_size)
+                if not batch:
+                    break
+                for values in batch:
+                    yield make_row(values)
+        except Error as e:
+            broken = isinstance(e, pool.BROKEN_CONNECTION_ERRORS)
+            print(f"Error streaming query on {connection_name}: {e}")
+            raise
+        finally:
+            # Abandoned mid-stream: dropping the socket is cheaper than draining the unread rows
+            if getattr(connection, 'unread_result', False):
+                broken = True
+            elif cursor is not None:
+                try:
+                    cursor.close()
+                except Error:
+                    broken = True
+            pool.checkin(connection, broken=broken)
+
+    def _execute_insert(self, query: str, params: Tuple, connection_name: str) -> int:
+        """Execute a single INSERT and commit; returns the AUTO_INCREMENT id from the same round trip"""
+        pool = self._get_pool(connection_name)
+        if not pool:
+            raise Error(msg=f"No connection to {connection_name} database")
+
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
                 connection.commit()
-                result = [{'affected_rows': cursor.rowcount}]
-            else:
-                result = cursor.fetchall()
+                return cursor.lastrowid
+            finally:
+                cursor.close()
 
-            cursor.close()
-            return result
-        except Error as e:
-            print(f"Error executing query on {connection_name}: {e}")
-            return []
+    def _execute_write(self, query: str, params: Tuple, connection_name: str) -> int:
+        """Execute a single write on a pooled connection and commit. Raises Error on failure."""
+        pool = self._get_pool(connection_name)
+        if not pool:
+            raise Error(msg=f"No connection to {connection_name} database")
+
+        with pool.connection() as connection:
+            cursor = connection.cursor()
+            try:
+                cursor.execute(query, params)
+                connection.commit()
+                return cursor.rowcount
+            finally:
+                cursor.close()
 
     # ---------------------------------------------------------------------
     # SEARCH / FEDERATED
     # ---------------------------------------------------------------------
 
-    def search_companies(self, service_type: str, region: str = None) -> List[Dict]:
-        """Search companies in primary database"""
-        query = """
-        SELECT c.*, s.service_name, s.category
-        FROM companies c
-        LEFT JOIN SERVICE_TYPE s ON c.business_type LIKE CONCAT('%', s.category, '%')
-        WHERE 1=1
-        """
+    # Search results are cached per (node, service_type, region)
+    @staticmethod
+    def _search_cache_key(node: str, service_type: str, region: str = None) -> Tuple[str, str, str]:
+        return (node, (service_type or '').strip().lower(), (region or '').strip().lower())
+
+    @staticmethod
+    def _copy_search_result(value: Any) -> Any:
+        """Two-level copy so callers can sort/annotate rows without touching cached data"""
+        if isinstance(value, list):
+            return [row.copy() if isinstance(row, (dict, Provider)) else row for row in value]
+        if isinstance(value, dict):
+            return {
+                key: DistributedDatabaseManager._copy_search_result(item)
+                if isinstance(item, list) else (item.copy() if isinstance(item, (dict, Provider)) else item)
+                for key, item in value.items()
+            }
+        return value
+
+    def invalidate_search_cache(self, *nodes: str) -> int:
+        """Drop cached searches for the given nodes (and every federated result built from them)"""
+        affected = set(nodes) | {'federated'}
+        self.data_version += 1
+        return self.cache.invalidate(lambda key: key[0] in affected)
+
+    def search_companies(self, service_type: str, region: str = None, raise_errors: bool = False) -> List[Dict]:
+        """Search companies in primary database (raise_errors: raise Error instead of returning [])"""
+        cache_key = self._search_cache_key('primary', service_type, region)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        query, params = self._company_search_sql(service_type, region)
+        try:
+            results = self.execute_query(query, tuple(params) if params else None, 'primary', raise_errors=True)
+        except Error:
+            # A failed query is not "no providers": don't cache it for the whole TTL
+            if raise_errors:
+                raise
+            return []
+        self.cache.set(cache_key, results)
+        return results
 
+    def search_employees(self, service_type: str, region: str = None, raise_errors: bool = False) -> List[Dict]:
+        """Search employees in secondary database (service_booking_secondary.employee)"""
+        cache_key = self._search_cache_key('secondary', service_type, region)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
+
+        query, params = self._employee_search_sql(service_type, region)
+        try:
+            results = self.execute_query(query, tuple(params) if params else None, 'secondary', raise_errors=True)
+        except Error:
+            # A failed query is not "no providers": don't cache it for the whole TTL
+            if raise_errors:
+                raise
+            return []
+        self.cache.set(cache_key, results)
+        return results
+
+    def _company_search_sql(self, service_type: str, region: str = None) -> Tuple[str, List]:
+        """Company search SQL: FULLTEXT relevance ranking when indexed, LIKE scan otherwise"""
+        terms = self._fulltext_terms(service_type) if self.fulltext_ready['primary'] else ''
         params = []
-        if service_type:
-            query += " AND (s.service_name LIKE %s OR s.category LIKE %s OR c.specialization_areas LIKE %s)"
-            params.extend([f"%{service_type}%", f"%{service_type}%", f"%{service_type}%"])
+
+        if terms:
+            # Companies match on their own text or through a mapped service; both branches use
+            # a FULLTEXT index and their scores are summed into the relevance returned to callers
+            query = """
+            SELECT c.*, s.service_name, s.category, m.relevance
+            FROM (
+                SELECT hits.company_id, SUM(hits.score) AS relevance, MIN(hits.service_id) AS service_id
+                FROM (
+                    SELECT c1.company_id,
+                           MATCH(c1.company_name, c1.business_type, c1.specialization_areas)
+                               AGAINST (%s IN BOOLEAN MODE) AS score,
+                           (SELECT MIN(cs1.service_id) FROM COMPANY_SERVICES cs1
+                            WHERE cs1.company_id = c1.company_id) AS service_id
+                    FROM companies c1
+                    WHERE MATCH(c1.company_name, c1.business_type, c1.specialization_areas)
+                          AGAINST (%s IN BOOLEAN MODE)
+                    UNION ALL
+                    SELECT cs2.company_id,
+                           MATCH(s2.service_name, s2.category) AGAINST (%s IN BOOLEAN MODE) AS score,
+                           s2.service_id
+                    FROM SERVICE_TYPE s2
+                    JOIN COMPANY_SERVICES cs2 ON cs2.service_id = s2.service_id
+                    WHERE MATCH(s2.service_name, s2.category) AGAINST (%s IN BOOLEAN MODE)
+                ) hits
+                GROUP BY hits.company_id
+            ) m
+            JOIN companies c ON c.company_id = m.company_id
+            LEFT JOIN SERVICE_TYPE s ON s.service_id = m.service_id
+            WHERE 1=1
+            """
+            params.extend([terms] * 4)
+        else:
+            query = """
+            SELECT c.*, s.service_name, s.category, 0 AS relevance
+            FROM companies c
+            LEFT JOIN SERVICE_TYPE s ON c.business_type LIKE CONCAT('%', s.category, '%')
+            WHERE 1=1
+            """
+            if service_type:
+                query += " AND (s.service_name LIKE %s OR s.category LIKE %s OR c.specialization_areas LIKE %s)"
+                params.extend([f"%{service_type}%", f"%{service_type}%", f"%{service_type}%"])
 
         if region:
+            # Applied to the already narrowed match set, so the LIKE stays cheap
             query += " AND c.service_regions LIKE %s"
             params.append(f"%{region}%")
 
-        query += " ORDER BY c.rating DESC, c.total_reviews DESC LIMIT 50"
+        query += " ORDER BY relevance DESC, c.rating DESC, c.total_reviews DESC LIMIT 50"
+        return query, params
 
-        return self.execute_query(query, tuple(params) if params else None, 'primary')
+    def _employee_search_sql(self, service_type: str, region: str = None) -> Tuple[str, List]:
+        """Employee search SQL: FULLTEXT relevance ranking when indexed, LIKE scan otherwise"""
+        terms = self._fulltext_terms(service_type) if self.fulltext_ready['secondary'] else ''
+        params = []
 
-    def search_employees(self, service_type: str, region: str = None) -> List[Dict]:
-        """Search employees in secondary database (service_booking_secondary.employee)"""
-        query = """
+        relevance = "MATCH(e.specialization, e.bio) AGAINST (%s IN BOOLEAN MODE)" if terms else "0"
+        query = f"""
         SELECT
             e.employee_id,
             e.name        AS user_name,
@@ -1323,13 +1704,15 @@ class DistributedDatabaseManager:
             e.avg_cost_per_hour,
             e.preferred_regions,
             e.emergency_service,
-            e.availability_status
+            e.availability_status,
+            {relevance} AS relevance
         FROM employee e
         WHERE e.availability_status = 'Available'
         """
-
-        params = []
-        if service_type:
+        if terms:
+            query += " AND MATCH(e.specialization, e.bio) AGAINST (%s IN BOOLEAN MODE)"
+            params.extend([terms, terms])
+        elif service_type:
             query += " AND (e.specialization LIKE %s OR e.bio LIKE %s)"
             like = f"%{service_type}%"
             params.extend([like, like])
@@ -1338,20 +1721,47 @@ class DistributedDatabaseManager:
             query += " AND e.preferred_regions LIKE %s"
             params.append(f"%{region}%")
 
-        query += " ORDER BY e.rating DESC, e.total_completed_orders DESC LIMIT 50"
-
-        return self.execute_query(query, tuple(params) if params else None, 'secondary')
+        query += " ORDER BY relevance DESC, e.rating DESC, e.total_completed_orders DESC LIMIT 50"
+        return query, params
+
+    def explain_search_queries(self, service_type: str = 'plumbing', region: str = None) -> Dict:
+        """EXPLAIN both provider searches; flags full table scans so index regressions are visible"""
+        report = {}
+        for node, builder in (('primary', self._company_search_sql), ('secondary', self._employee_search_sql)):
+            if not self._get_pool(node):
+                report[node] = {'status': 'offline'}
+                continue
+            query, params = builder(service_type, region)
+            try:
+                plan = self.execute_query("EXPLAIN " + query, tuple(params) if params else None, node,
+                                          raise_errors=True)
+            except Error as e:
+                # An empty plan would pass as "no full scans"
+                report[node] = {'status': 'error', 'reason': str(e)}
+                continue
+            full_scans = [
+                row.get('table') for row in plan
+                if row.get('type') == 'ALL' and row.get('table') in ('c', 'c1', 's', 's2', 'e')
+            ]
+            report[node] = {
+                'status': 'ok' if not full_scans else 'full_scan',
+                'fulltext': self.fulltext_ready[node],
+                'full_scans': full_scans,
+                'plan': plan,
+            }
+        return report
 
     def get_cross_laptop_results(self, service_type: str, region: str = None) -> Dict:
-        """Get combined results from both databases"""
-        # Search companies (primary database)
-        companies = self.search_companies(service_type, region)
+        """Get combined results from both databases, querying both nodes concurrently"""
+        cache_key = self._search_cache_key('federated', service_type, region)
+        cached = self.cache.get(cache_key)
+        if cached is not None:
+            return cached
 
-        # Search employees (secondary database)
-        employees = self.search_employees(service_type, region)
+        companies, employees, node_timings = self._fan_out_node_searches(service_type, region)
 
         # If secondary DB is not available or returned nothing, try a local fallback dataset
-        if (not self.secondary_connection) or (not employees):
+        if (not self.secondary_pool) or (not employees):
             try:
                 from pathlib import Path
                 fallback_path = Path(__file__).parent / "Enhanced_Service_Booking_Secondary_Laptop" / "research_company_profiles.json"
@@ -1384,53 +1794,9 @@ class DistributedDatabaseManager:
                 # Silently ignore fallback load errors to avoid noisy terminal output
                 employees = employees or []
 
-        # Combine and format results
-        combined_results = []
-
-        # Add companies to results
-        for company in companies:
-            combined_results.append({
-                'id': company['company_id'],
-                'name': company['company_name'],
-                'type': 'Company',
-                'business_type': company['business_type'],
-                'rating': company['rating'],
-                'description': company['description'],
-                'service_regions': company['service_regions'],
-                'avg_cost': company['avg_hourly_rate'],
-                'specialization': company['specialization_areas'],
-                'data_source': 'Primary',
-                'service_name': company.get('service_name', 'General Service'),
-                'total_reviews': company['total_reviews'],
-                'phone': company['phone'],
-                'email': company['email']
-            })
-
-        # Add employees to results
-        for employee in employees:
-            # map specialization to "job_type"/service name semantics
-            job_type = employee.get('job_type') or employee.get('specialization', 'General')
-            service_name = employee.get('service_name') or job_type
-
-            combined_results.append({
-                'id': employee['employee_id'],
-                'name': employee['user_name'],
-                'type': 'Individual Worker',
-                'business_type': job_type,
-                'rating': employee.get('rating', 0),
-                'description': employee.get('bio', ''),
-                'service_regions': employee.get('preferred_regions', ''),
-                'avg_cost': employee.get('avg_cost_per_hour', 0),
-                'specialization': employee.get('specialization', ''),
-                'data_source': 'Secondary',
-                'service_name': service_name,
-                'experience_years': employee.get('experience_years', 0),
-                'total_orders': employee.get('total_completed_orders', 0),
-                'phone': employee.get('phone', ''),
-                'email': employee.get('email', ''),
-                'certification_level': employee.get('certification_level', ''),
-                'emergency_service': employee.get('emergency_service', 0),
-            })
+        # One Provider record per row; scoring, dedup and the GUI all work on these
+        combined_results = [Provider.from_company_row(company) for company in companies]
+        combined_results.extend(Provider.from_employee_row(employee) for employee in employees)
 
         # Apply deduplication using string similarity matching (Jaro-Winkler-like)
         dedup_report = {'status': 'not_applied'}
@@ -1446,7 +1812,8 @@ class DistributedDatabaseManager:
                 'status': 'applied',
                 'original_count': len(combined_results),
                 'deduplicated_count': len(deduplicated),
-                'duplicates_removed': len(duplicates_removed)
+                'duplicates_removed': len(duplicates_removed),
+                'duplicate_groups': len({merge['group'] for merge in duplicates_removed}),
             }
 
             # Use deduplicated results
@@ -1462,16 +1829,88 @@ class DistributedDatabaseManager:
             companies_count = len(companies)
             employees_count = len(employees)
 
-        return {
+        results = {
             'companies': companies,
             'employees': employees,
             'combined_results': combined_results,
             'total_count': len(combined_results),
             'companies_count': companies_count,
             'employees_count': employees_count,
-            '_deduplication_report': dedup_report  # Internal metadata (not displayed in UI)
+            # A node that is not configured (primary-only setup) is expected to be missing
+            'partial_result': any(t['status'] not in ('ok', 'offline') for t in node_timings.values()),
+            '_deduplication_report': dedup_report,  # Internal metadata (not displayed in UI)
+            '_node_timings': node_timings
         }
 
+        # Never cache a partial answer; the slow node may be back on the next keystroke
+        if not results['partial_result']:
+            self.cache.set(cache_key, results)
+            self.last_sync_time = time.time()
+
+        return results
+
+    def _timed_node_query(self, search_fn, service_type: str, region: str) -> Tuple[List[Dict], float]:
+        """Run one node search and return (rows, elapsed seconds); query errors propagate"""
+        started = time.perf_counter()
+        rows = search_fn(service_type, region, raise_errors=True)
+        return rows, time.perf_counter() - started
+
+    def _fan_out_node_searches(
+        self,
+        service_type: str,
+        region: str = None,
+        deadline: float = None
+    ) -> Tuple[List[Dict], List[Dict], Dict[str, Dict]]:
+        """
+        Dispatch the primary and secondary searches concurrently.
+        A configured node that misses the deadline (or fails) contributes no rows and is
+        reported with status 'timeout' / 'error' so callers can flag a partial result;
+        a node without a pool is not queried and is reported as 'offline'.
+        """
+        deadline = FEDERATION_CONFIG.get('node_deadline', 4.0) if deadline is None else deadline
+        started = time.perf_counter()
+
+        rows_by_node = {}
+        node_timings = {}
+        futures = {}
+        for node, search_fn in (('primary', self.search_companies), ('secondary', self.search_employees)):
+            if not self._get_pool(node):
+                rows_by_node[node] = []
+                node_timings[node] = {'status': 'offline', 'elapsed_ms': 0.0, 'rows': 0}
+                continue
+            futures[node] = self.search_executor.submit(self._timed_node_query, search_fn, service_type, region)
+        wait(futures.values(), timeout=deadline)
+
+        for node, future in futures.items():
+            if not future.done():
+                # Leave the straggler running in the background; its pooled connection is returned when it finishes
+                rows_by_node[node] = []
+                node_timings[node] = {
+                    'status': 'timeout',
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+                    'rows': 0
+                }
+                continue
+
+            try:
+                rows, elapsed = future.result()
+                rows_by_node[node] = rows or []
+                node_timings[node] = {
+                    'status': 'ok',
+                    'elapsed_ms': round(elapsed * 1000, 2),
+                    'rows': len(rows_by_node[node])
+                }
+            except Exception as e:
+                rows_by_node[node] = []
+                node_timings[node] = {
+                    'status': 'error',
+                    'elapsed_ms': round((time.perf_counter() - started) * 1000, 2),
+                    'rows': 0,
+                    'reason': str(e)
+                }
+
+        return rows_by_node['primary'], rows_by_node['secondary'], node_timings
+
     # ---------------------------------------------------------------------
     # PROVIDER DETAILS
     # ---------------------------------------------------------------------
@@ -1597,20 +2036,8 @@ class DistributedDatabaseManager:
                 """
                 results = self.execute_query(query, (provider_id,), 'primary')
                 if results:
-                    company = results[0]
-                    return {
-                        'id': company['company_id'],
-                        'name': company['company_name'],
-                        'type': 'Company',
-                        'email': company['email'],
-                        'phone': company['phone'],
-                        'description': company['description'],
-                        'rating': company['rating'],
-                        'avg_cost': company['avg_hourly_rate'] or company.get('service_cost', 0),
-                        'service_type': company.get('service_name', 'General'),
-                        'specialization': company['specialization_areas'],
-                        'regions': company['service_regions']
-                    }
+                    # 'service_type' / 'regions' are aliases of service_name / service_regions
+                    return Provider.from_company_row(results[0], service_name=results[0].get('service_name') or 'General')
 
             elif provider_type.lower() in ['individual', 'individual worker']:
                 # Get employee details from secondary.employee
@@ -1637,22 +2064,13 @@ class DistributedDatabaseManager:
                 results = self.execute_query(query, (provider_id,), 'secondary')
                 if results:
                     employee = results[0]
-                    return {
-                        'id': employee['employee_id'],
-                        'name': employee['user_name'],
-                        'type': 'Individual Worker',
-                        'email': employee['email'],
-                        'phone': employee['phone'],
-                        'address': '',  # not in schema
-                        'description': employee.get('bio', f"Professional {employee.get('specialization', 'Worker')}"),
-                        'rating': employee['rating'],
-                        'avg_cost': employee['avg_cost_per_hour'] or 0,
-                        'service_type': employee.get('specialization', 'General'),
-                        'specialization': employee.get('specialization', ''),
-                        'regions': employee.get('preferred_regions', ''),
-                        'availability': employee.get('availability_status', 'Available'),
-                        'experience_years': employee.get('experience_years', 0)
-                    }
+                    return Provider.from_employee_row(
+                        employee,
+                        address='',  # not in schema
+                        description=employee.get('bio', f"Professional {employee.get('specialization', 'Worker')}"),
+                        service_name=employee.get('specialization', 'General'),
+                        availability_status=employee.get('availability_status', 'Available')
+                    )
 
             return {}
 
@@ -1664,8 +2082,66 @@ class DistributedDatabaseManager:
     # CUSTOMER / EMPLOYEE ORDERS (PERMANENT IN PRIMARY)
     # ---------------------------------------------------------------------
 
-    def get_customer_orders_permanent(self, customer_id: int = None) -> List[Dict]:
-        """Get customer orders from permanent storage (primary.ORDER_TABLE)"""
+    # ------------------------------------------------------------------
+    # KEYSET PAGINATION
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _keyset_clause(sort_column: str, id_column: str, after: Tuple, descending: bool = True) -> Tuple[str, List]:
+        """WHERE fragment for rows that come after `after` = (sort value, id) in ORDER BY sort, id"""
+        sort_value, last_id = after
+        op = '<' if descending else '>'
+        # MySQL sorts NULLs first ascending and last descending
+        if sort_value is None:
+            if descending:
+                return f"({sort_column} IS NULL AND {id_column} {op} %s)", [last_id]
+            return f"({sort_column} IS NOT NULL OR {id_column} {op} %s)", [last_id]
+
+        clause = f"({sort_column} {op} %s OR ({sort_column} = %s AND {id_column} {op} %s)"
+        clause += f" OR {sort_column} IS NULL)" if descending else ")"
+        return clause, [sort_value, sort_value, last_id]
+
+    @classmethod
+    def _paginate(
+        cls,
+        query: str,
+        params: List,
+        sort_column: str,
+        id_column: str,
+        page_size: int = None,
+        after: Tuple = None,
+        descending: bool = True,
+    ) -> Tuple[str, List]:
+        """Append the keyset predicate, ORDER BY and LIMIT to a query ending in its WHERE clause"""
+        params = list(params)
+        if after is not None:
+            clause, clause_params = cls._keyset_clause(sort_column, id_column, after, descending)
+            query += f" AND {clause}"
+            params.extend(clause_params)
+
+        direction = 'DESC' if descending else 'ASC'
+        query += f" ORDER BY {sort_column} {direction}, {id_column} {direction}"
+        if page_size:
+            query += " LIMIT %s"
+            params.append(int(page_size))
+        return query, params
+
+    @staticmethod
+    def next_page_cursor(rows: List[Dict], page_size: int, sort_key: str, id_key: str) -> Optional[Tuple]:
+        """Cursor for the page after `rows`, or None once the listing is exhausted"""
+        if not page_size or len(rows) < page_size:
+            return None
+        last = rows[-1]
+        return (last.get(sort_key), last.get(id_key))
+
+    def get_customer_orders_permanent(
+        self, customer_id: int = None, page_size: int = None, after: Tuple = None
+    ) -> List[Dict]:
+        """Get customer orders from permanent storage (primary.ORDER_TABLE), newest first.
+
+        With page_size, returns one page; pass next_page_cursor(rows, page_size, 'created_at', 'order_id')
+        as `after` to fetch the following one.
+        """
         try:
             if customer_id is None:
                 return []
@@ -1677,10 +2153,10 @@ class DistributedDatabaseManager:
                 o.created_at, o.updated_at, o.customer_notes
             FROM ORDER_TABLE o
             WHERE o.customer_id = %s
-            ORDER BY o.updated_at DESC
             """
+            query, params = self._paginate(query, [customer_id], 'o.created_at', 'o.order_id', page_size, after)
 
-            results = self.execute_query(query, (customer_id,), 'primary')
+            results = self.execute_query(query, tuple(params), 'primary')
             orders = []
 
             print(f"[DEBUG] Found {len(results)} orders for customer {customer_id}")
@@ -1708,8 +2184,10 @@ class DistributedDatabaseManager:
             print(f"Error getting customer orders: {e}")
             return []
 
-    def get_employee_orders_permanent(self, employee_id: int) -> List[Dict]:
-        """Get employee orders from permanent storage (primary.ORDER_TABLE)"""
+    def get_employee_orders_permanent(
+        self, employee_id: int, page_size: int = None, after: Tuple = None
+    ) -> List[Dict]:
+        """Get employee orders from permanent storage (primary.ORDER_TABLE), newest first (keyset paged like customer orders)"""
         try:
             if employee_id is None:
                 return []
@@ -1720,11 +2198,11 @@ class DistributedDatabaseManager:
                 o.service_description, o.urgency, o.estimated_cost, o.status,
                 o.created_at, o.updated_at, o.customer_notes
             FROM ORDER_TABLE o
-            WHERE o.employee_id = %s OR (o.status = 'pending' AND o.employee_id IS NULL)
-            ORDER BY o.created_at DESC
+            WHERE (o.employee_id = %s OR (o.status = 'pending' AND o.employee_id IS NULL))
             """
+            query, params = self._paginate(query, [employee_id], 'o.created_at', 'o.order_id', page_size, after)
 
-            results = self.execute_query(query, (employee_id,), 'primary')
+            results = self.execute_query(query, tuple(params), 'primary')
             orders = []
 
             for row in results:
@@ -1734,6 +2212,7 @@ class DistributedDatabaseManager:
                 order = {
                     'order_id': row['order_id'],
                     'order_number': row['order_number'],
+                    'customer_id': row['customer_id'],
                     'customer_name': customer_name,
                     'service_type': row['service_type'],
                     'service_description': row['service_description'],
@@ -1765,10 +2244,11 @@ class DistributedDatabaseManager:
     ) -> int:
         """Create a permanent order in the primary database"""
         try:
-            # Generate unique order number
-            count_result = self.execute_query('SELECT COUNT(*) as count FROM ORDER_TABLE', None, 'primary')
-            order_count = int(count_result[0]['count']) + 1 if count_result else 1
-            order_number = f"ORD{customer_id:04d}{provider_id:03d}{order_count:04d}"
+            if not self.order_numbers:
+                raise Error(msg="No connection to primary database")
+
+            # Unique order number from the block allocator (no COUNT(*) scan, no races)
+            order_number = f"ORD{customer_id:04d}{provider_id:03d}{self.order_numbers.next_value():06d}"
 
             query = """
             INSERT INTO ORDER_TABLE (
@@ -1777,19 +2257,16 @@ class DistributedDatabaseManager:
             ) VALUES (%s, %s, %s, %s, %s, %s, 'pending', %s, NOW())
             """
 
-            self.execute_query(
+            # The new order ID comes back with the INSERT itself
+            order_id = self._execute_insert(
                 query,
                 (order_number, customer_id, service_type,
                  service_description, urgency, estimated_cost, customer_notes),
-                'primary',
-                modify=True
+                'primary'
             )
 
-            # Get the new order ID
-            result = self.execute_query("SELECT LAST_INSERT_ID() as order_id", None, 'primary')
-            order_id = result[0]['order_id'] if result else None
-
             if order_id:
+                self.invalidate_search_cache('primary' if provider_type.lower() == 'company' else 'secondary')
                 print(f"✅ Order created successfully: {order_number}")
                 return order_id
             else:
@@ -1841,6 +2318,9 @@ class DistributedDatabaseManager:
                 query = f"UPDATE ORDER_TABLE SET {', '.join(set_clauses)}, updated_at = NOW() WHERE order_id = %s"
                 self.execute_query(query, (order_id,), 'primary', modify=True)
 
+            # Status changes feed employee stats (completed orders, availability)
+            self.invalidate_search_cache('secondary')
+
             print(f"✅ Order {order_id} status updated to: {status}")
             return True
 
@@ -1860,28 +2340,239 @@ class DistributedDatabaseManager:
             WHERE order_id = %s
             """
 
-            self.execute_query(query, (employee_id, order_id), 'primary', modify=True)
-
-            # Verify the update worked
-            check_query = "SELECT status FROM ORDER_TABLE WHERE order_id = %s"
-            result = self.execute_query(check_query, (order_id,), 'primary')
-            if result and result[0]['status'] == 'cancelled':
-                print(f"✅ Order {order_id} cancelled successfully - Status verified")
+            # Matched-row count from the UPDATE itself replaces a verification SELECT
+            if self._execute_write(query, (employee_id, order_id), 'primary') > 0:
+                self.invalidate_search_cache('secondary')
+                print(f"✅ Order {order_id} cancelled successfully")
                 return True
             else:
-                print(f"⚠ Order {order_id} cancel may have failed - Status not updated")
+                print(f"⚠ Order {order_id} cancel may have failed - Order not found")
                 return False
 
         except Exception as e:
             print(f"Error cancelling order: {e}")
             return False
 
+    # ---------------------------------------------------------------------
+    # BULK ORDER OPERATIONS (partner imports, end-of-day close-out)
+    # ---------------------------------------------------------------------
+
+    ORDER_STATUSES = ('pending', 'accepted', 'in_progress', 'completed', 'cancelled')
+    ORDER_REQUIRED_FIELDS = ('customer_id', 'provider_id', 'provider_type', 'service_type')
+
+    @staticmethod
+    def _chunks(items: List, chunk_size: int):
+        for start in range(0, len(items), chunk_size):
+            yield items[start:start + chunk_size]
+
+    def create_orders_bulk(self, orders: List[Dict], chunk_size: int = None) -> List[Dict]:
+        """
+        Create many orders with one multi-row INSERT per chunk (one transaction each).
+
+        Returns one outcome per input row, in input order:
+        {'index', 'status': created/invalid/failed, 'order_id', 'order_number', 'error'}
+        """
+        chunk_size = chunk_size or ORDER_CONFIG.get('bulk_chunk_size', 500)
+        outcomes = [
+            {'index': i, 'status': 'pending', 'order_id': None, 'order_number': None, 'error': None}
+            for i in range(len(orders))
+        ]
+
+        valid = []
+        party_ids = {}  # index -> (customer_id, provider_id) as ints
+        for i, order in enumerate(orders):
+            missing = [field for field in self.ORDER_REQUIRED_FIELDS if order.get(field) in (None, '')]
+            if missing:
+                outcomes[i].update(status='invalid', error=f"Missing fields: {', '.join(missing)}")
+                continue
+            try:
+                party_ids[i] = (int(order['customer_id']), int(order['provider_id']))
+            except (TypeError, ValueError):
+                outcomes[i].update(status='invalid', error="customer_id and provider_id must be integers")
+                continue
+            valid.append(i)
+
+        if valid and not (self.primary_pool and self.order_numbers):
+            for i in valid:
+                outcomes[i].update(status='failed', error="No connection to primary database")
+            return outcomes
+
+        insert_query = """
+            INSERT INTO ORDER_TABLE (
+                order_number, customer_id, service_type, service_description,
+                urgency, estimated_cost, status, customer_notes, created_at
+            ) VALUES (%s, %s, %s, %s, %s, %s, 'pending', %s, NOW())
+        """
+
+        touched_nodes = set()
+        for chunk in self._chunks(valid, chunk_size):
+            rows = []
+            for i in chunk:
+                order = orders[i]
+                customer_id, provider_id = party_ids[i]
+                order_number = f"ORD{customer_id:04d}{provider_id:03d}{self.order_numbers.next_value():06d}"
+                outcomes[i]['order_number'] = order_number
+                rows.append((
+                    order_number, customer_id, order['service_type'],
+                    order.get('service_description'), order.get('urgency', 'medium'),
+                    order.get('estimated_cost'), order.get('customer_notes')
+                ))
+                touched_nodes.add('primary' if str(order['provider_type']).lower() == 'company' else 'secondary')
+
+            try:
+                with self.primary_pool.connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        # mysql.connector folds executemany INSERTs into one multi-row statement
+                        cursor.executemany(insert_query, rows)
+                        # Multi-row inserts only report the first id, so map numbers back to ids
+                        numbers = [row[0] for row in rows]
+                        cursor.execute(
+                            f"SELECT order_id, order_number FROM ORDER_TABLE "
+                            f"WHERE order_number IN ({', '.join(['%s'] * len(numbers))})",
+                            tuple(numbers)
+                        )
+                        ids = {number: order_id for order_id, number in cursor.fetchall()}
+                        connection.commit()
+                    except Error:
+                        connection.rollback()
+                        raise
+                    finally:
+                        cursor.close()
+
+                for i in chunk:
+                    outcomes[i].update(status='created', order_id=ids.get(outcomes[i]['order_number']))
+
+            except Error as e:
+                # One bad row fails the whole chunk; retry it row by row so only that row is reported
+                print(f"⚠ Bulk order chunk failed ({e}), retrying {len(chunk)} rows individually")
+                for i, row in zip(chunk, rows):
+                    try:
+                        order_id = self._execute_insert(insert_query, row, 'primary')
+                        outcomes[i].update(status='created', order_id=order_id)
+                    except Error as row_error:
+                        outcomes[i].update(status='failed', error=str(row_error))
+
+        if touched_nodes:
+            self.invalidate_search_cache(*touched_nodes)
+
+        created = sum(1 for outcome in outcomes if outcome['status'] == 'created')
+        print(f"✅ Bulk order import: {created}/{len(orders)} created")
+        return outcomes
+
+    def update_order_statuses_bulk(self, transitions: List[Dict], chunk_size: int = None) -> List[Dict]:
+        """
+        Apply many status transitions ({'order_id', 'status', optional 'employee_id',
+        'provider_notes', 'actual_cost'}) in chunked transactions.
+
+        Transitions with identical field values (e.g. closing out a day of completed jobs)
+        share a single UPDATE ... WHERE order_id IN (...). Returns one outcome per input row:
+        {'index', 'order_id', 'status': updated/not_found/invalid/failed, 'error'}
+        """
+        chunk_size = chunk_size or ORDER_CONFIG.get('bulk_chunk_size', 500)
+        outcomes = [
+            {'index': i, 'order_id': t.get('order_id'), 'status': 'pending', 'error': None}
+            for i, t in enumerate(transitions)
+        ]
+
+        valid = []
+        order_ids = {}  # index -> order_id as int (MySQL returns ints; CSV imports give "42")
+        for i, transition in enumerate(transitions):
+            if not transition.get('order_id'):
+                outcomes[i].update(status='invalid', error="Missing order_id")
+                continue
+            if transition.get('status') not in self.ORDER_STATUSES:
+                outcomes[i].update(status='invalid', error=f"Unknown status: {transition.get('status')}")
+                continue
+            try:
+                order_ids[i] = int(transition['order_id'])
+            except (TypeError, ValueError):
+                outcomes[i].update(status='invalid', error=f"Invalid order_id: {transition['order_id']!r}")
+                continue
+            valid.append(i)
+
+        if valid and not self.primary_pool:
+            for i in valid:
+                outcomes[i].update(status='failed', error="No connection to primary database")
+            return outcomes
+
+        for chunk in self._chunks(valid, chunk_size):
+            # Same semantics as update_order_status_permanent: empty values leave columns untouched
+            groups: Dict[Tuple, List[int]] = {}
+            for i in chunk:
+                t = transitions[i]
+                key = (t['status'], t.get('employee_id') or None, t.get('provider_notes') or None, t.get('actual_cost'))
+                groups.setdefault(key, []).append(i)
+
+            try:
+                with self.primary_pool.connection() as connection:
+                    cursor = connection.cursor()
+                    try:
+                        chunk_ids = [order_ids[i] for i in chunk]
+                        cursor.execute(
+                            f"SELECT order_id FROM ORDER_TABLE WHERE order_id IN ({', '.join(['%s'] * len(chunk_ids))})",
+                            tuple(chunk_ids)
+                        )
+                        existing = {row[0] for row in cursor.fetchall()}
+
+                        for (status, employee_id, provider_notes, actual_cost), members in groups.items():
+                            member_ids = [order_ids[i] for i in members if order_ids[i] in existing]
+                            if not member_ids:
+                                continue
+                            cursor.execute(
+                                f"""
+                                UPDATE ORDER_TABLE
+                                SET status = %s,
+                                    employee_id = COALESCE(%s, employee_id),
+                                    provider_notes = COALESCE(%s, provider_notes),
+                                    estimated_cost = COALESCE(%s, estimated_cost),
+                                    completed_at = IF(%s = 'completed', NOW(), completed_at),
+                                    assigned_at = IF(%s = 'accepted' AND %s IS NOT NULL, NOW(), assigned_at),
+                                    updated_at = NOW()
+                                WHERE order_id IN ({', '.join(['%s'] * len(member_ids))})
+                                """,
+                                (status, employee_id, provider_notes, actual_cost,
+                                 status, status, employee_id, *member_ids)
+                            )
+                        connection.commit()
+                    except Error:
+                        connection.rollback()
+                        raise
+                    finally:
+                        cursor.close()
+
+                for i in chunk:
+                    if order_ids[i] in existing:
+                        outcomes[i]['status'] = 'updated'
+                    else:
+                        outcomes[i].update(status='not_found', error="Order not found")
+
+            except Error as e:
+                for i in chunk:
+                    outcomes[i].update(status='failed', error=str(e))
+
+        if any(outcome['status'] == 'updated' for outcome in outcomes):
+            # Status changes feed employee stats (completed orders, availability)
+            self.invalidate_search_cache('secondary')
+
+        updated = sum(1 for outcome in outcomes if outcome['status'] == 'updated')
+        print(f"✅ Bulk status update: {updated}/{len(transitions)} orders updated")
+        return outcomes
+
+    def cancel_orders_bulk(self, order_ids: List[int], employee_id: int) -> List[Dict]:
+        """Bulk counterpart of cancel_order_permanent"""
+        return self.update_order_statuses_bulk([
+            {'order_id': order_id, 'status': 'cancelled', 'employee_id': employee_id,
+             'provider_notes': 'Cancelled by worker'}
+            for order_id in order_ids
+        ])
+
     # ---------------------------------------------------------------------
     # LEGACY SECONDARY ORDER / FEEDBACK HELPERS (ADAPTED TO YOUR SCHEMA)
     # ---------------------------------------------------------------------
 
-    def get_customer_orders(self, customer_id: int) -> List[Dict]:
-        """Get all orders for a customer from secondary.orders"""
+    def get_customer_orders(self, customer_id: int, page_size: int = None, after: Tuple = None) -> List[Dict]:
+        """Get orders for a customer from secondary.orders, newest first (all of them unless page_size is given)"""
         orders = []
 
         query = """
@@ -1892,10 +2583,10 @@ class DistributedDatabaseManager:
         FROM orders o
         LEFT JOIN employee e ON o.employee_id = e.employee_id
         WHERE o.customer_id = %s
-        ORDER BY o.created_at DESC
         """
+        query, params = self._paginate(query, [customer_id], 'o.created_at', 'o.order_id', page_size, after)
 
-        employee_orders = self.execute_query(query, (customer_id,), 'secondary')
+        employee_orders = self.execute_query(query, tuple(params), 'secondary')
         orders.extend(employee_orders or [])
 
         return orders
@@ -1940,10 +2631,7 @@ class DistributedDatabaseManager:
                 location
             )
 
-            cursor = self.secondary_connection.cursor()
-            cursor.execute(query, params)
-            self.secondary_connection.commit()
-            cursor.close()
+            self._execute_write(query, params, 'secondary')
 
             return True
         except Error as e:
@@ -1971,10 +2659,8 @@ class DistributedDatabaseManager:
                     feedback_data.get('comments', '')
                 )
 
-                cursor = self.secondary_connection.cursor()
-                cursor.execute(query, params)
-                self.secondary_connection.commit()
-                cursor.close()
+                self._execute_write(query, params, 'secondary')
+                self.invalidate_search_cache('secondary')
 
                 return True
             else:
@@ -1993,9 +2679,10 @@ class DistributedDatabaseManager:
     def get_database_health(self) -> Dict:
         """Check health of both database connections"""
         health = {
-            'primary': self.primary_connection is not None,
-            'secondary': self.secondary_connection is not None,
+            'primary': self.primary_pool is not None,
+            'secondary': self.secondary_pool is not None,
             'cache_size': len(self.cache),
+            'cache_stats': self.cache.get_stats(),
             'last_sync': self.last_sync_time
         }
 
@@ -2015,10 +2702,114 @@ class DistributedDatabaseManager:
             except Exception:
                 health['secondary'] = False
 
+        # Pool statistics (in-use, idle, wait time, reconnects) per node
+        health['pools'] = {
+            name: pool.get_stats()
+            for name, pool in (('primary', self.primary_pool), ('secondary', self.secondary_pool))
+            if pool is not None
+        }
+
         return health
 
-    def get_all_users_admin(self) -> Dict[str, List[Dict]]:
-        """Get all users (customers and employees) for admin dashboard"""
+    # Keyset order of each admin listing: (sort column, id column, descending, sort key, id key)
+    ADMIN_LISTING_ORDER = {
+        'customers': ('registration_date', 'user_id', True, 'registration_date', 'user_id'),
+        'employees': ('created_at', 'employee_id', True, 'registration_date', 'id'),
+        'companies': ('company_name', 'company_id', False, 'name', 'id'),
+    }
+
+    def get_admin_users_page(
+        self, kind: str, page_size: int = None, after: Tuple = None, start_index: int = 1
+    ) -> List[Dict]:
+        """One keyset page of the admin 'customers', 'employees' or 'companies' listing.
+
+        Rows are streamed (iter_query); get_all_users_admin() handles fallbacks for the first page.
+        start_index numbers customer rows continuously across pages. Raises Error when the
+        listing cannot be read completely.
+        """
+        sort_column, id_column, descending, _, _ = self.ADMIN_LISTING_ORDER[kind]
+
+        if kind == 'customers':
+            query = """
+            SELECT user_id, name, email, phone, registration_date, is_active, is_verified
+            FROM USER
+            WHERE name LIKE 'Customer %'
+            """
+            query, params = self._paginate(query, [], sort_column, id_column, page_size, after, descending)
+            customer_results = self.iter_query(query, tuple(params) or None, 'primary', row_type='record')
+            return [
+                {
+                    'id': i,
+                    'user_id': customer['user_id'],
+                    'name': customer['name'],
+                    'email': customer['email'],
+                    'phone': customer['phone'],
+                    'type': 'Customer',
+                    'membership_level': 'Bronze',
+                    'total_orders': 0,
+                    'total_spent': 0.00,
+                    'registration_date': customer['registration_date'],
+                    'is_active': customer['is_active'],
+                    'is_verified': customer['is_verified']
+                }
+                for i, customer in enumerate(customer_results, start_index)
+            ]
+
+        if kind == 'employees':
+            query = """
+            SELECT
+                employee_id,
+                name,
+                email,
+                phone,
+                specialization,
+                experience_years,
+                total_completed_orders,
+                rating,
+                availability_status,
+                certification_level,
+                created_at
+            FROM employee
+            WHERE 1 = 1
+            """
+            query, params = self._paginate(query, [], sort_column, id_column, page_size, after, descending)
+            employee_results = self.iter_query(query, tuple(params) or None, 'secondary', row_type='record')
+            # 'user_id' / 'job_type' read back as id / business_type (no separate user_id in this schema)
+            return [
+                Provider.from_employee_row(
+                    employee,
+                    type='Employee',
+                    experience_years=float(employee['experience_years'] or 0),
+                    rating=float(employee['rating'] or 0),
+                    registration_date=employee['created_at'],
+                    total_earnings=0.0,  # not tracked in this schema
+                    is_active=True,
+                    is_verified=True
+                )
+                for employee in employee_results
+            ]
+
+        query = """
+        SELECT company_id, company_name, business_type, description, rating, total_reviews,
+               phone, email, website, specialization_areas, service_regions
+        FROM companies
+        WHERE 1 = 1
+        """
+        query, params = self._paginate(query, [], sort_column, id_column, page_size, after, descending)
+        company_results = self.iter_query(query, tuple(params) or None, 'primary', row_type='record')
+        # 'specialization_areas' reads back as the record's specialization
+        return [Provider.from_company_row(company) for company in company_results]
+
+    def next_admin_page_cursor(self, kind: str, rows: List[Dict], page_size: int) -> Optional[Tuple]:
+        """Cursor for the admin listing page after `rows` (None when exhausted)"""
+        _, _, _, sort_key, id_key = self.ADMIN_LISTING_ORDER[kind]
+        return self.next_page_cursor(rows, page_size, sort_key, id_key)
+
+    def get_all_users_admin(self, page_size: int = None) -> Dict[str, List[Dict]]:
+        """Get all users (customers and employees) for admin dashboard.
+
+        With page_size only the first page of each listing is returned; continue with get_admin_users_page().
+        """
         try:
             users = {
                 'customers': [],
@@ -2028,29 +2819,10 @@ class DistributedDatabaseManager:
 
             # Customers from primary USER (if exists) – original behavior
             try:
-                customer_query = """
-                SELECT user_id, name, email, phone, registration_date, is_active, is_verified
-                FROM USER
-                WHERE name LIKE 'Customer %'
-                ORDER BY registration_date DESC
-                """
-                customer_results = self.execute_query(customer_query, None, 'primary')
-                if customer_results:
-                    for i, customer in enumerate(customer_results, 1):
-                        users['customers'].append({
-                            'id': i,
-                            'user_id': customer['user_id'],
-                            'name': customer['name'],
-                            'email': customer['email'],
-                            'phone': customer['phone'],
-                            'type': 'Customer',
-                            'membership_level': 'Bronze',
-                            'total_orders': 0,
-                            'total_spent': 0.00,
-                            'registration_date': customer['registration_date'],
-                            'is_active': customer['is_active'],
-                            'is_verified': customer['is_verified']
-                        })
+                users['customers'] = self.get_admin_users_page('customers', page_size)
+            except Error as e:
+                # Database failure: show no customers rather than the sample ones
+                print(f"Error getting customers: {e}")
             except Exception as e:
                 print(f"Error getting customers: {e}")
                 # Fallback sample
@@ -2080,44 +2852,7 @@ class DistributedDatabaseManager:
 
             # Employees from secondary.employee
             try:
-                employee_query = """
-                SELECT
-                    employee_id,
-                    name,
-                    email,
-                    phone,
-                    specialization,
-                    experience_years,
-                    total_completed_orders,
-                    rating,
-                    availability_status,
-                    certification_level,
-                    created_at
-                FROM employee
-                ORDER BY created_at DESC
-                """
-                employee_results = self.execute_query(employee_query, None, 'secondary')
-                if employee_results:
-                    for employee in employee_results:
-                        users['employees'].append({
-                            'id': employee['employee_id'],
-                            'user_id': employee['employee_id'],   # no separate user_id in this schema
-                            'name': employee['name'],
-                            'email': employee['email'],
-                            'phone': employee['phone'],
-                            'type': 'Employee',
-                            'job_type': employee['specialization'],
-                            'specialization': employee['specialization'],
-                            'experience_years': float(employee['experience_years'] or 0),
-                            'total_orders': employee['total_completed_orders'],
-                            'total_earnings': 0.0,  # not tracked in this schema
-                            'rating': float(employee['rating'] or 0),
-                            'availability_status': employee['availability_status'],
-                            'certification_level': employee['certification_level'],
-                            'registration_date': employee['created_at'],
-                            'is_active': True,
-                            'is_verified': True
-                        })
+                users['employees'] = self.get_admin_users_page('employees', page_size)
             except Exception as e:
                 print(f"Error getting employees: {e}")
 
@@ -2156,29 +2891,7 @@ class DistributedDatabaseManager:
 
             # Companies from primary.companies
             try:
-                company_query = """
-                SELECT company_id, company_name, business_type, description, rating, total_reviews,
-                       phone, email, website, specialization_areas, service_regions
-                FROM companies
-                ORDER BY company_name ASC
-                """
-                company_results = self.execute_query(company_query, None, 'primary')
-                if company_results:
-                    for company in company_results:
-                        users['companies'].append({
-                            'id': company['company_id'],
-                            'name': company['company_name'],
-                            'email': company['email'],
-                            'phone': company['phone'],
-                            'type': 'Company',
-                            'business_type': company['business_type'],
-                            'description': company['description'],
-                            'rating': company['rating'],
-                            'total_reviews': company['total_reviews'],
-                            'specialization_areas': company['specialization_areas'],
-                            'service_regions': company['service_regions'],
-                            'website': company['website']
-                        })
+                users['companies'] = self.get_admin_users_page('companies', page_size)
             except Exception as e:
                 print(f"Error getting companies: {e}")
 
@@ -2275,9 +2988,10 @@ class DistributedDatabaseManager:
             }
 
     def close_connections(self):
-        """Close all database connections"""
-        if self.primary_connection:
-            self.primary_connection.close()
-        if self.secondary_connection:
-            self.secondary_connection.close()
+        """Close all database connection pools"""
+        self.search_executor.shutdown(wait=False)
+        if self.primary_pool:
+            self.primary_pool.close_all()
+        if self.secondary_pool:
+            self.secondary_pool.close_all()
         # print("Database connections closed")  # Hidden for cleaner output
@@ -481,14 +481,38 @@
 import json
 import re
 import logging
-from typing import Any, Dict, List
+import threading
+from pathlib import Path
+from typing import Any, Dict, List, Optional
 
 from google import genai  
 
-from config import LLM_CONFIG, SERVICE_SORTING_WEIGHTS, SERVICE_TYPES  # keep as before
+from config import LLM_CONFIG, LLM_CACHE_CONFIG, SERVICE_SORTING_WEIGHTS, SERVICE_TYPES  # keep as before
+from llm_response_cache import LLMResponseCache
 
 logger = logging.getLogger(__name__)
 
+# One response cache per process, shared by every DistributedLLMService instance
+_shared_response_cache: Optional[LLMResponseCache] = None
+_shared_response_cache_lock = threading.Lock()
+
+
+def get_shared_response_cache() -> Optional[LLMResponseCache]:
+    """Build (once) the response cache described by LLM_CACHE_CONFIG"""
+    global _shared_response_cache
+    if not LLM_CACHE_CONFIG.get('enabled', True):
+        return None
+    with _shared_response_cache_lock:
+        if _shared_response_cache is None:
+            disk_file = LLM_CACHE_CONFIG.get('disk_file')
+            _shared_response_cache = LLMResponseCache(
+                max_entries=LLM_CACHE_CONFIG.get('max_entries', 512),
+                ttl_seconds=LLM_CACHE_CONFIG.get('ttl_seconds', 3600),
+                disk_path=str(Path(__file__).with_name(disk_file)) if disk_file else None,
+                disk_max_entries=LLM_CACHE_CONFIG.get('disk_max_entries', 5000),
+            )
+        return _shared_response_cache
+
 
 class DistributedLLMService:
     def __init__(self):
@@ -496,6 +520,10 @@ class DistributedLLMService:
         self.model = LLM_CONFIG.get('model', 'gemini-2.0-flash-001')
         self.use_mock_service = False  # if True, we short-circuit to fallbacks
 
+        # Identical prompts are answered from cache instead of another Gemini call
+        self.response_cache = get_shared_response_cache()
+        self.api_calls = 0
+
         # GenAI client (Gemini Developer API or Vertex depending on env/config)
         self.client = None
         try:
@@ -540,19 +568,38 @@ class DistributedLLMService:
                     prompt_parts.append(content)
 
             prompt = "\n\n".join(prompt_parts).strip()
+            generation_config = {
+                "temperature": LLM_CONFIG.get("temperature", 0.3),
+                "max_output_tokens": LLM_CONFIG.get("max_tokens", 1024),
+            }
+
+            cache_key = None
+            if self.response_cache is not None:
+                cache_key = self.response_cache.make_key(self.model, prompt, **generation_config)
+                cached_text = self.response_cache.get(cache_key)
+                if cached_text is not None:
+                    return {
+                        "choices": [{
+                            "message": {
+                                "content": cached_text
+                            }
+                        }]
+                    }
 
             # Call Gemini via GenAI SDK
+            self.api_calls += 1
             response = self.client.models.generate_content(
                 model=self.model,
                 contents=prompt,
-                generation_config={
-                    "temperature": LLM_CONFIG.get("temperature", 0.3),
-                    "max_output_tokens": LLM_CONFIG.get("max_tokens", 1024),
-                },
+                generation_config=generation_config,
             )
 
             text = getattr(response, "text", "") or ""
 
+            # Only real answers are cached; fallbacks are cheap and should not mask a recovered API
+            if cache_key and text:
+                self.response_cache.set(cache_key, text, self.model)
+
             # Wrap Gemini text result to look like OpenAI-style response
             return {
                 "choices": [{
@@ -574,6 +621,12 @@ class DistributedLLMService:
                 }]
             }
 
+    def get_cache_stats(self) -> Dict[str, Any]:
+        """Response cache metrics plus the number of real API calls this instance made"""
+        stats = self.response_cache.get_stats() if self.response_cache else {'enabled': False}
+        stats['api_calls'] = self.api_calls
+        return stats
+
     def _get_fallback_response(self, messages: List[Dict[str, str]]) -> Dict[str, Any]:
         """Get fallback response when API is unavailable"""
         user_content = messages[-1].get('content', '').lower()
@@ -1,7 +1,12 @@
-from typing import Dict, List, Any
+import time
+from concurrent.futures import ThreadPoolExecutor, wait
+from typing import Dict, List, Any, Tuple
+from config import LLM_CONFIG
 from distributed_database_manager import DistributedDatabaseManager
 from distributed_llm_service import DistributedLLMService
-from query_federation_engine import QueryFederationEngine, PromptRewriteEngine, ResearchCatalog
+from provider_record import Provider
+from provider_scoring import rank_providers
+from query_federation_engine import QueryFederationEngine, PromptRewriteEngine, ResearchCatalog, SearchRun
 
 
 class DistributedSortingService:
@@ -14,41 +19,78 @@ class DistributedSortingService:
         self.prompt_rewriter = PromptRewriteEngine()
         self.research_catalog = ResearchCatalog()
 
-    def get_intelligent_recommendations(self, user_query: str, search_preference: str = 'both', limit: int = 20) -> Dict[str, Any]:
+        # Independent post-fetch stages (cross analysis, summary) run side by side here
+        self.stage_executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix='recommendation-stage')
+
+    def get_search_run(self, user_query: str, search_preference: str = 'both') -> SearchRun:
+        """Memoized search pipeline for a query, shared by the GUI and every report below"""
+        return self.query_federation_engine.get_search_run(user_query, search_preference)
+
+    def get_intelligent_recommendations(self, user_query: str, search_preference: str = 'both', limit: int = 20,
+                                        deadline: float = None) -> Dict[str, Any]:
         """Get intelligent recommendations from distributed databases"""
+        started = time.perf_counter()
+        deadline = LLM_CONFIG.get('request_deadline', 8.0) if deadline is None else deadline
+        run = self.get_search_run(user_query, search_preference)
+
         # Analyze the user's request
-        analysis = self.llm_service.analyze_distributed_service_request(user_query, search_preference)
+        analysis = run.analysis()
 
         # Determine search scope
         search_scope = analysis.get('search_scope', 'both')
         service_type = analysis.get('service_type', '')
-        location = analysis.get('location_preference', '')
 
         print(f"Searching for: {service_type}")
         print(f"Search scope: {search_scope}")
         print(f"Recommended provider type: {analysis.get('recommended_provider_type')}")
 
-        # Get cross-laptop results
-        search_results = self.db_manager.get_cross_laptop_results(service_type, location)
+        # Cross-laptop results and intelligent sorting come from the shared run
+        search_results = run.search_results()
+        sorted_results = run.sorted_results()
 
         # Filter results based on search scope
         if search_scope == 'primary':
-            search_results['combined_results'] = [r for r in search_results['combined_results'] if r['data_source'] == 'Primary']
+            sorted_results = [r for r in sorted_results if r['data_source'] == 'Primary']
         elif search_scope == 'secondary':
-            search_results['combined_results'] = [r for r in search_results['combined_results'] if r['data_source'] == 'Secondary']
-
-        # Apply intelligent sorting
-        sorted_results = self._apply_intelligent_sorting(search_results['combined_results'], analysis)
+            sorted_results = [r for r in sorted_results if r['data_source'] == 'Secondary']
+
+        # Cross-database analysis and summary only need search_results, so run them concurrently
+        stage_futures = {
+            'cross_analysis': self.stage_executor.submit(self._timed_stage, run.cross_analysis),
+            'summary': self.stage_executor.submit(
+                self._timed_stage, self.llm_service.generate_intelligent_summary, user_query, search_results
+            ),
+        }
+        remaining = max(0.0, deadline - (time.perf_counter() - started))
+        done, _ = wait(stage_futures.values(), timeout=remaining)
 
-        # Get cross-database analysis
-        cross_analysis = self.llm_service.analyze_cross_database_results(
-            search_results['companies'],
-            search_results['employees'],
-            user_query
-        )
+        stage_results = {}
+        stage_latency_ms = {
+            'analysis': round(run.stage_timings.get('analysis', 0.0) * 1000, 2),
+            'federated_fetch': round(run.stage_timings.get('federated_fetch', 0.0) * 1000, 2),
+        }
+        degraded_stages = []
+        for stage, future in stage_futures.items():
+            if future in done and future.exception() is None:
+                stage_results[stage], elapsed = future.result()
+                stage_latency_ms[stage] = round(elapsed * 1000, 2)
+                continue
+
+            # Missed the deadline or failed: substitute the local fallback and move on
+            reason = 'timeout' if future not in done else f"error: {future.exception()}"
+            print(f"⚠️ Recommendation stage '{stage}' degraded ({reason}), using fallback")
+            degraded_stages.append({'stage': stage, 'reason': reason})
+            stage_latency_ms[stage] = None
+            if stage == 'cross_analysis':
+                stage_results[stage] = self.llm_service._fallback_cross_analysis(  # pylint: disable=protected-access
+                    search_results['companies'], search_results['employees'], user_query
+                )
+            else:
+                stage_results[stage] = self._fallback_summary(search_results)
 
-        # Generate intelligent summary
-        summary = self.llm_service.generate_intelligent_summary(user_query, search_results)
+        cross_analysis = stage_results['cross_analysis']
+        summary = stage_results['summary']
+        stage_latency_ms['total'] = round((time.perf_counter() - started) * 1000, 2)
 
         return {
             'employees': sorted_results[:limit],
@@ -56,105 +98,41 @@ class DistributedSortingService:
             'search_scope': search_scope,
             'primary_count': len(search_results['companies']),
             'secondary_count': len(search_results['employees']),
-            'total_available': len(search_results['combined_results']),
+            'total_available': len(sorted_results),
             'cross_analysis': cross_analysis,
             'summary': summary,
             'quality_analysis': cross_analysis,
-            'alternatives': self._get_alternative_suggestions(service_type, analysis)
+            'alternatives': self._get_alternative_suggestions(service_type, analysis),
+            'stage_latency_ms': stage_latency_ms,
+            'degraded_stages': degraded_stages
         }
 
-    def _apply_intelligent_sorting(self, results: List[Dict], analysis: Dict) -> List[Dict]:
-        """Apply intelligent sorting based on analysis and preferences"""
+    @staticmethod
+    def _timed_stage(stage_fn, *args) -> Tuple[Any, float]:
+        """Run one recommendation stage and return (result, elapsed seconds)"""
+        stage_started = time.perf_counter()
+        result = stage_fn(*args)
+        return result, time.perf_counter() - stage_started
+
+    @staticmethod
+    def _fallback_summary(search_results: Dict) -> str:
+        """Plain count-based summary used when the summary stage misses the deadline"""
+        total_count = search_results.get('total_count', 0)
+        if total_count == 0:
+            return "No service providers found matching your request."
+        return f"Found {total_count} service providers matching your request."
+
+    def _apply_intelligent_sorting(self, results: List[Dict], analysis: Dict, limit: int = None) -> List[Dict]:
+        """Apply intelligent sorting based on analysis and preferences (see provider_scoring)"""
         if not results:
             return results
 
-        # Scoring weights based on user preferences
-        urgency = analysis.get('urgency', 'medium')
-        complexity = analysis.get('estimated_complexity', 'moderate')
-        recommended_type = analysis.get('recommended_provider_type', 'both')
-
-        for result in results:
-            score = 0.0
-            factors = {}
-
-            # Base rating score (40% weight)
-            rating = result.get('rating', 0)
-            # Convert Decimal to float for calculations
-            rating_float = float(rating) if isinstance(rating, (int, float, str)) else 0.0
-            score += (rating_float / 5.0) * 40
-            factors['rating'] = (rating_float / 5.0) * 40
-
-            # Provider type preference (20% weight)
-            if recommended_type == 'company' and result['type'] == 'Company':
-                score += 20
-            elif recommended_type == 'individual' and result['type'] == 'Individual Worker':
-                score += 20
-            else:
-                score += 10  # Neutral score
-            factors['provider_type_match'] = score - factors.get('rating', 0)
-
-            # Urgency consideration (15% weight)
-            if urgency == 'high' or urgency == 'emergency':
-                if result.get('emergency_service', False):
-                    score += 15
-                else:
-                    # For urgent requests, prioritize faster response times
-                    response_time = result.get('avg_response_time_hours', 24)
-                    if response_time <= 2:
-                        score += 12
-                    elif response_time <= 6:
-                        score += 8
-                    elif response_time <= 12:
-                        score += 4
-            elif urgency == 'medium':
-                response_time = result.get('avg_response_time_hours', 24)
-                if response_time <= 6:
-                    score += 10
-                elif response_time <= 12:
-                    score += 6
-            factors['urgency_score'] = score - sum(factors.values())
-
-            # Experience/Reviews consideration (15% weight)
-            if result['type'] == 'Company':
-                total_reviews = result.get('total_reviews', 0)
-                if total_reviews >= 100:
-                    score += 15
-                elif total_reviews >= 50:
-                    score += 10
-                elif total_reviews >= 20:
-                    score += 5
-            else:  # Individual Worker
-                experience = result.get('experience_years', 0)
-                total_orders = result.get('total_orders', 0)
-                if experience >= 10 and total_orders >= 100:
-                    score += 15
-                elif experience >= 5 and total_orders >= 50:
-                    score += 10
-                elif experience >= 2 and total_orders >= 20:
-                    score += 5
-            factors['experience_score'] = score - sum(factors.values())
-
-            # Certification level consideration (10% weight)
-            if result['type'] == 'Individual Worker':
-                cert_level = result.get('certification_level', 'None')
-                if cert_level == 'Master':
-                    score += 10
-                elif cert_level == 'Professional':
-                    score += 8
-                elif cert_level == 'Basic':
-                    score += 5
-            else:  # Company
-                # Companies get base score for being established
-                score += 6
-            factors['certification_score'] = score - sum(factors.values())
-
-            result['comprehensive_score'] = score
-            result['scoring_factors'] = factors
-
-        # Sort by comprehensive score (descending)
-        results.sort(key=lambda x: x.get('comprehensive_score', 0), reverse=True)
-
-        return results
+        ranked = rank_providers(results, analysis, limit)
+        if limit is None:
+            # Callers rely on the list being sorted in place
+            results[:] = ranked
+            return results
+        return ranked
 
     def _get_alternative_suggestions(self, service_type: str, analysis: Dict) -> List[str]:
         """Get alternative service suggestions"""
@@ -182,46 +160,10 @@ class DistributedSortingService:
         """Get specific recommendations for provider type"""
         if provider_type == 'company':
             # Search only in primary database
-            companies = self.db_manager.search_companies(service_type)
-            results = []
-            for company in companies:
-                results.append({
-                    'id': company['company_id'],
-                    'name': company['company_name'],
-                    'type': 'Company',
-                    'rating': company['rating'],
-                    'description': company['description'],
-                    'service_regions': company['service_regions'],
-                    'avg_cost': company['avg_hourly_rate'],
-                    'specialization': company['specialization_areas'],
-                    'data_source': 'Primary',
-                    'total_reviews': company['total_reviews'],
-                    'phone': company['phone'],
-                    'email': company['email'],
-                    'website': company['website']
-                })
+            results = [Provider.from_company_row(company) for company in self.db_manager.search_companies(service_type)]
         else:
             # Search only in secondary database
-            employees = self.db_manager.search_employees(service_type)
-            results = []
-            for employee in employees:
-                results.append({
-                    'id': employee['employee_id'],
-                    'name': employee['name'],
-                    'type': 'Individual Worker',
-                    'rating': employee['rating'],
-                    'description': employee.get('bio', ''),
-                    'service_regions': employee['preferred_regions'],
-                    'avg_cost': employee['avg_cost_per_hour'],
-                    'specialization': employee['specialization'],
-                    'data_source': 'Secondary',
-                    'experience_years': employee['experience_years'],
-                    'total_orders': employee['total_completed_orders'],
-                    'phone': employee['phone'],
-                    'email': employee['email'],
-                    'certification_level': employee['certification_level'],
-                    'emergency_service': employee['emergency_service']
-                })
+            results = [Provider.from_employee_row(employee) for employee in self.db_manager.search_employees(service_type)]
 
         # Apply basic sorting
         results.sort(key=lambda x: x.get('rating', 0), reverse=True)
@@ -295,10 +237,14 @@ class DistributedSortingService:
             # Add additional analysis and metadata
             enhanced_results = {
                 'federated_search': True,
+                'analysis': federated_results['analysis'],
                 'query_analysis': federated_results['analysis'],
                 'rewritten_prompt': federated_results['rewritten_prompt'],
                 'search_plan': federated_results['plan'],
                 'employees': federated_results['results'],
+                'sorted_results': federated_results['sorted_results'],
+                'combined_results': federated_results['combined_results'],
+                'search_results': federated_results['search_results'],
                 'integration_summary': federated_results['integration_summary'],
                 'research_highlights': federated_results['research_highlights'],
 
@@ -321,11 +267,13 @@ class DistributedSortingService:
         Analyze and show how the prompt rewriter improves user queries
         """
         try:
+            run = self.get_search_run(user_query)
+
             # Get basic analysis
-            analysis = self.llm_service.analyze_distributed_service_request(user_query, 'both')
+            analysis = run.analysis()
 
             # Get rewritten prompt
-            rewritten = self.prompt_rewriter.rewrite(user_query, analysis)
+            rewritten = run.rewritten()
 
             return {
                 'original_query': user_query,
@@ -350,9 +298,8 @@ class DistributedSortingService:
         Analyze how results from different databases are integrated
         """
         try:
-            # Get federated search results
-            federated_results = self.query_federation_engine.run_federated_search(user_query, 20)
-            integration_summary = federated_results['integration_summary']
+            # Reuse the integration summary of the shared run instead of searching again
+            integration_summary = self.get_search_run(user_query).integration_summary()
 
             # Analyze integration quality
             analysis = {
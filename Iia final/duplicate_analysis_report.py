@@ -4,33 +4,77 @@ Duplicate Detection and Analysis Report
 
 Analyzes both Primary (Companies) and Secondary (Employees) databases
 to find and report duplicate providers, their status, and cancellation info.
+Each scan is saved to the duplicate store (duplicate_store.py), so reports
+can be printed or exported again without rescanning:
+
+    python duplicate_analysis_report.py                # full scan, print, export CSV
+    python duplicate_analysis_report.py --stored       # print/export the last scan
+    python duplicate_analysis_report.py --incremental  # re-score changed providers only
+    python duplicate_analysis_report.py --workers 4    # full scan scored by 4 processes
+
+The incremental mode re-scores only providers added or modified since the
+last scan (updated_at high-water marks) against the provider snapshot kept in
+the store, and retires pairs of deleted or renamed providers. Keep a full
+scan on a schedule as well (e.g. nightly): it rebuilds the snapshot and its
+candidate index and picks up anything change tracking missed.
 """
 
+import argparse
+import sqlite3
 import sys
 import os
+import time
 from datetime import datetime
-from typing import Dict, List, Any, Tuple
+from typing import Dict, List, Any, Optional, Tuple
+
+from mysql.connector import Error
 
 sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
 
 from distributed_database_manager import DistributedDatabaseManager
-from string_similarity_matcher import StringSimplicityMatcher
+from string_similarity_matcher import CharacterCountIndex, StringSimplicityMatcher
+from duplicate_store import DuplicateStore
 
 
 class DuplicateAnalysisReport:
     """Generate comprehensive duplicate analysis and cancellation report"""
 
-    def __init__(self):
+    CROSS_DATABASE_THRESHOLD = 0.80
+    WITHIN_DATABASE_THRESHOLD = 0.90  # Higher threshold for within-database duplicates
+
+    # Latest change timestamp per source, read before a scan so nothing changed during it is missed
+    HIGH_WATER_QUERIES = {
+        'primary': "SELECT MAX(updated_at) AS high_water FROM COMPANIES",
+        'secondary': """
+            SELECT GREATEST(
+                COALESCE((SELECT MAX(updated_at) FROM EMPLOYEE), '1970-01-01'),
+                COALESCE((SELECT MAX(updated_at) FROM USER), '1970-01-01')
+            ) AS high_water
+            """,
+    }
+
+    def __init__(self, workers: int = 1):
+        # Processes for the full-scan pair search (0 = one per CPU); results match the serial scan
+        self.workers = workers
         self.db_manager = DistributedDatabaseManager()
         self.duplicates = []
         self.cancelled_duplicates = []
         self.active_duplicates = []
         self.total_providers = 0
+        self.unlisted_sources = set()  # sources whose listing failed in the last full scan (not saved)
+        self.store = DuplicateStore.open_default()
 
     def analyze_duplicates(self) -> Dict[str, Any]:
         """
         Analyze database for duplicates and generate comprehensive report
+        (and save it to the duplicate store)
         """
+        started_at = time.time()
+        self.duplicates = []
+        self.cancelled_duplicates = []
+        self.active_duplicates = []
+        self.unlisted_sources = set()
+
         print("\n" + "=" * 80)
         print("DUPLICATE DETECTION AND ANALYSIS REPORT")
         print("=" * 80)
@@ -39,6 +83,7 @@ class DuplicateAnalysisReport:
 
         # Get data from both databases
         print("\n📊 Scanning databases...")
+        high_water = self._high_water_marks()
 
         # Get all companies from primary database
         companies = self._get_all_companies()
@@ -51,12 +96,12 @@ class DuplicateAnalysisReport:
 
         # Find duplicates across databases
         print("\n🔍 Searching for duplicates across databases...")
-        self._find_cross_database_duplicates(companies, employees)
+        self.duplicates.extend(self._find_cross_database_duplicates(companies, employees))
 
         # Find duplicates within each database
         print("\n🔍 Searching for duplicates within each database...")
-        self._find_within_database_duplicates(companies, "Primary")
-        self._find_within_database_duplicates(employees, "Secondary")
+        self.duplicates.extend(self._find_within_database_duplicates(companies, "Primary"))
+        self.duplicates.extend(self._find_within_database_duplicates(employees, "Secondary"))
 
         # Separate cancelled and active duplicates
         print("\n📋 Analyzing duplicate status...")
@@ -64,11 +109,132 @@ class DuplicateAnalysisReport:
 
         # Generate report
         report = self._generate_report()
+        self._save_to_store(companies, employees, started_at, high_water)
 
         return report
 
-    def _get_all_companies(self) -> List[Dict[str, Any]]:
-        """Get all companies from primary database"""
+    def _save_to_store(self, companies: List[Any], employees: List[Any], started_at: float,
+                       high_water: Dict[str, Any]):
+        """Persist the scan (and the provider snapshot for incremental scans) so later reads don't rescan"""
+        if self.store is None:
+            return
+        # An incomplete listing would replace the saved scan with a partial one; keep the last good scan
+        if self.unlisted_sources:
+            print(f"   ⚠️ Could not list {' / '.join(sorted(self.unlisted_sources))} providers - "
+                  f"scan not saved, the stored results are kept")
+            return
+        try:
+            saved = self.store.replace_all(self.duplicates, len(companies), len(employees), started_at)
+            self.store.replace_providers(
+                {
+                    'primary': [self._snapshot_entry('primary', company) for company in companies],
+                    'secondary': [self._snapshot_entry('secondary', employee) for employee in employees],
+                },
+                high_water,
+            )
+            print(f"💾 Saved {saved} duplicate pairs to {self.store.path.name}")
+        except sqlite3.Error as e:
+            print(f"   ⚠️ Could not save duplicate results: {e}")
+
+    def load_stored_report(self) -> Optional[Dict[str, Any]]:
+        """Report of the last saved scan, None when nothing was saved yet"""
+        if self.store is None:
+            return None
+        try:
+            return self.store.load_report()
+        except sqlite3.Error as e:
+            print(f"   ⚠️ Could not read stored duplicate results: {e}")
+            return None
+
+    def stored_or_fresh_report(self) -> Dict[str, Any]:
+        """Last saved scan if there is one, otherwise a new scan"""
+        return self.load_stored_report() or self.analyze_duplicates()
+
+    def analyze_incremental(self) -> Dict[str, Any]:
+        """
+        Re-score only providers added or changed since the last scan and merge the
+        pairs into the duplicate store. Pairs of deleted providers, and pairs a
+        renamed provider no longer forms, are retired.
+
+        Falls back to a full scan when there is no stored snapshot or the databases
+        have no change tracking (updated_at columns).
+
+        Returns:
+            The stored report counters plus the counts of changed providers and pairs
+        """
+        started_at = time.time()
+        baseline = {source: self.store.high_water(source) for source in self.HIGH_WATER_QUERIES} if self.store else {}
+        if not baseline or None in baseline.values():
+            print("ℹ️ No stored duplicate snapshot yet - running a full scan")
+            return self.analyze_duplicates()
+        if not StringSimplicityMatcher.scorer.ratio_bounded:
+            print(f"ℹ️ Scorer '{StringSimplicityMatcher.scorer.name}' has no candidate bounds - running a full scan")
+            return self.analyze_duplicates()
+
+        high_water = self._high_water_marks()
+        if None in high_water.values():
+            print("⚠️ Change tracking unavailable (updated_at) - running a full scan")
+            return self.analyze_duplicates()
+
+        print(f"\n🔄 Incremental duplicate scan (changes since {baseline['primary']} / {baseline['secondary']})")
+        # Any failed query skips the pass: the marks stay put and nothing is retired from a partial listing
+        try:
+            changed = {
+                'primary': self._get_changed_companies(baseline['primary']),
+                'secondary': self._get_changed_employees(baseline['secondary']),
+            }
+            current = {
+                source: {row[0] for row in self.db_manager.iter_query(query, None, source, row_type='tuple')}
+                for source, query in (
+                    ('primary', "SELECT company_id FROM COMPANIES"),
+                    ('secondary', "SELECT e.employee_id FROM EMPLOYEE e JOIN USER u ON e.user_id = u.user_id"),
+                )
+            }
+        except Error as e:
+            print(f"   ⚠️ Could not read changes ({e}) - incremental scan skipped")
+            return self.store.summary()
+        removed = {}
+        for source, current_ids in current.items():
+            stored_ids = self.store.provider_ids(source)
+            if stored_ids and not current_ids:
+                # An empty listing is far more likely a failed query than every provider deleted
+                print(f"   ⚠️ Could not list {source} providers - incremental scan skipped")
+                return self.store.summary()
+            removed[source] = stored_ids - current_ids
+        print(f"   - Changed: {len(changed['primary'])} companies, {len(changed['secondary'])} employees")
+        print(f"   - Removed: {len(removed['primary'])} companies, {len(removed['secondary'])} employees")
+
+        duplicates = self._find_changed_duplicates(changed['primary'], changed['secondary'], removed)
+        for duplicate in duplicates:
+            duplicate["is_cancelled"] = self._is_cancelled(duplicate)
+
+        try:
+            result = self.store.apply_changes(
+                {source: [self._snapshot_entry(source, provider) for provider in providers]
+                 for source, providers in changed.items()},
+                removed, duplicates, high_water, started_at,
+            )
+        except sqlite3.Error as e:
+            print(f"   ⚠️ Could not merge incremental results: {e}")
+            return self.store.summary()
+        print(f"💾 Pairs: {result['pairs_added']} added, {result['pairs_updated']} updated, "
+              f"{result['pairs_retired']} retired")
+
+        report = self.store.summary()
+        report.update(result)
+        return report
+
+    def _high_water_marks(self) -> Dict[str, Optional[str]]:
+        """Latest updated_at per source (None when the query fails, e.g. no change tracking)"""
+        marks = {}
+        for source, query in self.HIGH_WATER_QUERIES.items():
+            rows = self.db_manager.execute_query(query, None, source)
+            value = rows[0].get('high_water') if rows else None
+            marks[source] = str(value) if value is not None else None
+        return marks
+
+    def _get_all_companies(self) -> List[Any]:
+        """Get all companies from primary database (streamed into compact dict-style records)"""
         try:
             query = """
             SELECT company_id, company_name, business_type, rating, 
@@ -76,14 +242,14 @@ class DuplicateAnalysisReport:
             FROM COMPANIES
             ORDER BY company_name ASC
             """
-            results = self.db_manager.execute_query(query, None, 'primary')
-            return results if results else []
+            return list(self.db_manager.iter_query(query, None, 'primary', row_type='record'))
         except Exception as e:
             print(f"   ⚠️ Error getting companies: {e}")
+            self.unlisted_sources.add('primary')
             return []
 
-    def _get_all_employees(self) -> List[Dict[str, Any]]:
-        """Get all employees from secondary database"""
+    def _get_all_employees(self) -> List[Any]:
+        """Get all employees from secondary database (streamed into compact dict-style records)"""
         try:
             query = """
             SELECT e.employee_id, u.name, e.job_type, e.rating, 
@@ -93,112 +259,218 @@ class DuplicateAnalysisReport:
             JOIN USER u ON e.user_id = u.user_id
             ORDER BY u.name ASC
             """
-            results = self.db_manager.execute_query(query, None, 'secondary')
-            return results if results else []
+            return list(self.db_manager.iter_query(query, None, 'secondary', row_type='record'))
         except Exception as e:
             print(f"   ⚠️ Error getting employees: {e}")
+            self.unlisted_sources.add('secondary')
             return []
 
-    def _find_cross_database_duplicates(
-        self, companies: List[Dict], employees: List[Dict]
-    ):
-        """Find duplicates between Primary and Secondary databases"""
-        threshold = 0.80
+    def _get_changed_companies(self, since: str) -> List[Any]:
+        query = """
+        SELECT company_id, company_name, business_type, rating,
+               total_reviews, phone, email
+        FROM COMPANIES
+        WHERE updated_at >= %s
+        """
+        return list(self.db_manager.iter_query(query, (since,), 'primary', row_type='record'))
+
+    def _get_changed_employees(self, since: str) -> List[Any]:
+        # A rename touches USER, an availability change EMPLOYEE
+        query = """
+        SELECT e.employee_id, u.name, e.job_type, e.rating,
+               e.total_completed_orders, u.phone, u.email,
+               e.availability_status
+        FROM EMPLOYEE e
+        JOIN USER u ON e.user_id = u.user_id
+        WHERE e.updated_at >= %s OR u.updated_at >= %s
+        """
+        return list(self.db_manager.iter_query(query, (since, since), 'secondary', row_type='record'))
+
+    @staticmethod
+    def _snapshot_entry(source: str, provider: Any) -> Dict[str, Any]:
+        """Company / employee row -> provider snapshot entry of the store"""
+        if source == 'primary':
+            return {'provider_id': provider.get("company_id"), 'name': provider.get("company_name", ""),
+                    'rating': provider.get("rating", 0), 'status': None}
+        return {'provider_id': provider.get("employee_id"), 'name': provider.get("name", ""),
+                'rating': provider.get("rating", 0), 'status': provider.get("availability_status", "Unknown")}
+
+    @staticmethod
+    def _snapshot_provider(source: str, entry: Dict[str, Any]) -> Dict[str, Any]:
+        """Provider snapshot entry -> row shaped like the company / employee queries"""
+        if source == 'primary':
+            return {"company_id": entry['provider_id'], "company_name": entry['name'], "rating": entry['rating']}
+        return {"employee_id": entry['provider_id'], "name": entry['name'], "rating": entry['rating'],
+                "availability_status": entry['status']}
+
+    def _find_changed_duplicates(self, companies: List[Any], employees: List[Any],
+                                 removed: Dict[str, set]) -> List[Dict[str, Any]]:
+        """Every pair that involves a changed provider"""
+        normalize = StringSimplicityMatcher.canonical_name
+        changed = {
+            'primary': (companies, "company_id", "company_name", "Primary"),
+            'secondary': (employees, "employee_id", "name", "Secondary"),
+        }
 
-        for comp_idx, company in enumerate(companies):
-            comp_name = company.get("company_name", "")
+        # One index per source: the unchanged snapshot entries (those of changed / removed
+        # providers are stale) plus the changed providers themselves
+        indexes = {}
+        for source, (providers, id_key, name_key, _) in changed.items():
+            stale = {provider.get(id_key) for provider in providers} | removed[source]
+            names, keys = [], []
+            for provider_id, canonical in self.store.snapshot_names(source):
+                if canonical and provider_id not in stale:
+                    names.append(canonical)
+                    keys.append((provider_id, None))
+            for provider in providers:
+                names.append(normalize(provider.get(name_key, "")))
+                keys.append((provider.get(id_key), provider))
+            indexes[source] = CharacterCountIndex(names, keys)
+
+        matches = []
+        for source, (providers, id_key, name_key, _) in changed.items():
+            other = 'secondary' if source == 'primary' else 'primary'
+            for provider in providers:
+                name = normalize(provider.get(name_key, ""))
+                if not name:
+                    continue
+                for target, threshold in ((other, self.CROSS_DATABASE_THRESHOLD),
+                                          (source, self.WITHIN_DATABASE_THRESHOLD)):
+                    found = [
+                        (key, canonical) for key, canonical in indexes[target].candidates(name, threshold)
+                        # Pairs of two changed providers are scored once: cross pairs from the
+                        # company side, within pairs from the higher id
+                        if key[1] is None or (target == other and source == 'primary')
+                        or (target == source and key[0] < provider.get(id_key))
+                    ]
+                    # Company names are always the first sequence of cross-database pairs, as in the full scan
+                    scores = StringSimplicityMatcher.score_many(
+                        name, [canonical for _, canonical in found], threshold,
+                        query_first=(source == 'primary' and target == 'secondary'),
+                    )
+                    matches.extend(
+                        (provider, source, target, key, similarity)
+                        for (key, _), similarity in zip(found, scores) if similarity >= threshold
+                    )
 
-            for emp_idx, employee in enumerate(employees):
-                emp_name = employee.get("name", "")
+        entries = {
+            target: self.store.snapshot_providers(
+                target, [key[0] for _, _, match_target, key, _ in matches if match_target == target and key[1] is None]
+            )
+            for target in changed
+        }
+        duplicates = []
+        for provider, source, target, (provider_id, changed_match), similarity in matches:
+            if changed_match is None:
+                entry = entries[target][provider_id]
+                match, match_name = self._snapshot_provider(target, entry), entry['name']
+            else:
+                match, match_name = changed_match, changed_match.get(changed[target][2], "")
+            if source != target:
+                company, employee = (provider, match) if source == 'primary' else (match, provider)
+                duplicates.append(self._cross_duplicate(company, employee, similarity))
+            else:
+                _, _, name_key, label = changed[source]
+                duplicates.append(self._within_duplicate(
+                    match, provider, match_name, provider.get(name_key, ""), label, similarity))
+        return duplicates
+
+    @staticmethod
+    def _cross_duplicate(company: Any, employee: Any, similarity: float) -> Dict[str, Any]:
+        return {
+            "type": "cross-database",
+            "primary": {
+                "id": company.get("company_id"),
+                "name": company.get("company_name", ""),
+                "source": "Primary (Company)",
+                "rating": company.get("rating", 0),
+            },
+            "secondary": {
+                "id": employee.get("employee_id"),
+                "name": employee.get("name", ""),
+                "source": "Secondary (Employee)",
+                "rating": employee.get("rating", 0),
+                "availability_status": employee.get("availability_status", "Unknown"),
+            },
+            "similarity": similarity,
+        }
 
-                similarity = StringSimplicityMatcher.calculate_similarity(
-                    comp_name, emp_name
-                )
+    @staticmethod
+    def _within_duplicate(provider1: Any, provider2: Any, name1: str, name2: str,
+                          source: str, similarity: float) -> Dict[str, Any]:
+        return {
+            "type": f"within-{source.lower()}",
+            "provider1": {
+                "id": provider1.get("company_id") or provider1.get("employee_id"),
+                "name": name1,
+                "source": source,
+                "rating": provider1.get("rating", 0),
+                "availability_status": provider1.get("availability_status", "Unknown"),
+            },
+            "provider2": {
+                "id": provider2.get("company_id") or provider2.get("employee_id"),
+                "name": name2,
+                "source": source,
+                "rating": provider2.get("rating", 0),
+                "availability_status": provider2.get("availability_status", "Unknown"),
+            },
+            "similarity": similarity,
+        }
 
-                if similarity >= threshold:
-                    self.duplicates.append(
-                        {
-                            "type": "cross-database",
-                            "primary": {
-                                "id": company.get("company_id"),
-                                "name": comp_name,
-                                "source": "Primary (Company)",
-                                "rating": company.get("rating", 0),
-                            },
-                            "secondary": {
-                                "id": employee.get("employee_id"),
-                                "name": emp_name,
-                                "source": "Secondary (Employee)",
-                                "rating": employee.get("rating", 0),
-                                "availability_status": employee.get("availability_status", "Unknown"),
-                            },
-                            "similarity": similarity,
-                        }
-                    )
+    def _find_cross_database_duplicates(
+        self, companies: List[Dict], employees: List[Dict]
+    ) -> List[Dict[str, Any]]:
+        """Find duplicates between Primary and Secondary databases"""
+        pairs = StringSimplicityMatcher.find_similar_pairs(
+            [company.get("company_name", "") for company in companies],
+            [employee.get("name", "") for employee in employees],
+            similarity_threshold=self.CROSS_DATABASE_THRESHOLD,
+            workers=self.workers,
+        )
+
+        return [
+            self._cross_duplicate(companies[comp_idx], employees[emp_idx], similarity)
+            for comp_idx, emp_idx, similarity in pairs
+        ]
 
     def _find_within_database_duplicates(
         self, providers: List[Dict], source: str
-    ):
+    ) -> List[Dict[str, Any]]:
         """Find duplicates within the same database"""
-        threshold = 0.90  # Higher threshold for within-database duplicates
-
-        for i in range(len(providers)):
-            for j in range(i + 1, len(providers)):
-                name_i = providers[i].get("company_name") or providers[i].get("name", "")
-                name_j = providers[j].get("company_name") or providers[j].get("name", "")
-
-                similarity = StringSimplicityMatcher.calculate_similarity(name_i, name_j)
-
-                if similarity >= threshold:
-                    self.duplicates.append(
-                        {
-                            "type": f"within-{source.lower()}",
-                            "provider1": {
-                                "id": providers[i].get("company_id") or providers[i].get("employee_id"),
-                                "name": name_i,
-                                "source": source,
-                                "rating": providers[i].get("rating", 0),
-                                "availability_status": providers[i].get("availability_status", "Unknown"),
-                            },
-                            "provider2": {
-                                "id": providers[j].get("company_id") or providers[j].get("employee_id"),
-                                "name": name_j,
-                                "source": source,
-                                "rating": providers[j].get("rating", 0),
-                                "availability_status": providers[j].get("availability_status", "Unknown"),
-                            },
-                            "similarity": similarity,
-                        }
-                    )
+        names = [p.get("company_name") or p.get("name", "") for p in providers]
+        pairs = StringSimplicityMatcher.find_similar_pairs(
+            names, similarity_threshold=self.WITHIN_DATABASE_THRESHOLD, workers=self.workers
+        )
 
-    def _categorize_duplicates(self):
-        """Separate duplicates into cancelled and active"""
-        # For this analysis, we'll treat unavailable employees as "cancelled" status
-        
-        for duplicate in self.duplicates:
-            is_cancelled = False
+        return [
+            self._within_duplicate(providers[i], providers[j], names[i], names[j], source, similarity)
+            for i, j, similarity in pairs
+        ]
 
-            # Check cancellation status
-            if duplicate["type"] == "cross-database":
-                secondary_available = duplicate["secondary"].get("availability_status", "").lower() == "available"
-                
-                # Consider it "cancelled" if employee is unavailable
-                if not secondary_available:
-                    is_cancelled = True
+    @staticmethod
+    def _is_cancelled(duplicate: Dict[str, Any]) -> bool:
+        """For this analysis, we'll treat unavailable employees as "cancelled" status"""
+        # Check cancellation status
+        if duplicate["type"] == "cross-database":
+            # Consider it "cancelled" if employee is unavailable
+            return (duplicate["secondary"].get("availability_status") or "").lower() != "available"
 
-            else:
-                # For within-database duplicates, check employee availability
-                prov1_available = True
-                prov2_available = True
-                
-                if "availability_status" in duplicate["provider1"]:
-                    prov1_available = duplicate["provider1"].get("availability_status", "").lower() == "available"
-                if "availability_status" in duplicate["provider2"]:
-                    prov2_available = duplicate["provider2"].get("availability_status", "").lower() == "available"
-
-                if not prov1_available or not prov2_available:
-                    is_cancelled = True
+        # For within-database duplicates, check employee availability
+        prov1_available = True
+        prov2_available = True
+
+        if "availability_status" in duplicate["provider1"]:
+            prov1_available = (duplicate["provider1"].get("availability_status") or "").lower() == "available"
+        if "availability_status" in duplicate["provider2"]:
+            prov2_available = (duplicate["provider2"].get("availability_status") or "").lower() == "available"
 
+        return not prov1_available or not prov2_available
+
+    def _categorize_duplicates(self):
+        """Separate duplicates into cancelled and active"""
+        for duplicate in self.duplicates:
+            is_cancelled = self._is_cancelled(duplicate)
+            duplicate["is_cancelled"] = is_cancelled
             if is_cancelled:
                 self.cancelled_duplicates.append(duplicate)
             else:
@@ -337,11 +609,7 @@ class DuplicateAnalysisReport:
 
                 # Data rows
                 for dup in report["duplicates"]:
-                    is_cancelled = (
-                        "Yes"
-                        if dup in report["cancelled_details"]
-                        else "No"
-                    )
+                    is_cancelled = "Yes" if dup.get("is_cancelled") else "No"
 
                     if dup["type"] == "cross-database":
                         writer.writerow(
@@ -350,11 +618,11 @@ class DuplicateAnalysisReport:
                                 dup["primary"]["id"],
                                 dup["primary"]["name"],
                                 dup["primary"]["source"],
-                                dup["primary"]["status"],
+                                dup["primary"].get("availability_status", "Unknown"),
                                 dup["secondary"]["id"],
                                 dup["secondary"]["name"],
                                 dup["secondary"]["source"],
-                                dup["secondary"]["status"],
+                                dup["secondary"].get("availability_status", "Unknown"),
                                 f"{dup['similarity']:.1%}",
                                 is_cancelled,
                             ]
@@ -366,11 +634,11 @@ class DuplicateAnalysisReport:
                                 dup["provider1"]["id"],
                                 dup["provider1"]["name"],
                                 dup["provider1"]["source"],
-                                dup["provider1"]["status"],
+                                dup["provider1"].get("availability_status", "Unknown"),
                                 dup["provider2"]["id"],
                                 dup["provider2"]["name"],
                                 dup["provider2"]["source"],
-                                dup["provider2"]["status"],
+                                dup["provider2"].get("availability_status", "Unknown"),
                                 f"{dup['similarity']:.1%}",
                                 is_cancelled,
                             ]
@@ -385,12 +653,35 @@ class DuplicateAnalysisReport:
 
 def main():
     """Main entry point"""
-    print("\n🔍 Starting Duplicate Analysis...\n")
-
-    analyzer = DuplicateAnalysisReport()
+    parser = argparse.ArgumentParser(description="Duplicate detection and analysis report")
+    mode = parser.add_mutually_exclusive_group()
+    mode.add_argument("--stored", action="store_true",
+                      help="report the last saved scan instead of rescanning the databases")
+    mode.add_argument("--incremental", action="store_true",
+                      help="re-score only providers changed since the last scan (run a full scan nightly)")
+    parser.add_argument("--workers", type=int, default=1, metavar="N",
+                        help="processes for the full-scan pair search (0 = one per CPU, default 1)")
+    args = parser.parse_args()
+
+    analyzer = DuplicateAnalysisReport(workers=args.workers)
 
     try:
-        report = analyzer.analyze_duplicates()
+        if args.stored:
+            report = analyzer.load_stored_report()
+            if report is None:
+                print("❌ No stored duplicate scan yet. Run without --stored first.")
+                return None
+            print(f"\n📂 Using stored duplicate scan from {report['timestamp']}\n")
+        elif args.incremental:
+            summary = analyzer.analyze_incremental()
+            if summary:
+                print(f"\n📈 {summary['total_duplicates_found']} duplicates stored "
+                      f"({summary['active_duplicates']} active, {summary['cancelled_duplicates']} cancelled)")
+                print("💡 Run with --stored to print and export the full report.")
+            return summary
+        else:
+            print("\n🔍 Starting Duplicate Analysis...\n")
+            report = analyzer.analyze_duplicates()
 
         # Print to console
         analyzer.print_report(report)
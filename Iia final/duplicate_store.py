@@ -0,0 +1,472 @@
+"""
+Persistent store for duplicate-analysis results.
+
+DuplicateAnalysisReport scans both databases, which takes seconds to minutes.
+Its pairs are kept here in a local SQLite file so the admin widgets, the CSV
+export and "duplicates of provider X" lookups read precomputed results
+instead of rescanning. Each pair row carries both providers (source +
+id + name/rating/status at scan time), the similarity, the cancelled flag
+and first/last-seen timestamps; both provider sides are indexed.
+
+Rows come back in the same dict shape the report uses
+({"type": "cross-database", "primary": {...}, "secondary": {...}, ...}).
+
+For incremental scans the store also keeps a snapshot of every provider
+(id, name, canonical name, rating, status) as of the last scan, plus the
+change high-water mark per source, so changed providers can be scored
+against the unchanged ones without reading the databases in full.
+"""
+
+import sqlite3
+import threading
+import time
+from datetime import datetime
+from decimal import Decimal
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from config import DUPLICATE_STORE_CONFIG
+from string_similarity_matcher import StringSimplicityMatcher
+
+PRIMARY = 'primary'
+SECONDARY = 'secondary'
+
+# Report type -> (source of side 1, source of side 2, dict key of side 1, dict key of side 2)
+PAIR_LAYOUT = {
+    'cross-database': (PRIMARY, SECONDARY, 'primary', 'secondary'),
+    'within-primary': (PRIMARY, PRIMARY, 'provider1', 'provider2'),
+    'within-secondary': (SECONDARY, SECONDARY, 'provider1', 'provider2'),
+}
+
+# Display labels the report puts in each side's "source"
+SOURCE_LABELS = {
+    ('cross-database', PRIMARY): 'Primary (Company)',
+    ('cross-database', SECONDARY): 'Secondary (Employee)',
+    ('within-primary', PRIMARY): 'Primary',
+    ('within-secondary', SECONDARY): 'Secondary',
+}
+
+# SQLite's default limit on bound parameters is 999
+_CHUNK = 500
+
+_PAIR_COLUMNS = (
+    "pair_type, source1, provider1_id, name1, rating1, status1, "
+    "source2, provider2_id, name2, rating2, status2, similarity, is_cancelled, first_seen, last_seen"
+)
+
+
+def _chunks(values: List[Any]):
+    for start in range(0, len(values), _CHUNK):
+        yield values[start:start + _CHUNK]
+
+
+def _number(value) -> Optional[float]:
+    # MySQL DECIMAL ratings cannot be bound by sqlite3
+    if value is None:
+        return None
+    try:
+        return float(value) if isinstance(value, Decimal) else value
+    except (TypeError, ValueError):
+        return None
+
+
+class DuplicateStore:
+    """SQLite-backed, indexed store of duplicate pairs and scan runs"""
+
+    def __init__(self, path: str):
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(str(self.path), check_same_thread=False)
+        self._db.row_factory = sqlite3.Row
+        self._create_schema()
+
+    @classmethod
+    def open_default(cls) -> Optional["DuplicateStore"]:
+        """Store at DUPLICATE_STORE_CONFIG['db_file'] (next to the app); None when disabled or unavailable"""
+        db_file = DUPLICATE_STORE_CONFIG.get('db_file')
+        if not db_file:
+            return None
+        path = Path(db_file)
+        if not path.is_absolute():
+            path = Path(__file__).with_name(db_file)
+        try:
+            return cls(str(path))
+        except sqlite3.Error as e:
+            print(f"⚠️ Duplicate store disabled ({path}): {e}")
+            return None
+
+    def _create_schema(self):
+        with self._lock:
+            self._db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS duplicate_pairs (
+                    pair_id INTEGER PRIMARY KEY,
+                    pair_type TEXT NOT NULL,
+                    source1 TEXT NOT NULL,
+                    provider1_id INTEGER NOT NULL,
+                    name1 TEXT,
+                    rating1 REAL,
+                    status1 TEXT,
+                    source2 TEXT NOT NULL,
+                    provider2_id INTEGER NOT NULL,
+                    name2 TEXT,
+                    rating2 REAL,
+                    status2 TEXT,
+                    similarity REAL NOT NULL,
+                    is_cancelled INTEGER NOT NULL DEFAULT 0,
+                    first_seen REAL NOT NULL,
+                    last_seen REAL NOT NULL,
+                    UNIQUE (pair_type, source1, provider1_id, source2, provider2_id)
+                );
+                CREATE INDEX IF NOT EXISTS idx_duplicate_pairs_provider1 ON duplicate_pairs (source1, provider1_id);
+                CREATE INDEX IF NOT EXISTS idx_duplicate_pairs_provider2 ON duplicate_pairs (source2, provider2_id);
+                CREATE INDEX IF NOT EXISTS idx_duplicate_pairs_status ON duplicate_pairs (is_cancelled, similarity);
+
+                CREATE TABLE IF NOT EXISTS duplicate_runs (
+                    run_id INTEGER PRIMARY KEY,
+                    mode TEXT NOT NULL,
+                    started_at REAL NOT NULL,
+                    finished_at REAL NOT NULL,
+                    companies INTEGER NOT NULL,
+                    employees INTEGER NOT NULL,
+                    pairs INTEGER NOT NULL
+                );
+
+                CREATE TABLE IF NOT EXISTS duplicate_providers (
+                    source TEXT NOT NULL,
+                    provider_id INTEGER NOT NULL,
+                    name TEXT,
+                    canonical TEXT NOT NULL,
+                    rating REAL,
+                    status TEXT,
+                    PRIMARY KEY (source, provider_id)
+                );
+                CREATE TABLE IF NOT EXISTS duplicate_sync_state (
+                    key TEXT PRIMARY KEY,
+                    value TEXT
+                );
+                """
+            )
+            self._db.commit()
+
+    # ------------------------------------------------------------------
+    # WRITES
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _pair_row(duplicate: Dict[str, Any], seen_at: float) -> Tuple:
+        source1, source2, key1, key2 = PAIR_LAYOUT[duplicate['type']]
+        side1, side2 = duplicate[key1], duplicate[key2]
+        if source1 == source2 and side1.get('id') > side2.get('id'):
+            # Within-database pairs are keyed lowest id first, whichever scan found them
+            side1, side2 = side2, side1
+        return (
+            duplicate['type'],
+            source1, side1.get('id'), side1.get('name'), _number(side1.get('rating')), side1.get('availability_status'),
+            source2, side2.get('id'), side2.get('name'), _number(side2.get('rating')), side2.get('availability_status'),
+            float(duplicate['similarity']), 1 if duplicate.get('is_cancelled') else 0, seen_at, seen_at,
+        )
+
+    def replace_all(self, duplicates: Iterable[Dict[str, Any]], companies: int, employees: int,
+                    started_at: float = None) -> int:
+        """Full rebuild: replace every stored pair with the result of one scan"""
+        now = time.time()
+        rows = [self._pair_row(duplicate, now) for duplicate in duplicates]
+        with self._lock:
+            try:
+                # Pairs seen before keep their first_seen
+                first_seen = {
+                    (row['pair_type'], row['source1'], row['provider1_id'], row['source2'], row['provider2_id']):
+                        row['first_seen']
+                    for row in self._db.execute(
+                        "SELECT pair_type, source1, provider1_id, source2, provider2_id, first_seen FROM duplicate_pairs"
+                    )
+                }
+                rows = [row[:13] + (first_seen.get(self._pair_key(row), now), now) for row in rows]
+                self._db.execute("DELETE FROM duplicate_pairs")
+                self._db.executemany(
+                    f"INSERT OR REPLACE INTO duplicate_pairs ({_PAIR_COLUMNS}) "
+                    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                    rows,
+                )
+                self._record_run('full', started_at or now, now, companies, employees, len(rows))
+                self._db.commit()
+            except sqlite3.Error:
+                self._db.rollback()
+                raise
+        return len(rows)
+
+    def _record_run(self, mode: str, started_at: float, finished_at: float,
+                    companies: int, employees: int, pairs: int):
+        self._db.execute(
+            "INSERT INTO duplicate_runs (mode, started_at, finished_at, companies, employees, pairs) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            (mode, started_at, finished_at, companies, employees, pairs),
+        )
+
+    # ------------------------------------------------------------------
+    # PROVIDER SNAPSHOT (incremental scans)
+    # ------------------------------------------------------------------
+
+    def _state(self, key: str) -> Optional[str]:
+        row = self._db.execute("SELECT value FROM duplicate_sync_state WHERE key = ?", (key,)).fetchone()
+        return row['value'] if row else None
+
+    def _set_state(self, key: str, value: Any):
+        self._db.execute(
+            "INSERT OR REPLACE INTO duplicate_sync_state (key, value) VALUES (?, ?)",
+            (key, None if value is None else str(value)),
+        )
+
+    def _insert_providers(self, source: str, providers: Iterable[Dict[str, Any]]):
+        self._db.executemany(
+            "INSERT OR REPLACE INTO duplicate_providers (source, provider_id, name, canonical, rating, status) "
+            "VALUES (?, ?, ?, ?, ?, ?)",
+            [
+                (source, provider['provider_id'], provider.get('name'),
+                 StringSimplicityMatcher.canonical_name(provider.get('name')),
+                 _number(provider.get('rating')), provider.get('status'))
+                for provider in providers
+            ],
+        )
+
+    def _delete_providers(self, source: str, provider_ids: List[int]):
+        for chunk in _chunks(provider_ids):
+            self._db.execute(
+                f"DELETE FROM duplicate_providers WHERE source = ? AND provider_id IN ({', '.join('?' * len(chunk))})",
+                (source, *chunk),
+            )
+
+    def replace_providers(self, providers: Dict[str, List[Dict[str, Any]]], high_water: Dict[str, Any]):
+        """
+        Full rebuild of the provider snapshot
+
+        Args:
+            providers: source -> [{'provider_id', 'name', 'rating', 'status'}]
+            high_water: source -> change timestamp the snapshot is complete up to
+        """
+        with self._lock:
+            try:
+                self._db.execute("DELETE FROM duplicate_providers")
+                for source, rows in providers.items():
+                    self._insert_providers(source, rows)
+                for source, value in high_water.items():
+                    self._set_state(f'high_water:{source}', value)
+                self._db.commit()
+            except sqlite3.Error:
+                self._db.rollback()
+                raise
+
+    def high_water(self, source: str) -> Optional[str]:
+        """Change timestamp the stored snapshot of `source` is complete up to"""
+        with self._lock:
+            return self._state(f'high_water:{source}')
+
+    def provider_ids(self, source: str) -> Set[int]:
+        with self._lock:
+            return {
+                row[0] for row in
+                self._db.execute("SELECT provider_id FROM duplicate_providers WHERE source = ?", (source,))
+            }
+
+    def snapshot_names(self, source: str) -> List[Tuple[int, str]]:
+        """(provider_id, canonical name) of every provider of `source` in the snapshot"""
+        with self._lock:
+            return self._db.execute(
+                "SELECT provider_id, canonical FROM duplicate_providers WHERE source = ?", (source,)
+            ).fetchall()
+
+    def snapshot_providers(self, source: str, provider_ids: Iterable[int]) -> Dict[int, Dict[str, Any]]:
+        """provider_id -> snapshot entry ({'provider_id', 'name', 'canonical', 'rating', 'status'})"""
+        found = {}
+        with self._lock:
+            for chunk in _chunks(sorted(set(provider_ids))):
+                for row in self._db.execute(
+                    f"SELECT provider_id, name, canonical, rating, status FROM duplicate_providers "
+                    f"WHERE source = ? AND provider_id IN ({', '.join('?' * len(chunk))})",
+                    (source, *chunk),
+                ):
+                    found[row['provider_id']] = dict(row)
+        return found
+
+    def apply_changes(self, changed: Dict[str, List[Dict[str, Any]]], removed: Dict[str, Iterable[int]],
+                      duplicates: List[Dict[str, Any]], high_water: Dict[str, Any],
+                      started_at: float = None) -> Dict[str, int]:
+        """
+        Merge an incremental scan in one transaction: refresh the snapshot of changed
+        providers, drop removed ones, replace every pair that involves either, and
+        advance the high-water marks
+
+        Returns:
+            Counts of changed / removed providers and added / updated / retired pairs
+        """
+        now = time.time()
+        pair_rows = {self._pair_key(row): row for row in (self._pair_row(duplicate, now) for duplicate in duplicates)}
+        affected = {
+            source: sorted({provider['provider_id'] for provider in changed.get(source, [])} | set(removed.get(source, ())))
+            for source in (PRIMARY, SECONDARY)
+        }
+        with self._lock:
+            try:
+                existing = set()
+                for source, provider_ids in affected.items():
+                    for chunk in _chunks(provider_ids):
+                        placeholders = ", ".join("?" * len(chunk))
+                        for side in ('1', '2'):
+                            existing.update(
+                                tuple(row) for row in self._db.execute(
+                                    f"SELECT pair_type, source1, provider1_id, source2, provider2_id "
+                                    f"FROM duplicate_pairs WHERE source{side} = ? AND provider{side}_id IN ({placeholders})",
+                                    (source, *chunk),
+                                )
+                            )
+
+                retired = existing - pair_rows.keys()
+                self._db.executemany(
+                    "DELETE FROM duplicate_pairs "
+                    "WHERE pair_type = ? AND source1 = ? AND provider1_id = ? AND source2 = ? AND provider2_id = ?",
+                    list(retired),
+                )
+                # Pairs found again keep their first_seen
+                self._db.executemany(
+                    f"INSERT INTO duplicate_pairs ({_PAIR_COLUMNS}) "
+                    f"VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?) "
+                    f"ON CONFLICT (pair_type, source1, provider1_id, source2, provider2_id) DO UPDATE SET "
+                    f"name1 = excluded.name1, rating1 = excluded.rating1, status1 = excluded.status1, "
+                    f"name2 = excluded.name2, rating2 = excluded.rating2, status2 = excluded.status2, "
+                    f"similarity = excluded.similarity, is_cancelled = excluded.is_cancelled, "
+                    f"last_seen = excluded.last_seen",
+                    list(pair_rows.values()),
+                )
+
+                for source, provider_ids in affected.items():
+                    self._delete_providers(source, provider_ids)
+                    self._insert_providers(source, changed.get(source, []))
+                for source, value in high_water.items():
+                    self._set_state(f'high_water:{source}', value)
+
+                counts = dict(self._db.execute(
+                    "SELECT source, COUNT(*) FROM duplicate_providers GROUP BY source"
+                ).fetchall())
+                total_pairs = self._db.execute("SELECT COUNT(*) FROM duplicate_pairs").fetchone()[0]
+                self._record_run('incremental', started_at or now, now,
+                                 counts.get(PRIMARY, 0), counts.get(SECONDARY, 0), total_pairs)
+                self._db.commit()
+            except sqlite3.Error:
+                self._db.rollback()
+                raise
+        return {
+            "changed_providers": sum(len(rows) for rows in changed.values()),
+            "removed_providers": sum(len(set(ids)) for ids in removed.values()),
+            "pairs_added": len(pair_rows.keys() - existing),
+            "pairs_updated": len(pair_rows.keys() & existing),
+            "pairs_retired": len(retired),
+        }
+
+    @staticmethod
+    def _pair_key(row: Tuple) -> Tuple:
+        return row[0], row[1], row[2], row[6], row[7]
+
+    # ------------------------------------------------------------------
+    # READS
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def _to_duplicate(row: sqlite3.Row) -> Dict[str, Any]:
+        """Stored row -> the report's duplicate dict"""
+        pair_type = row['pair_type']
+        _, _, key1, key2 = PAIR_LAYOUT[pair_type]
+        duplicate = {'type': pair_type}
+        for key, suffix in ((key1, '1'), (key2, '2')):
+            side = {
+                'id': row[f'provider{suffix}_id'],
+                'name': row[f'name{suffix}'],
+                'source': SOURCE_LABELS[(pair_type, row[f'source{suffix}'])],
+                'rating': row[f'rating{suffix}'] if row[f'rating{suffix}'] is not None else 0,
+            }
+            if row[f'status{suffix}'] is not None:
+                side['availability_status'] = row[f'status{suffix}']
+            duplicate[key] = side
+        duplicate['similarity'] = row['similarity']
+        duplicate['is_cancelled'] = bool(row['is_cancelled'])
+        duplicate['first_seen'] = row['first_seen']
+        duplicate['last_seen'] = row['last_seen']
+        return duplicate
+
+    def pairs(self, status: str = None, pair_type: str = None, limit: int = None) -> List[Dict[str, Any]]:
+        """Stored pairs, most similar first; status is 'active', 'cancelled' or None for both"""
+        query = f"SELECT {_PAIR_COLUMNS} FROM duplicate_pairs"
+        conditions, params = [], []
+        if status is not None:
+            conditions.append("is_cancelled = ?")
+            params.append(1 if status == 'cancelled' else 0)
+        if pair_type is not None:
+            conditions.append("pair_type = ?")
+            params.append(pair_type)
+        if conditions:
+            query += " WHERE " + " AND ".join(conditions)
+        query += " ORDER BY similarity DESC, pair_id"
+        if limit is not None:
+            query += " LIMIT ?"
+            params.append(int(limit))
+        with self._lock:
+            return [self._to_duplicate(row) for row in self._db.execute(query, params)]
+
+    def duplicates_of(self, source: str, provider_id: int) -> List[Dict[str, Any]]:
+        """Every stored pair involving one provider ('primary' company or 'secondary' employee)"""
+        # Two indexed lookups (one per side) instead of an OR that would scan the table
+        query = f"""
+            SELECT {_PAIR_COLUMNS} FROM duplicate_pairs WHERE source1 = ? AND provider1_id = ?
+            UNION ALL
+            SELECT {_PAIR_COLUMNS} FROM duplicate_pairs WHERE source2 = ? AND provider2_id = ?
+            ORDER BY similarity DESC
+        """
+        params = (source, provider_id, source, provider_id)
+        with self._lock:
+            return [self._to_duplicate(row) for row in self._db.execute(query, params)]
+
+    def last_run(self) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._db.execute("SELECT * FROM duplicate_runs ORDER BY run_id DESC LIMIT 1").fetchone()
+        return dict(row) if row else None
+
+    def summary(self) -> Optional[Dict[str, Any]]:
+        """Report counters computed from the store; None before the first scan"""
+        run = self.last_run()
+        if run is None:
+            return None
+        with self._lock:
+            counts = self._db.execute(
+                """
+                SELECT COUNT(*) AS total,
+                       COALESCE(SUM(is_cancelled), 0) AS cancelled,
+                       COALESCE(SUM(pair_type = 'cross-database'), 0) AS cross_database
+                FROM duplicate_pairs
+                """
+            ).fetchone()
+        return {
+            "timestamp": datetime.fromtimestamp(run['finished_at']).isoformat(),
+            "total_providers": run['companies'] + run['employees'],
+            "total_duplicates_found": counts['total'],
+            "cancelled_duplicates": counts['cancelled'],
+            "active_duplicates": counts['total'] - counts['cancelled'],
+            "cross_database_duplicates": counts['cross_database'],
+            "within_database_duplicates": counts['total'] - counts['cross_database'],
+        }
+
+    def load_report(self) -> Optional[Dict[str, Any]]:
+        """The full report (counters plus pair lists) as analyze_duplicates returns it"""
+        report = self.summary()
+        if report is None:
+            return None
+        duplicates = self.pairs()
+        report["duplicates"] = duplicates
+        report["cancelled_details"] = [d for d in duplicates if d['is_cancelled']]
+        report["active_details"] = [d for d in duplicates if not d['is_cancelled']]
+        return report
+
+    def close(self):
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
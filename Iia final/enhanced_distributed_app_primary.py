@@ -6,6 +6,8 @@ import tkinter as tk
 from tkinter import ttk, messagebox, simpledialog
 import sys
 import os
+import threading
+from concurrent.futures import Future
 sys.path.append(os.path.dirname(os.path.abspath(__file__)))
 
 # Import database managers
@@ -13,8 +15,62 @@ from distributed_database_manager import DistributedDatabaseManager
 from enhanced_database_manager import EnhancedDatabaseManager
 from distributed_llm_service import DistributedLLMService
 from distributed_sorting_service import DistributedSortingService
+from tree_paging import LazyTreePager
+from virtual_tree import VirtualTreeview
+
+
+def _provider_service_name(provider):
+    return provider.get("service_name", provider.get("business_type", provider.get("job_type", "General")))
+
+
+def _provider_rating(provider):
+    """Rating as a float, or None when the provider has no rating"""
+    rating = provider.get("rating") or 0
+    return float(rating) if rating else None
+
+
+def _provider_cost(provider):
+    """Hourly cost as a float, or None when there is no price"""
+    cost = provider.get("avg_cost", provider.get("avg_hourly_rate", provider.get("avg_cost_per_hour", 0)))
+    return float(cost) if cost else None
+
+
+def _availability_rank(provider):
+    # Available first, then providers without a status (companies), then busy/offline workers
+    status = (provider.get("availability_status") or "").strip().lower()
+    if status == "available":
+        return 0
+    return 1 if not status else 2
+
+
+# Typed sort keys computed once per results row (see tree_model.row_sort_keys)
+RESULT_SORT_FIELDS = {
+    "rating": _provider_rating,
+    "price": _provider_cost,
+    "name": lambda provider: (provider.get("name") or "").casefold() or None,
+    "type": lambda provider: {"Company": 0, "Individual Worker": 1}.get(provider.get("type")),
+    "availability": _availability_rank,
+    "score": lambda provider: provider.get("comprehensive_score"),
+}
+
 
 class EnhancedServiceBookingApp:
+    # How often (ms) the Tk loop checks on a background search
+    SEARCH_POLL_MS = 100
+
+    # Sort option -> (field, descending) keys, most significant first
+    RESULT_SORT_OPTIONS = {
+        "rating_desc": [("rating", True), ("score", True)],
+        "rating_asc": [("rating", False), ("name", False)],
+        "price_asc": [("price", False), ("rating", True)],
+        "price_desc": [("price", True), ("rating", True)],
+        "available": [("availability", False), ("rating", True)],
+        "name_asc": [("name", False)],
+        "name_desc": [("name", True)],
+        "companies_first": [("type", False), ("rating", True)],
+        "workers_first": [("type", True), ("rating", True)],
+    }
+
     def __init__(self, root):
         self.root = root
         self.root.title("Service Booking System")
@@ -33,6 +89,12 @@ class EnhancedServiceBookingApp:
         # Search preferences
         self.search_mode = tk.StringVar(value="advanced")
 
+        # Searches run on worker threads so DB/LLM latency never blocks the Tk loop.
+        # Each search gets a generation number; only the latest one may render.
+        self._search_generation = 0
+        self._search_cancel_event = None
+        self.root.protocol("WM_DELETE_WINDOW", self.on_closing)
+
         # Create GUI
         self.create_main_gui()
 
@@ -190,6 +252,11 @@ class EnhancedServiceBookingApp:
 
         ttk.Button(button_frame, text="🔍 Search", command=self.ai_search).pack(side=tk.LEFT, padx=2)
         ttk.Button(button_frame, text="⚙️ Analysis", command=self.show_search_analysis).pack(side=tk.LEFT, padx=2)
+        ttk.Button(button_frame, text="✖ Cancel", command=self.cancel_search).pack(side=tk.LEFT, padx=2)
+
+        # Spins while a search is running in the background
+        self.search_progress = ttk.Progressbar(search_frame, mode='indeterminate', length=200)
+        self.search_progress.grid(row=4, column=0, columnspan=3, sticky=tk.EW, padx=10)
 
         # Example queries
         examples_text = "Examples: 'I need a plumber' | 'Emergency electrical help' | 'Paint my living room' | 'Car won't start'"
@@ -233,9 +300,15 @@ class EnhancedServiceBookingApp:
         self.results_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
 
         # Scrollbar
-        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL, command=self.results_tree.yview)
+        scrollbar = ttk.Scrollbar(results_frame, orient=tk.VERTICAL)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        self.results_tree.configure(yscrollcommand=scrollbar.set)
+
+        # Provider objects behind the rows; sorting and order creation read these, not the display strings.
+        # Only the rows in view are materialized, so large result sets scroll and sort at a constant cost.
+        self.results_model = VirtualTreeview(
+            self.results_tree, lambda provider: self._format_result_row(provider, "medium"),
+            scrollbar=scrollbar, sort_fields=RESULT_SORT_FIELDS
+        )
 
         # Action buttons
         action_frame = ttk.Frame(dashboard_frame)
@@ -256,123 +329,195 @@ class EnhancedServiceBookingApp:
             self.status_var.set(f"🚀 Advanced AI Search: {search_term}...")
         else:
             self.status_var.set(f"🤖 AI Analyzing: {search_term}...")
-        self.root.update()
+
+        # A newer query supersedes whatever is still running
+        self._cancel_active_search()
+        self._search_generation += 1
+        generation = self._search_generation
+        cancel_event = threading.Event()
+        self._search_cancel_event = cancel_event
+
+        future = self._start_search_thread(generation, search_term, search_mode, cancel_event)
+        self._set_search_busy(True)
+        self.root.after(self.SEARCH_POLL_MS, self._poll_search, generation, future)
+
+    def _start_search_thread(self, generation, search_term, search_mode, cancel_event) -> Future:
+        """Run one search on its own daemon thread.
+
+        Cancellation is only checked between stages, so a superseded search can stay stuck in a
+        DB or LLM call; with a thread per search the new one never queues behind it.
+        """
+        future = Future()
+
+        def worker():
+            future.set_running_or_notify_cancel()
+            try:
+                future.set_result(self._run_search_pipeline(search_term, search_mode, cancel_event))
+            except Exception as e:
+                future.set_exception(e)
+
+        threading.Thread(target=worker, name=f'gui-search-{generation}', daemon=True).start()
+        return future
+
+    def _cancel_active_search(self):
+        """Signal the in-flight search (if any) to stop and drop its results"""
+        if self._search_cancel_event is not None:
+            self._search_cancel_event.set()
+            self._search_cancel_event = None
+            self._search_generation += 1
+            self._set_search_busy(False)
+
+    def cancel_search(self):
+        """Cancel button handler"""
+        if self._search_cancel_event is not None:
+            self._cancel_active_search()
+            self.status_var.set("Search cancelled")
+
+    def _set_search_busy(self, busy: bool):
+        """Start/stop the search progress indicator (if the dashboard is showing)"""
+        progress = getattr(self, 'search_progress', None)
+        if progress is None or not progress.winfo_exists():
+            return
+        if busy:
+            progress.start(10)
+        else:
+            progress.stop()
+
+    def _run_search_pipeline(self, search_term, search_mode, cancel_event):
+        """Worker-thread part of ai_search: all DB/LLM calls, no Tk access.
+
+        Returns a payload for _render_search_results, or None if cancelled.
+        """
+        # One memoized run per query: each DB node and the LLM are hit at most once,
+        # and the Analysis dialog reuses the same stages afterwards
+        run = self.sorting_service.get_search_run(search_term)
+        fed = None
+
+        # ------------------ ADVANCED MODE ------------------
+        if search_mode == "advanced":
+            # Federated engine already combines, de-duplicates and sorts results
+            fed = self.sorting_service.get_federated_search_results(
+                search_term, limit=50
+            )
+            if cancel_event.is_set():
+                return None
+
+            # Prefer sorted_results / combined_results / results in that order
+            display_results = (
+                fed.get("sorted_results")
+                or fed.get("combined_results")
+                or fed.get("results")
+                or fed.get("employees")
+                or []
+            )
+
+        # ------------------ STANDARD MODE ------------------
+        else:
+            run.analysis()
+            if cancel_event.is_set():
+                return None
+            display_results = run.search_results().get("combined_results", [])
+
+        # Ensure we have an analysis object for urgency (same run, so no extra LLM call)
+        analysis = (fed or {}).get("analysis") or run.analysis()
+        recommendation = run.recommendation() if display_results else None
+
+        return {
+            "search_mode": search_mode,
+            "fed": fed,
+            "analysis": analysis,
+            "display_results": display_results,
+            "recommendation": recommendation,
+        }
+
+    def _poll_search(self, generation, future):
+        """Main-thread poll that hands a finished search to the renderer"""
+        if generation != self._search_generation:
+            # Superseded or cancelled; the worker's result is stale
+            return
+        if not future.done():
+            self.root.after(self.SEARCH_POLL_MS, self._poll_search, generation, future)
+            return
+
+        self._search_cancel_event = None
+        self._set_search_busy(False)
+
+        if not self.results_tree.winfo_exists():
+            # User navigated away from the dashboard mid-search
+            return
 
         try:
-            analysis = None
-            db_results = None
-            display_results = []
+            payload = future.result()
+        except Exception as e:
+            messagebox.showerror("Search Error", f"AI search failed: {e}")
+            self.status_var.set("AI search failed")
+            return
 
-            # ------------------ ADVANCED MODE ------------------
-            if search_mode == "advanced":
-                # Federated engine should already combine and normalize results
-                fed = self.sorting_service.get_federated_search_results(
-                    search_term, limit=50
-                )
+        if payload is not None:
+            self._render_search_results(payload)
 
-                # Prefer sorted_results / combined_results / results in that order
-                display_results = (
-                    fed.get("sorted_results")
-                    or fed.get("combined_results")
-                    or fed.get("results")
-                    or []
-                )
+    @staticmethod
+    def _format_result_row(provider, urgency_value):
+        """Display values of one search result row"""
+        # robust access: always use .get(...)
+        provider_type = provider.get("type", "Unknown")
 
-                # Also pull raw DB combined view; if it has richer info, use it
-                db_results = self.db_manager.get_cross_laptop_results(search_term)
-                if db_results and db_results.get("combined_results"):
-                    display_results = db_results["combined_results"]
+        # urgency indicator (query-level)
+        urgency_indicator = ""
+        if urgency_value == "emergency":
+            urgency_indicator = "🚨 "
+        elif urgency_value == "high":
+            urgency_indicator = "⚡ "
 
-                # Keep for status / popup
-                analysis = fed.get("analysis", None)
-                self._show_advanced_search_summary(fed)
+        type_indicator = "🏢 " if provider_type == "Company" else "👤 "
 
-            # ------------------ STANDARD MODE ------------------
-            else:
-                analysis = self.llm_service.analyze_distributed_service_request(
-                    search_term, "both"
-                )
-                search_term_for_db = analysis.get("service_type", search_term)
-                db_results = self.db_manager.get_cross_laptop_results(
-                    search_term_for_db
-                )
-                display_results = db_results.get("combined_results", [])
+        # rating
+        try:
+            rating = _provider_rating(provider)
+            rating_display = f"{rating:.1f} ⭐" if rating else "N/A"
+        except (ValueError, TypeError):
+            rating_display = "N/A"
+
+        # cost
+        try:
+            cost_val = _provider_cost(provider)
+            cost_display = f"${cost_val}/hr 💰" if cost_val else "Contact for price"
+        except (ValueError, TypeError):
+            cost_display = "Contact for price"
+
+        return (
+            f"{urgency_indicator}{provider.get('name', 'Unknown')}",
+            f"{type_indicator}{provider_type}",
+            _provider_service_name(provider),
+            rating_display,
+            cost_display,
+            provider.get("data_source", "Unknown"),
+        )
+
+    def _render_search_results(self, payload):
+        """Fill the results tree, status bar and popups from a finished search"""
+        search_mode = payload["search_mode"]
+        fed = payload["fed"]
+        analysis = payload["analysis"]
+        display_results = payload["display_results"]
+
+        try:
+            if fed is not None:
+                self._show_advanced_search_summary(fed)
 
             # Clear previous rows
-            for item in self.results_tree.get_children():
-                self.results_tree.delete(item)
+            self.results_model.clear()
 
             if not display_results:
                 self.status_var.set("No providers found for your search")
                 return
 
-            # Ensure we have an analysis object for urgency
-            if analysis is None:
-                try:
-                    analysis = self.llm_service.analyze_distributed_service_request(
-                        search_term, "both"
-                    )
-                except Exception:
-                    analysis = {"urgency": "medium"}
-
             urgency_value = (analysis or {}).get("urgency", "medium")
 
             # ------------------ RENDER ROWS ------------------
-            for provider in display_results:
-                # robust access: always use .get(...)
-                provider_type = provider.get("type", "Unknown")
-
-                # urgency indicator (query-level)
-                urgency_indicator = ""
-                if urgency_value == "emergency":
-                    urgency_indicator = "🚨 "
-                elif urgency_value == "high":
-                    urgency_indicator = "⚡ "
-
-                type_indicator = "🏢 " if provider_type == "Company" else "👤 "
-
-                service_name = provider.get(
-                    "service_name",
-                    provider.get(
-                        "business_type",
-                        provider.get("job_type", "General"),
-                    ),
-                )
-
-                # rating
-                rating = provider.get("rating") or 0
-                try:
-                    rating_display = f"{float(rating):.1f} ⭐" if rating else "N/A"
-                except (ValueError, TypeError):
-                    rating_display = "N/A"
-
-                # cost
-                cost = provider.get(
-                    "avg_cost",
-                    provider.get("avg_hourly_rate", provider.get("avg_cost_per_hour", 0)),
-                )
-                try:
-                    cost_val = float(cost) if cost is not None else 0.0
-                    cost_display = (
-                        f"${cost_val}/hr 💰" if cost_val else "Contact for price"
-                    )
-                except (ValueError, TypeError):
-                    cost_display = "Contact for price"
-
-                data_source = provider.get("data_source", "Unknown")
-
-                self.results_tree.insert(
-                    "",
-                    tk.END,
-                    values=(
-                        f"{urgency_indicator}{provider.get('name', 'Unknown')}",
-                        f"{type_indicator}{provider_type}",
-                        service_name,
-                        rating_display,
-                        cost_display,
-                        data_source,
-                    ),
-                )
+            self.results_model.set_rows(
+                display_results, lambda provider: self._format_result_row(provider, urgency_value)
+            )
 
             # ------------------ STATUS BAR ------------------
             if search_mode == "advanced":
@@ -392,7 +537,7 @@ class EnhancedServiceBookingApp:
 
             # ------------------ OPTIONAL AI RECOMMENDATION POPUP ------------------
             try:
-                recommendation = self.llm_service.suggest_provider_type(search_term)
+                recommendation = payload["recommendation"] or {}
                 rec_type = recommendation.get("recommended_type", "both")
                 conf = recommendation.get("confidence", 0.7)
 
@@ -574,7 +719,13 @@ class EnhancedServiceBookingApp:
             self.orders_tree.heading(col, text=col)
             self.orders_tree.column(col, width=120)
 
-        self.orders_tree.pack(fill=tk.BOTH, expand=True)
+        orders_scrollbar = ttk.Scrollbar(orders_frame, orient=tk.VERTICAL)
+        orders_scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
+        self.orders_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True)
+        self.orders_tree.view = VirtualTreeview(
+            self.orders_tree, self._format_employee_order_row, scrollbar=orders_scrollbar,
+            empty_values=('No pending orders', '', '', '', '', '')
+        )
 
         # Action buttons
         action_frame = ttk.Frame(dashboard_frame)
@@ -614,71 +765,71 @@ class EnhancedServiceBookingApp:
                   width=20).pack(pady=20)
 
     def refresh_orders(self):
-        """Refresh orders for employee with permanent storage"""
-        # Clear existing items
-        for item in self.orders_tree.get_children():
-            self.orders_tree.delete(item)
-
+        """Refresh orders for employee with permanent storage, one keyset page at a time"""
+        pager = getattr(self.orders_tree, 'pager', None)
+        if pager is None:
+            pager = LazyTreePager(
+                self.orders_tree.view,
+                self._fetch_employee_orders_page,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to load orders: {e}")
+            )
+            self.orders_tree.pager = pager
+        pager.reset()
+
+    def _fetch_employee_orders_page(self, cursor):
+        page_size = LazyTreePager.page_size()
+        orders = self.db_manager.get_employee_orders_permanent(self.current_user_id, page_size=page_size, after=cursor)
+        return orders, self.db_manager.next_page_cursor(orders, page_size, 'created_at', 'order_id')
+
+    def _format_employee_order_row(self, order):
+        # Add urgency indicator
+        urgency = order.get('urgency', 'medium')
+        urgency_text = urgency.upper()
+        if urgency == 'emergency':
+            urgency_text = f"🚨 {urgency_text}"
+        elif urgency == 'high':
+            urgency_text = f"⚡ {urgency_text}"
+
+        # Format cost safely
+        estimated_cost = order.get('estimated_cost')
         try:
-            # Get available orders from enhanced database manager
-            orders = self.db_manager.get_employee_orders_permanent(self.current_user_id)
-
-            for order in orders:
-                # Add urgency indicator
-                urgency = order.get('urgency', 'medium')
-                urgency_text = urgency.upper()
-                if urgency == 'emergency':
-                    urgency_text = f"🚨 {urgency_text}"
-                elif urgency == 'high':
-                    urgency_text = f"⚡ {urgency_text}"
-
-                # Format cost safely
-                estimated_cost = order.get('estimated_cost')
-                try:
-                    if estimated_cost and isinstance(estimated_cost, (int, float, str)):
-                        cost = float(estimated_cost)
-                        cost_text = f"${cost:.2f}" if cost else "Not estimated"
-                    else:
-                        cost_text = "Not estimated"
-                except (ValueError, TypeError):
-                    cost_text = "Not estimated"
-
-                # Format created date safely
-                created_at = order.get('created_at')
-                if created_at:
-                    try:
-                        created_text = created_at.strftime('%Y-%m-%d %H:%M')
-                    except (AttributeError, TypeError):
-                        created_text = str(created_at)
-                else:
-                    created_text = "Unknown"
-
-                self.orders_tree.insert('', tk.END, values=(
-                    order.get('order_number', order.get('order_id', 'N/A')),  # Order Number/ID
-                    order.get('customer_name', f"Customer {order.get('customer_id', 'Unknown')}"),  # Customer Name
-                    order.get('service_type', 'N/A'),  # Service Type
-                    urgency_text,  # Urgency
-                    cost_text,  # Cost
-                    created_text   # Created
-                ))
-
-            if not orders:
-                self.orders_tree.insert('', tk.END, values=('No pending orders', '', '', '', '', ''))
+            if estimated_cost and isinstance(estimated_cost, (int, float, str)):
+                cost = float(estimated_cost)
+                cost_text = f"${cost:.2f}" if cost else "Not estimated"
+            else:
+                cost_text = "Not estimated"
+        except (ValueError, TypeError):
+            cost_text = "Not estimated"
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load orders: {e}")
+        # Format created date safely
+        created_at = order.get('created_at')
+        if created_at:
+            try:
+                created_text = created_at.strftime('%Y-%m-%d %H:%M')
+            except (AttributeError, TypeError):
+                created_text = str(created_at)
+        else:
+            created_text = "Unknown"
+
+        return (
+            order.get('order_number', order.get('order_id', 'N/A')),  # Order Number/ID
+            order.get('customer_name', f"Customer {order.get('customer_id', 'Unknown')}"),  # Customer Name
+            order.get('service_type', 'N/A'),  # Service Type
+            urgency_text,  # Urgency
+            cost_text,  # Cost
+            created_text   # Created
+        )
 
     def accept_order(self):
         """Accept selected order"""
-        selection = self.orders_tree.selection()
+        # Rows stay selected while scrolled out of the virtualized list
+        selection = self.orders_tree.view.selected_rows()
         if not selection:
             messagebox.showwarning("No Selection", "Please select an order to accept")
             return
 
         try:
-            selected_item = self.orders_tree.item(selection[0])
-            order_data = selected_item['values']
-            order_number = order_data[0]  # First column is order number
+            order_number = self._format_employee_order_row(selection[0])[0]  # First column is order number
 
             if order_number == 'No pending orders' or order_number == 'N/A':
                 messagebox.showwarning("Invalid Selection", "Please select a valid order")
@@ -726,15 +877,14 @@ class EnhancedServiceBookingApp:
 
     def complete_order(self):
         """Complete selected order"""
-        selection = self.orders_tree.selection()
+        # Rows stay selected while scrolled out of the virtualized list
+        selection = self.orders_tree.view.selected_rows()
         if not selection:
             messagebox.showwarning("No Selection", "Please select an order to complete")
             return
 
         try:
-            selected_item = self.orders_tree.item(selection[0])
-            order_data = selected_item['values']
-            order_number = order_data[0]  # First column is order number
+            order_number = self._format_employee_order_row(selection[0])[0]  # First column is order number
 
             if order_number == 'No pending orders' or order_number == 'N/A':
                 messagebox.showwarning("Invalid Selection", "Please select a valid order")
@@ -813,15 +963,14 @@ class EnhancedServiceBookingApp:
 
     def cancel_order(self):
         """Cancel selected order (employee)"""
-        selection = self.orders_tree.selection()
+        # Rows stay selected while scrolled out of the virtualized list
+        selection = self.orders_tree.view.selected_rows()
         if not selection:
             messagebox.showwarning("No Selection", "Please select an order to cancel")
             return
 
         try:
-            selected_item = self.orders_tree.item(selection[0])
-            order_data = selected_item['values']
-            order_number = order_data[0]  # First column is order number
+            order_number = self._format_employee_order_row(selection[0])[0]  # First column is order number
 
             if order_number == 'No pending orders' or order_number == 'N/A':
                 messagebox.showwarning("Invalid Selection", "Please select a valid order")
@@ -863,24 +1012,19 @@ class EnhancedServiceBookingApp:
 
     def create_order(self):
         """Create new order"""
-        # Get selected provider from search results
-        selection = self.results_tree.selection()
+        # Get selected provider from search results (it stays selected while scrolled out of view)
+        selection = self.results_model.selected_rows()
         if not selection:
             messagebox.showwarning("No Selection", "Please select a service provider from the search results first")
             return
 
-        # Get selected provider details
-        selected_item = self.results_tree.item(selection[0])
-        provider_name = selected_item['values'][0].replace('🚨 ', '').replace('⚡ ', '').replace('🏢 ', '').replace('👤 ', '')
-        provider_type = selected_item['values'][1].replace('🏢 ', '').replace('👤 ', '')
-        service_name = selected_item['values'][2]
-        cost_text = selected_item['values'][4]
+        # Get selected provider details from the row's provider object
+        provider = selection[0]
+        provider_name = provider.get('name', 'Unknown')
+        provider_type = provider.get('type', 'Unknown')
+        service_name = _provider_service_name(provider)
         try:
-            # Extract numeric value from cost text
-            if isinstance(cost_text, str):
-                cost_per_hour = float(cost_text.replace('$', '').replace('/hr 💰', '').replace('/hr', '').strip())
-            else:
-                cost_per_hour = float(cost_text) if cost_text else 0.0
+            cost_per_hour = _provider_cost(provider) or 0.0
         except (ValueError, TypeError):
             cost_per_hour = 0.0
 
@@ -1024,11 +1168,14 @@ class EnhancedServiceBookingApp:
         orders_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
 
         # Scrollbar
-        scrollbar = ttk.Scrollbar(dialog, orient=tk.VERTICAL, command=orders_tree.yview)
+        scrollbar = ttk.Scrollbar(dialog, orient=tk.VERTICAL)
         scrollbar.pack(side=tk.RIGHT, fill=tk.Y)
-        orders_tree.configure(yscrollcommand=scrollbar.set)
+        orders_tree.view = VirtualTreeview(
+            orders_tree, self._format_customer_order_row, scrollbar=scrollbar,
+            empty_values=('No orders found', '', '', '', '', '', '', '')
+        )
 
-        # Load orders
+        # Load orders (further pages load as the list is scrolled)
         self.load_customer_orders(orders_tree)
 
         # Buttons
@@ -1039,68 +1186,69 @@ class EnhancedServiceBookingApp:
         ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side=tk.RIGHT)
 
     def load_customer_orders(self, orders_tree):
-        """Load customer orders into treeview with permanent storage"""
-        # Clear existing items
-        for item in orders_tree.get_children():
-            orders_tree.delete(item)
-
+        """Load customer orders into treeview with permanent storage, one keyset page at a time"""
+        pager = getattr(orders_tree, 'pager', None)
+        if pager is None:
+            pager = LazyTreePager(
+                orders_tree.view,
+                self._fetch_customer_orders_page,
+                on_error=lambda e: messagebox.showerror("Error", f"Failed to load orders: {e}")
+            )
+            orders_tree.pager = pager
+        pager.reset()
+
+    def _fetch_customer_orders_page(self, cursor):
+        page_size = LazyTreePager.page_size()
+        orders = self.db_manager.get_customer_orders_permanent(self.current_user_id, page_size=page_size, after=cursor)
+        return orders, self.db_manager.next_page_cursor(orders, page_size, 'created_at', 'order_id')
+
+    def _format_customer_order_row(self, order):
+        # Add urgency indicator
+        urgency = order.get('urgency', 'medium')
+        urgency_text = urgency.upper()
+        if urgency == 'emergency':
+            urgency_text = f"🚨 {urgency_text}"
+        elif urgency == 'high':
+            urgency_text = f"⚡ {urgency_text}"
+
+        # Add status indicator
+        status = order.get('status', 'pending')
+        status_text = status.upper().replace('_', ' ')
+        if status == 'pending':
+            status_text = f"⏳ {status_text}"
+        elif status == 'accepted':
+            status_text = f"✅ {status_text}"
+        elif status == 'in_progress':
+            status_text = f"🔧 {status_text}"
+        elif status == 'completed':
+            status_text = f"🎉 {status_text}"
+        elif status == 'cancelled':
+            status_text = f"❌ {status_text}"
+
+        # Format cost safely
+        estimated_cost = order.get('estimated_cost')
         try:
-            # Get orders from enhanced database manager
-            orders = self.db_manager.get_customer_orders_permanent(self.current_user_id)
-
-            for order in orders:
-                # Add urgency indicator
-                urgency = order.get('urgency', 'medium')
-                urgency_text = urgency.upper()
-                if urgency == 'emergency':
-                    urgency_text = f"🚨 {urgency_text}"
-                elif urgency == 'high':
-                    urgency_text = f"⚡ {urgency_text}"
-
-                # Add status indicator
-                status = order.get('status', 'pending')
-                status_text = status.upper().replace('_', ' ')
-                if status == 'pending':
-                    status_text = f"⏳ {status_text}"
-                elif status == 'accepted':
-                    status_text = f"✅ {status_text}"
-                elif status == 'in_progress':
-                    status_text = f"🔧 {status_text}"
-                elif status == 'completed':
-                    status_text = f"🎉 {status_text}"
-                elif status == 'cancelled':
-                    status_text = f"❌ {status_text}"
-
-                # Format cost safely
-                estimated_cost = order.get('estimated_cost')
-                try:
-                    cost_text = f"${float(estimated_cost):.2f}" if estimated_cost and isinstance(estimated_cost, (int, float, str)) else "Not estimated"
-                except (ValueError, TypeError):
-                    cost_text = "Not estimated"
-
-                # Format dates safely
-                created_at = order.get('created_at')
-                updated_at = order.get('updated_at')
-
-                created_text = created_at.strftime('%Y-%m-%d %H:%M') if created_at else "Unknown"
-                updated_text = updated_at.strftime('%Y-%m-%d %H:%M') if updated_at else "Unknown"
-
-                orders_tree.insert('', tk.END, values=(
-                    order.get('order_number', order.get('order_id', 'N/A')),  # Order Number/ID
-                    order.get('order_id', 'Not assigned'),  # Provider Name (will be updated when assigned)
-                    order.get('service_type', 'N/A'),  # Service Type
-                    status_text,  # Status
-                    urgency_text,  # Urgency
-                    cost_text,  # Cost
-                    created_text,  # Created
-                    updated_text   # Updated
-                ))
-
-            if not orders:
-                orders_tree.insert('', tk.END, values=('No orders found', '', '', '', '', '', '', ''))
-
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load orders: {e}")
+            cost_text = f"${float(estimated_cost):.2f}" if estimated_cost and isinstance(estimated_cost, (int, float, str)) else "Not estimated"
+        except (ValueError, TypeError):
+            cost_text = "Not estimated"
+
+        # Format dates safely
+        created_at = order.get('created_at')
+        updated_at = order.get('updated_at')
+
+        created_text = created_at.strftime('%Y-%m-%d %H:%M') if created_at else "Unknown"
+        updated_text = updated_at.strftime('%Y-%m-%d %H:%M') if updated_at else "Unknown"
+
+        return (
+            order.get('order_number', order.get('order_id', 'N/A')),  # Order Number/ID
+            order.get('order_id', 'Not assigned'),  # Provider Name (will be updated when assigned)
+            order.get('service_type', 'N/A'),  # Service Type
+            status_text,  # Status
+            urgency_text,  # Urgency
+            cost_text,  # Cost
+            created_text,  # Created
+            updated_text   # Updated
+        )
 
     def view_all_users(self):
         """View all users (admin)"""
@@ -1135,7 +1283,13 @@ class EnhancedServiceBookingApp:
             else:
                 customers_tree.column(col, width=120)
 
-        customers_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        customers_scrollbar = ttk.Scrollbar(customers_frame, orient=tk.VERTICAL)
+        customers_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
+        customers_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+        customers_tree.view = VirtualTreeview(
+            customers_tree, self._format_admin_customer_row, scrollbar=customers_scrollbar,
+            empty_values=('No customers found', '', '', '', '', '', '', '', '', '')
+        )
 
         # Employees Tab
         employees_frame = ttk.Frame(notebook)
@@ -1155,7 +1309,13 @@ class EnhancedServiceBookingApp:
             else:
                 employees_tree.column(col, width=120)
 
-        employees_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        employees_scrollbar = ttk.Scrollbar(employees_frame, orient=tk.VERTICAL)
+        employees_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
+        employees_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+        employees_tree.view = VirtualTreeview(
+            employees_tree, self._format_admin_employee_row, scrollbar=employees_scrollbar,
+            empty_values=('No employees found', '', '', '', '', '', '', '', '', '', '')
+        )
 
         # Companies Tab
         companies_frame = ttk.Frame(notebook)
@@ -1171,7 +1331,13 @@ class EnhancedServiceBookingApp:
             else:
                 companies_tree.column(col, width=150)
 
-        companies_tree.pack(fill=tk.BOTH, expand=True, padx=10, pady=10)
+        companies_scrollbar = ttk.Scrollbar(companies_frame, orient=tk.VERTICAL)
+        companies_scrollbar.pack(side=tk.RIGHT, fill=tk.Y, pady=10)
+        companies_tree.pack(side=tk.LEFT, fill=tk.BOTH, expand=True, padx=10, pady=10)
+        companies_tree.view = VirtualTreeview(
+            companies_tree, self._format_admin_company_row, scrollbar=companies_scrollbar,
+            empty_values=('No companies found', '', '', '', '', '', '', '')
+        )
 
         # Load users data
         self.load_admin_users_data(customers_tree, employees_tree, companies_tree)
@@ -1185,93 +1351,96 @@ class EnhancedServiceBookingApp:
         ttk.Button(button_frame, text="Close", command=dialog.destroy).pack(side=tk.RIGHT)
 
     def load_admin_users_data(self, customers_tree, employees_tree, companies_tree):
-        """Load all users data into admin dashboard"""
+        """Load all users data into admin dashboard; each tab pages in more rows as it is scrolled"""
         try:
-            # Clear existing items
-            for tree in [customers_tree, employees_tree, companies_tree]:
-                for item in tree.get_children():
-                    tree.delete(item)
+            # First page of every listing (with the sample fallbacks), later pages per tab on demand
+            page_size = LazyTreePager.page_size()
+            users_data = self.db_manager.get_all_users_admin(page_size=page_size)
+
+            listings = [('customers', customers_tree), ('employees', employees_tree), ('companies', companies_tree)]
+            for kind, tree in listings:
+                pager = getattr(tree, 'pager', None)
+                if pager is None:
+                    pager = LazyTreePager(
+                        tree.view, None,
+                        on_error=lambda e: messagebox.showerror("Error", f"Failed to load users data: {e}")
+                    )
+                    tree.pager = pager
+                pager.fetch_page = self._admin_page_fetcher(kind, pager, users_data.get(kind, []), page_size)
+                pager.reset()
 
-            # Get all users from database
-            users_data = self.db_manager.get_all_users_admin()
+        except Exception as e:
+            messagebox.showerror("Error", f"Failed to load users data: {e}")
 
-            # Load customers
-            for customer in users_data.get('customers', []):
-                status = "Active" if customer['is_active'] else "Inactive"
-                verified = "Yes" if customer['is_verified'] else "No"
+    def _admin_page_fetcher(self, kind, pager, first_page, page_size):
+        """fetch_page for one admin tab: the already loaded first page, then keyset pages"""
+        def fetch_page(cursor):
+            if cursor is None:
+                rows = first_page
+            else:
+                rows = self.db_manager.get_admin_users_page(
+                    kind, page_size, after=cursor, start_index=pager.rows_loaded + 1
+                )
+            return rows, self.db_manager.next_admin_page_cursor(kind, rows, page_size)
+        return fetch_page
 
-                # Safe date formatting
-                try:
-                    joined = customer['registration_date'].strftime('%Y-%m-%d') if customer['registration_date'] else "Unknown"
-                except (AttributeError, TypeError):
-                    joined = str(customer.get('registration_date', 'Unknown'))
-
-                customers_tree.insert('', tk.END, values=(
-                    customer['id'],
-                    customer['name'],
-                    customer['email'],
-                    customer['phone'],
-                    customer['membership_level'],
-                    customer['total_orders'],
-                    f"${customer['total_spent']:.2f}" if customer['total_spent'] else "$0.00",
-                    status,
-                    verified,
-                    joined
-                ))
-
-            # Load employees
-            for employee in users_data.get('employees', []):
-                status = "Active" if employee['is_active'] else "Inactive"
-                available = employee.get('availability_status', 'Unknown')
-
-                # Safe date formatting
-                try:
-                    joined = employee['registration_date'].strftime('%Y-%m-%d') if employee['registration_date'] else "Unknown"
-                except (AttributeError, TypeError):
-                    joined = str(employee.get('registration_date', 'Unknown'))
-
-                employees_tree.insert('', tk.END, values=(
-                    employee['id'],
-                    employee['name'],
-                    employee['email'],
-                    employee['phone'],
-                    employee['job_type'],
-                    f"{employee['experience_years']} years",
-                    employee['total_orders'],
-                    f"${employee['total_earnings']:.2f}" if employee['total_earnings'] else "$0.00",
-                    f"{employee['rating']:.1f}" if employee['rating'] else "0.0",
-                    available,
-                    status
-                ))
-
-            # Load companies
-            for company in users_data.get('companies', []):
-                # Truncate long descriptions for display
-                spec = company.get('specialization_areas', '')
-                if len(spec) > 50:
-                    spec = spec[:47] + "..."
-
-                companies_tree.insert('', tk.END, values=(
-                    company['id'],
-                    company['name'],
-                    company['email'],
-                    company['phone'],
-                    company['business_type'],
-                    f"{company['rating']:.1f}" if company['rating'] else "0.0",
-                    company['total_reviews'],
-                    spec
-                ))
-
-            # Add no data messages if needed
-            if not users_data.get('customers'):
-                customers_tree.insert('', tk.END, values=('No customers found', '', '', '', '', '', '', '', '', ''))
-            if not users_data.get('employees'):
-                employees_tree.insert('', tk.END, values=('No employees found', '', '', '', '', '', '', '', '', '', ''))
-            if not users_data.get('companies'):
-                companies_tree.insert('', tk.END, values=('No companies found', '', '', '', '', '', '', ''))
+    def _format_admin_customer_row(self, customer):
+        status = "Active" if customer['is_active'] else "Inactive"
+        verified = "Yes" if customer['is_verified'] else "No"
 
-        except Exception as e:
-            messagebox.showerror("Error", f"Failed to load users data: {e}")
+        # Safe date formatting
+        try:
+            joined = customer['registration_date'].strftime('%Y-%m-%d') if customer['registration_date'] else "Unknown"
+        except (AttributeError, TypeError):
+            joined = str(customer.get('registration_date', 'Unknown'))
+
+        return (
+            customer['id'],
+            customer['name'],
+            customer['email'],
+            customer['phone'],
+            customer['membership_level'],
+            customer['total_orders'],
+            f"${customer['total_spent']:.2f}" if customer['total_spent'] else "$0.00",
+            status,
+            verified,
+            joined
+        )
+
+    def _format_admin_employee_row(self, employee):
+        status = "Active" if employee['is_active'] else "Inactive"
+        available = employee.get('availability_status', 'Unknown')
+
+        return (
+            employee['id'],
+            employee['name'],
+            employee['email'],
+            employee['phone'],
+            employee['job_type'],
+            f"{employee['experience_years']} years",
+            employee['total_orders'],
+            f"${employee['total_earnings']:.2f}" if employee['total_earnings'] else "$0.00",
+            f"{employee['rating']:.1f}" if employee['rating'] else "0.0",
+            available,
+            status
+        )
+
+    def _format_admin_company_row(self, company):
+        # Truncate long descriptions for display
+        spec = company.get('specialization_areas', '')
+        if len(spec) > 50:
+            spec = spec[:47] + "..."
+
+        return (
+            company['id'],
+            company['name'],
+            company['email'],
+            company['phone'],
+            company['business_type'],
+            f"{company['rating']:.1f}" if company['rating'] else "0.0",
+            company['total_reviews'],
+            spec
+        )
 
     def view_system_status(self):
         """View system status"""
@@ -1592,6 +1761,10 @@ class EnhancedServiceBookingApp:
                      font=('Arial', 12)).pack(anchor=tk.W, pady=2)
             ttk.Label(info_frame, text=f"Cache Size: {health.get('cache_size', 0)} records",
                      font=('Arial', 12)).pack(anchor=tk.W, pady=2)
+            cache_stats = health.get('cache_stats', {})
+            ttk.Label(info_frame, text=f"Cache Hit Rate: {cache_stats.get('hit_rate', 0.0):.0%} "
+                                       f"({cache_stats.get('hits', 0)} hits / {cache_stats.get('misses', 0)} misses)",
+                     font=('Arial', 12)).pack(anchor=tk.W, pady=2)
 
             # Connection Summary
             summary_frame = ttk.LabelFrame(main_frame, text="Connection Summary", padding=15)
@@ -1681,6 +1854,10 @@ class EnhancedServiceBookingApp:
                      font=('Arial', 12)).pack(anchor=tk.W, pady=2)
             ttk.Label(info_frame, text=f"Cache Size: {health.get('cache_size', 0)} records",
                      font=('Arial', 12)).pack(anchor=tk.W, pady=2)
+            cache_stats = health.get('cache_stats', {})
+            ttk.Label(info_frame, text=f"Cache Hit Rate: {cache_stats.get('hit_rate', 0.0):.0%} "
+                                       f"({cache_stats.get('hits', 0)} hits / {cache_stats.get('misses', 0)} misses)",
+                     font=('Arial', 12)).pack(anchor=tk.W, pady=2)
 
             # Connection Summary
             summary_frame = ttk.LabelFrame(main_frame, text="Connection Summary", padding=15)
@@ -1726,6 +1903,7 @@ class EnhancedServiceBookingApp:
 
     def logout(self):
         """Logout current user"""
+        self._cancel_active_search()
         self.current_user_id = None
         self.current_user_type = None
         self.show_login_screen()
@@ -1734,86 +1912,12 @@ class EnhancedServiceBookingApp:
     def sort_results(self):
         """Sort the search results based on selected criteria"""
         try:
-            # Get current results from treeview
-            current_results = []
-            for item in self.results_tree.get_children():
-                values = self.results_tree.item(item)['values']
-                # Parse the values back into a dict for sorting
-                current_results.append({
-                    'name': values[0].replace('🚨 ', '').replace('⚡ ', ''),  # Remove urgency indicators
-                    'type': values[1].replace('🏢 ', '').replace('👤 ', ''),
-                    'service': values[2],
-                    'rating_str': values[3].replace(' ⭐', '').replace('N/A', '0'),
-                    'cost_str': values[4].replace('$', '').replace('/hr 💰', '').replace('Contact for price', '999999'),
-                    'source': values[5],
-                    'tree_item': item
-                })
-
-            if not current_results:
+            if not len(self.results_model):
                 return
 
-            # Sort based on selected option
+            # Reorders the existing rows by their precomputed keys
             sort_option = self.sort_var.get()
-
-            if sort_option == "rating_desc":
-                current_results.sort(key=lambda x: float(x['rating_str']), reverse=True)
-            elif sort_option == "rating_asc":
-                current_results.sort(key=lambda x: float(x['rating_str']))
-            elif sort_option == "price_asc":
-                current_results.sort(key=lambda x: float(x['cost_str']))
-            elif sort_option == "price_desc":
-                current_results.sort(key=lambda x: float(x['cost_str']), reverse=True)
-            elif sort_option == "available":
-                # Priority to available providers
-                current_results.sort(key=lambda x: 0 if 'Available' in str(x.get('availability', '')) else 1)
-            elif sort_option == "name_asc":
-                current_results.sort(key=lambda x: x['name'].lower())
-            elif sort_option == "name_desc":
-                current_results.sort(key=lambda x: x['name'].lower(), reverse=True)
-            elif sort_option == "companies_first":
-                current_results.sort(key=lambda x: 0 if 'Company' in x['type'] else 1)
-            elif sort_option == "workers_first":
-                current_results.sort(key=lambda x: 0 if 'Individual Worker' in x['type'] else 1)
-
-            # Rebuild the treeview with sorted results
-            for item in self.results_tree.get_children():
-                self.results_tree.delete(item)
-
-            for result in current_results:
-                # Re-add urgency indicators if needed
-                name = result['name']
-                if 'emergency' in result['service'].lower() or 'urgent' in result['name'].lower():
-                    name = "🚨 " + name
-                elif 'high' in result['service'].lower():
-                    name = "⚡ " + name
-
-                # Re-add provider type indicators
-                type_indicator = "🏢 " if 'Company' in result['type'] else "👤 "
-                provider_type = type_indicator + result['type']
-
-                # Re-add rating indicator
-                rating = result['rating_str']
-                if rating != '0':
-                    rating_display = f"{float(rating):.1f} ⭐"
-                else:
-                    rating_display = "N/A"
-
-                # Re-add cost indicator
-                cost = result['cost_str']
-                if cost != '999999':
-                    cost_display = f"${float(cost):.0f}/hr 💰"
-                else:
-                    cost_display = "Contact for price"
-
-                # Insert the sorted result
-                self.results_tree.insert('', tk.END, values=(
-                    name,
-                    provider_type,
-                    result['service'],
-                    rating_display,
-                    cost_display,
-                    result['source']
-                ))
+            self.results_model.sort(self.RESULT_SORT_OPTIONS.get(sort_option, self.RESULT_SORT_OPTIONS["rating_desc"]))
 
             # Update status
             sort_names = {
@@ -1999,6 +2103,13 @@ Primary Database:
         except Exception as e:
             print(f"Error showing search summary: {e}")
 
+    def on_closing(self):
+        """Stop background searches and release DB connections before exiting"""
+        # Search threads are daemons: one stuck in a DB/LLM call does not hold up the exit
+        self._cancel_active_search()
+        self.db_manager.close_connections()
+        self.root.destroy()
+
 def main():
     root = tk.Tk()
     app = EnhancedServiceBookingApp(root)
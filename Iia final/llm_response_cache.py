@@ -0,0 +1,190 @@
+"""
+Two-tier cache for LLM responses used by DistributedLLMService.
+
+Tier 1 is an in-memory TTL + LRU cache; tier 2 is an optional SQLite file so
+answers survive restarts. Keys are derived from the model, the generation
+settings and the whitespace-normalized prompt, so the same "plumber leak
+emergency" style query never pays for a second Gemini round trip while fresh.
+"""
+
+import hashlib
+import json
+import re
+import sqlite3
+import threading
+import time
+from pathlib import Path
+from typing import Any, Dict, Optional, Tuple
+
+from result_cache import TTLResultCache
+
+
+class LLMResponseCache:
+    """Memory LRU in front of an optional on-disk SQLite store"""
+
+    def __init__(
+        self,
+        max_entries: int = 512,
+        ttl_seconds: float = 3600.0,
+        disk_path: Optional[str] = None,
+        disk_max_entries: int = 5000,
+    ):
+        self.ttl_seconds = ttl_seconds
+        self.memory = TTLResultCache(max_entries=max_entries, ttl_seconds=ttl_seconds)
+
+        self.disk_path = Path(disk_path) if disk_path else None
+        self.disk_max_entries = disk_max_entries
+        self._disk = None
+        self._disk_lock = threading.Lock()
+        self.disk_hits = 0
+        self.disk_misses = 0
+        self.disk_errors = 0
+
+        if self.disk_path:
+            self._open_disk()
+
+    # ------------------------------------------------------------------
+    # KEYS
+    # ------------------------------------------------------------------
+
+    @staticmethod
+    def normalize_prompt(prompt: str) -> str:
+        # Prompts are indented f-strings, so layout does not change the answer. Case can:
+        # the user's text and the provider names and results embedded in the prompt are kept
+        return re.sub(r"\s+", " ", prompt).strip()
+
+    @classmethod
+    def make_key(cls, model: str, prompt: str, **settings: Any) -> str:
+        payload = json.dumps(
+            {"model": model, "settings": settings, "prompt": cls.normalize_prompt(prompt)},
+            sort_keys=True,
+        )
+        return hashlib.sha256(payload.encode("utf-8")).hexdigest()
+
+    # ------------------------------------------------------------------
+    # LOOKUP / STORE
+    # ------------------------------------------------------------------
+
+    def get(self, key: str) -> Optional[str]:
+        text = self.memory.get(key)
+        if text is not None:
+            return text
+
+        stored = self._disk_get(key)
+        if stored is None:
+            return None
+        text, created_at = stored
+        # Promote so the next lookup is served from memory, expiring when the disk entry does
+        self.memory.set(key, text, ttl_seconds=created_at + self.ttl_seconds - time.time())
+        return text
+
+    def set(self, key: str, text: str, model: str = ""):
+        self.memory.set(key, text)
+        self._disk_set(key, text, model)
+
+    def clear(self):
+        self.memory.clear()
+        if self._disk is None:
+            return
+        with self._disk_lock:
+            try:
+                self._disk.execute("DELETE FROM llm_responses")
+                self._disk.commit()
+            except sqlite3.Error:
+                self.disk_errors += 1
+
+    # ------------------------------------------------------------------
+    # DISK TIER
+    # ------------------------------------------------------------------
+
+    def _open_disk(self):
+        try:
+            self._disk = sqlite3.connect(str(self.disk_path), check_same_thread=False)
+            self._disk.execute(
+                """
+                CREATE TABLE IF NOT EXISTS llm_responses (
+                    cache_key TEXT PRIMARY KEY,
+                    model TEXT,
+                    response TEXT NOT NULL,
+                    created_at REAL NOT NULL,
+                    last_access REAL NOT NULL
+                )
+                """
+            )
+            self._disk.execute(
+                "CREATE INDEX IF NOT EXISTS idx_llm_responses_last_access ON llm_responses (last_access)"
+            )
+            self._disk.commit()
+        except sqlite3.Error as e:
+            print(f"⚠️ LLM disk cache disabled ({self.disk_path}): {e}")
+            self._disk = None
+
+    def _disk_get(self, key: str) -> Optional[Tuple[str, float]]:
+        """(response, created_at) of a fresh disk entry, None when missing or expired"""
+        if self._disk is None:
+            return None
+        now = time.time()
+        with self._disk_lock:
+            try:
+                row = self._disk.execute(
+                    "SELECT response, created_at FROM llm_responses WHERE cache_key = ?", (key,)
+                ).fetchone()
+                if row is None or row[1] + self.ttl_seconds < now:
+                    if row is not None:
+                        self._disk.execute("DELETE FROM llm_responses WHERE cache_key = ?", (key,))
+                        self._disk.commit()
+                    self.disk_misses += 1
+                    return None
+                self._disk.execute(
+                    "UPDATE llm_responses SET last_access = ? WHERE cache_key = ?", (now, key)
+                )
+                self._disk.commit()
+                self.disk_hits += 1
+                return row[0], row[1]
+            except sqlite3.Error:
+                self.disk_errors += 1
+                return None
+
+    def _disk_set(self, key: str, text: str, model: str):
+        if self._disk is None:
+            return
+        now = time.time()
+        with self._disk_lock:
+            try:
+                self._disk.execute(
+                    "INSERT OR REPLACE INTO llm_responses (cache_key, model, response, created_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, model, text, now, now),
+                )
+                # Keep the file bounded: drop the least recently used rows beyond the limit
+                self._disk.execute(
+                    "DELETE FROM llm_responses WHERE cache_key IN ("
+                    " SELECT cache_key FROM llm_responses ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+                    (self.disk_max_entries,),
+                )
+                self._disk.commit()
+            except sqlite3.Error:
+                self.disk_errors += 1
+
+    # ------------------------------------------------------------------
+    # ADMIN
+    # ------------------------------------------------------------------
+
+    def get_stats(self) -> Dict[str, Any]:
+        memory = self.memory.get_stats()
+        lookups = memory["hits"] + memory["misses"]
+        hits = memory["hits"] + self.disk_hits
+        return {
+            "memory": memory,
+            "disk_enabled": self._disk is not None,
+            "disk_hits": self.disk_hits,
+            "disk_misses": self.disk_misses,
+            "disk_errors": self.disk_errors,
+            "hit_rate": round(hits / lookups, 3) if lookups else 0.0,
+        }
+
+    def close(self):
+        with self._disk_lock:
+            if self._disk is not None:
+                self._disk.close()
+                self._disk = None
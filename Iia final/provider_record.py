@@ -0,0 +1,182 @@
+"""
+Compact provider record shared by search, scoring, deduplication and the GUI.
+
+Company rows (primary) and employee rows (secondary) used to be rebuilt into
+fresh 15+ key dicts by every caller. A Provider is built once per database
+row, stores its values in __slots__, and still behaves like the old dicts
+(provider['rating'], provider.get('avg_cost', 0), provider['score'] = ...),
+so existing consumers keep working while new code can read attributes.
+
+Fields a row never had stay unset, exactly like a missing dict key, so
+`.get('experience_years', 0)` on a company still returns the default.
+"""
+
+from collections.abc import MutableMapping
+from typing import Any, Dict, Iterator, Optional
+
+FIELDS = (
+    'id', 'name', 'type', 'data_source', 'business_type', 'service_name', 'specialization',
+    'description', 'rating', 'total_reviews', 'avg_cost', 'service_regions', 'phone', 'email',
+    'website', 'relevance', 'experience_years', 'total_orders', 'certification_level',
+    'emergency_service', 'availability_status', 'avg_response_time_hours', 'registration_date',
+    'comprehensive_score', 'scoring_factors',
+)
+_FIELD_SET = frozenset(FIELDS)
+
+# Older key names still used by callers, mapped onto the canonical fields
+ALIASES = {
+    'regions': 'service_regions',
+    'service_type': 'service_name',
+    'availability': 'availability_status',
+    'job_type': 'business_type',
+    'specialization_areas': 'specialization',
+    'user_id': 'id',
+}
+
+_MISSING = object()
+
+
+class Provider(MutableMapping):
+    """One company or individual worker; dict-compatible view over __slots__"""
+
+    __slots__ = FIELDS + ('_extras',)
+
+    def __init__(self, **values: Any):
+        self._extras: Optional[Dict[str, Any]] = None
+        for key, value in values.items():
+            self[key] = value
+
+    # ------------------------------------------------------------------
+    # CONSTRUCTION FROM DATABASE ROWS
+    # ------------------------------------------------------------------
+
+    @classmethod
+    def from_company_row(cls, company, **extra: Any) -> "Provider":
+        """Build from a primary `companies` row (optionally joined with SERVICE_TYPE)"""
+        provider = cls.__new__(cls)
+        provider._extras = None
+        provider.id = company['company_id']
+        provider.name = company['company_name']
+        provider.type = 'Company'
+        provider.data_source = 'Primary'
+        provider.business_type = company.get('business_type')
+        provider.service_name = company.get('service_name') or 'General Service'
+        provider.specialization = company.get('specialization_areas')
+        provider.description = company.get('description')
+        provider.rating = company.get('rating')
+        provider.total_reviews = company.get('total_reviews')
+        provider.avg_cost = company.get('avg_hourly_rate') or company.get('service_cost') or 0
+        provider.service_regions = company.get('service_regions')
+        provider.phone = company.get('phone')
+        provider.email = company.get('email')
+        provider.website = company.get('website')
+        provider.relevance = float(company.get('relevance') or 0.0)
+        for key, value in extra.items():
+            provider[key] = value
+        return provider
+
+    @classmethod
+    def from_employee_row(cls, employee, **extra: Any) -> "Provider":
+        """Build from a secondary `employee` row (search queries alias name AS user_name)"""
+        job_type = employee.get('job_type') or employee.get('specialization') or 'General'
+
+        provider = cls.__new__(cls)
+        provider._extras = None
+        provider.id = employee['employee_id']
+        provider.name = employee.get('user_name') or employee.get('name')
+        provider.type = 'Individual Worker'
+        provider.data_source = 'Secondary'
+        provider.business_type = job_type
+        provider.service_name = employee.get('service_name') or job_type
+        provider.specialization = employee.get('specialization', '')
+        provider.description = employee.get('bio', '')
+        provider.rating = employee.get('rating', 0)
+        provider.avg_cost = employee.get('avg_cost_per_hour') or 0
+        provider.service_regions = employee.get('preferred_regions', '')
+        provider.phone = employee.get('phone', '')
+        provider.email = employee.get('email', '')
+        provider.relevance = float(employee.get('relevance') or 0.0)
+        provider.experience_years = employee.get('experience_years', 0)
+        provider.total_orders = employee.get('total_completed_orders', 0)
+        provider.certification_level = employee.get('certification_level', '')
+        provider.emergency_service = employee.get('emergency_service', 0)
+        if 'availability_status' in employee:
+            provider.availability_status = employee['availability_status']
+        for key, value in extra.items():
+            provider[key] = value
+        return provider
+
+    # ------------------------------------------------------------------
+    # DICT-COMPATIBLE VIEW
+    # ------------------------------------------------------------------
+
+    def __getitem__(self, key: str) -> Any:
+        key = ALIASES.get(key, key)
+        if key in _FIELD_SET:
+            value = getattr(self, key, _MISSING)
+            if value is not _MISSING:
+                return value
+        elif self._extras is not None and key in self._extras:
+            return self._extras[key]
+        raise KeyError(key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        key = ALIASES.get(key, key)
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        if self._extras is not None:
+            return self._extras.get(key, default)
+        return default
+
+    def __setitem__(self, key: str, value: Any):
+        key = ALIASES.get(key, key)
+        if key in _FIELD_SET:
+            setattr(self, key, value)
+        else:
+            if self._extras is None:
+                self._extras = {}
+            self._extras[key] = value
+
+    def __delitem__(self, key: str):
+        key = ALIASES.get(key, key)
+        try:
+            if key in _FIELD_SET:
+                delattr(self, key)
+            elif self._extras is not None:
+                del self._extras[key]
+            else:
+                raise KeyError(key)
+        except AttributeError:
+            raise KeyError(key) from None
+
+    def __contains__(self, key: object) -> bool:
+        key = ALIASES.get(key, key)
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self._extras is not None and key in self._extras
+
+    def __iter__(self) -> Iterator[str]:
+        for name in FIELDS:
+            if hasattr(self, name):
+                yield name
+        if self._extras:
+            yield from self._extras
+
+    def __len__(self) -> int:
+        return sum(1 for _ in self)
+
+    def copy(self) -> "Provider":
+        clone = Provider.__new__(Provider)
+        for name in FIELDS:
+            value = getattr(self, name, _MISSING)
+            if value is not _MISSING:
+                setattr(clone, name, value)
+        clone._extras = dict(self._extras) if self._extras else None
+        return clone
+
+    def to_dict(self) -> Dict[str, Any]:
+        """Plain dict (canonical key names) e.g. for JSON export"""
+        return dict(self.items())
+
+    def __repr__(self) -> str:
+        return f"Provider({self.to_dict()!r})"
@@ -0,0 +1,565 @@
+"""
+Comprehensive scoring and ranking of federated provider results.
+
+DistributedSortingService._apply_intelligent_sorting delegates here. The
+ranking model is declared in config: SERVICE_SORTING_WEIGHTS gives each
+feature its share of the 100-point score (and the order the factors are
+added in), RANKING_CONFIG['features'] names the extractor behind each feature
+and its parameters (tier tables, certification levels, ...). The declaration
+is compiled once into a RankingModel; scoring a result is then one fixed pass
+over the compiled features, whatever the weights are.
+
+The compiled model is swapped for a new one when the optional JSON override
+file (RANKING_CONFIG['override_file']) changes on disk, so ranking can be
+tuned on a running app; the override is compiled against the config loaded at
+startup (config.py itself is never reloaded, other modules hold its dicts).
+An invalid edit is reported and the previous model stays in use.
+
+With NumPy installed each feature is evaluated column-wise; the float
+operations run in the same order as the per-row path, so both give
+bit-for-bit identical scores. Without NumPy (or for tiny result sets) the
+per-row path is used. When only the best `limit` providers are needed,
+rank_providers selects them with argpartition instead of sorting every
+candidate.
+"""
+
+import copy
+import json
+import os
+import threading
+import time
+from datetime import date, datetime
+from decimal import Decimal
+from itertools import compress
+from typing import Any, Dict, List, Optional, Tuple
+
+import config
+from provider_record import Provider
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the per-row path gives the same scores
+    np = None
+
+# Below this many results the array setup costs more than the loop it replaces
+VECTORIZE_MIN_RESULTS = 64
+
+
+def _as_float(value) -> float:
+    try:
+        return float(value)
+    except (TypeError, ValueError):
+        return 0.0
+
+
+def _numeric(values: List[Any]):
+    try:
+        return np.array(values, dtype=np.float64)
+    except TypeError:
+        # NULL columns come through as None
+        return np.array([value or 0 for value in values], dtype=np.float64)
+
+
+def provider_key(result) -> str:
+    """Identity of a result across ranking runs (company and worker ids overlap)"""
+    return f"{result.get('type')}:{result.get('id')}"
+
+
+class ResultColumns:
+    """Per-call column cache shared by the features of one vectorized scoring pass"""
+
+    def __init__(self, results: List[Any]):
+        self.results = results
+        self.count = len(results)
+        self.providers_only = all(type(result) is Provider for result in results)
+        self.types = np.array(self.values('type', None), dtype=object)
+        self.masks = {
+            'company': self.types == 'Company',
+            'worker': self.types == 'Individual Worker',
+        }
+        self.masks['non_company'] = ~self.masks['company']
+        self._numeric_cache: Dict[Tuple, Any] = {}
+
+    def values(self, key: str, default: Any, rows: Optional[str] = None) -> List[Any]:
+        """Raw values of `key`, optionally only for the rows of one mask"""
+        results = self.results if rows is None else list(compress(self.results, self.masks[rows]))
+        if self.providers_only:
+            # Slot reads through getattr skip the Python-level mapping view
+            return [getattr(result, key, default) for result in results]
+        return [result.get(key, default) for result in results]
+
+    def numeric(self, key: str, default: Any, rows: Optional[str] = None):
+        """Float column of `key`; rows outside the mask are 0"""
+        cache_key = (key, default, rows)
+        if cache_key not in self._numeric_cache:
+            if rows is None:
+                column = _numeric(self.values(key, default))
+            else:
+                column = np.zeros(self.count)
+                column[self.masks[rows]] = _numeric(self.values(key, default, rows))
+            self._numeric_cache[cache_key] = column
+        return self._numeric_cache[cache_key]
+
+
+# ----------------------------------------------------------------------
+# FEATURE EXTRACTORS
+# ----------------------------------------------------------------------
+
+class RankingFeature:
+    """One weighted term of the score: a value in [0, 1] per result, times the feature's points"""
+
+    extractor = ''
+
+    def __init__(self, name: str, points: float, params: Dict):
+        self.name = name
+        self.points = points
+        self.params = params
+
+    def value(self, result, analysis: Dict) -> float:
+        raise NotImplementedError
+
+    def column(self, columns: ResultColumns, analysis: Dict):
+        """NumPy array of value() for every result"""
+        raise NotImplementedError
+
+
+class RatingFeature(RankingFeature):
+    """Provider rating over the rating scale"""
+
+    extractor = 'rating'
+
+    def __init__(self, name: str, points: float, params: Dict):
+        super().__init__(name, points, params)
+        self.scale = float(params.get('scale', 5.0))
+
+    def value(self, result, analysis: Dict) -> float:
+        # MySQL DECIMAL ratings arrive as Decimal
+        return _as_float(result.get('rating', 0)) / self.scale
+
+    def column(self, columns: ResultColumns, analysis: Dict):
+        values = columns.values('rating', 0)
+        try:
+            ratings = np.array(values, dtype=np.float64)
+        except (TypeError, ValueError):
+            # NULL or non-numeric ratings score 0, as on the per-row path
+            ratings = np.array([_as_float(value) for value in values], dtype=np.float64)
+        return ratings / self.scale
+
+
+class ProviderTypeFeature(RankingFeature):
+    """Whether the provider is the type the analysis recommends"""
+
+    extractor = 'provider_type'
+
+    def __init__(self, name: str, points: float, params: Dict):
+        super().__init__(name, points, params)
+        self.preferred = params.get('preferred_types', {'company': 'Company', 'individual': 'Individual Worker'})
+        self.match = float(params.get('match', 1.0))
+        self.other = float(params.get('other', 0.5))
+
+    def value(self, result, analysis: Dict) -> float:
+        preferred = self.preferred.get(analysis.get('recommended_provider_type', 'both'))
+        return self.match if preferred is not None and result['type'] == preferred else self.other
+
+    def column(self, columns: ResultColumns, analysis: Dict):
+        preferred = self.preferred.get(analysis.get('recommended_provider_type', 'both'))
+        if preferred is None:
+            return np.full(columns.count, self.other)
+        return np.where(columns.types == preferred, self.match, self.other)
+
+
+class ResponseTimeFeature(RankingFeature):
+    """Emergency service / response-time tiers for the request's urgency"""
+
+    extractor = 'response_time'
+
+    def __init__(self, name: str, points: float, params: Dict):
+        super().__init__(name, points, params)
+        self.emergency_urgencies = set(params.get('emergency_urgencies', ['high', 'emergency']))
+        self.emergency_value = float(params.get('emergency_service', 1.0))
+        self.default_hours = params.get('default_hours', 24)
+        self.tiers = {
+            urgency: [(limit, float(value)) for limit, value in tiers]
+            for urgency, tiers in params.get('tiers', {}).items()
+        }
+
+    def value(self, result, analysis: Dict) -> float:
+        urgency = analysis.get('urgency', 'medium')
+        if urgency in self.emergency_urgencies and result.get('emergency_service', False):
+            return self.emergency_value
+        tiers = self.tiers.get(urgency)
+        if not tiers:
+            return 0.0
+        response_time = result.get('avg_response_time_hours', self.default_hours)
+        for limit, value in tiers:
+            if response_time <= limit:
+                return value
+        return 0.0
+
+    def column(self, columns: ResultColumns, analysis: Dict):
+        urgency = analysis.get('urgency', 'medium')
+        tiers = self.tiers.get(urgency)
+        if tiers:
+            response_time = columns.numeric('avg_response_time_hours', self.default_hours)
+            values = np.select([response_time <= limit for limit, _ in tiers], [value for _, value in tiers], 0.0)
+        else:
+            values = np.zeros(columns.count)
+        if urgency in self.emergency_urgencies:
+            emergency = np.array(columns.values('emergency_service', False), dtype=bool)
+            values = np.where(emergency, self.emergency_value, values)
+        return values
+
+
+class TrackRecordFeature(RankingFeature):
+    """Review count for companies, experience plus completed orders for workers"""
+
+    extractor = 'track_record'
+
+    def __init__(self, name: str, points: float, params: Dict):
+        super().__init__(name, points, params)
+        self.company_tiers = [(minimum, float(value)) for minimum, value in params.get('company_reviews', [])]
+        self.worker_tiers = [
+            (min_years, min_orders, float(value)) for min_years, min_orders, value in params.get('worker', [])
+        ]
+
+    def value(self, result, analysis: Dict) -> float:
+        if result['type'] == 'Company':
+            total_reviews = result.get('total_reviews', 0)
+            for minimum, value in self.company_tiers:
+                if total_reviews >= minimum:
+                    return value
+        else:  # Individual Worker
+            experience = result.get('experience_years', 0)
+            total_orders = result.get('total_orders', 0)
+            for min_years, min_orders, value in self.worker_tiers:
+                if experience >= min_years and total_orders >= min_orders:
+                    return value
+        return 0.0
+
+    def column(self, columns: ResultColumns, analysis: Dict):
+        # Each column is read only from the rows it applies to
+        reviews = columns.numeric('total_reviews', 0, 'company')
+        experience = columns.numeric('experience_years', 0, 'non_company')
+        orders = columns.numeric('total_orders', 0, 'non_company')
+        company_values = np.select(
+            [reviews >= minimum for minimum, _ in self.company_tiers], [value for _, value in self.company_tiers], 0.0
+        )
+        worker_values = np.select(
+            [(experience >= min_years) & (orders >= min_orders) for min_years, min_orders, _ in self.worker_tiers],
+            [value for _, _, value in self.worker_tiers], 0.0
+        )
+        return np.where(columns.masks['company'], company_values, worker_values)
+
+
+class CertificationFeature(RankingFeature):
+    """Certification level for workers; a flat value for established companies"""
+
+    extractor = 'certification'
+
+    def __init__(self, name: str, points: float, params: Dict):
+        super().__init__(name, points, params)
+        self.levels = {level: float(value) for level, value in params.get('levels', {}).items()}
+        self.company_value = float(params.get('company', 0.0))
+
+    def value(self, result, analysis: Dict) -> float:
+        if result['type'] == 'Individual Worker':
+            return self.levels.get(result.get('certification_level', 'None'), 0.0)
+        return self.company_value
+
+    def column(self, columns: ResultColumns, analysis: Dict):
+        values = np.full(columns.count, self.company_value)
+        value_for = self.levels.get
+        values[columns.masks['worker']] = [
+            value_for(level, 0.0) for level in columns.values('certification_level', 'None', 'worker')
+        ]
+        return values
+
+
+FEATURE_EXTRACTORS = {
+    feature.extractor: feature
+    for feature in (RatingFeature, ProviderTypeFeature, ResponseTimeFeature, TrackRecordFeature, CertificationFeature)
+}
+
+
+# ----------------------------------------------------------------------
+# COMPILED MODEL
+# ----------------------------------------------------------------------
+
+class RankingModel:
+    """Weights and feature extractors compiled into one scoring pass"""
+
+    def __init__(self, features: List[RankingFeature], source: str = 'config'):
+        self.features = features
+        self.source = source
+
+    @classmethod
+    def compile(cls, weights: Dict[str, float], ranking_config: Dict, source: str = 'config') -> "RankingModel":
+        """Build the model; raises ValueError for weights without a usable feature declaration"""
+        total_points = float(ranking_config.get('total_points', 100))
+        declarations = ranking_config.get('features', {})
+        features = []
+        for name, weight in weights.items():
+            declaration = declarations.get(name)
+            if declaration is None:
+                raise ValueError(f"ranking weight '{name}' has no feature declaration")
+            extractor = FEATURE_EXTRACTORS.get(declaration.get('extractor'))
+            if extractor is None:
+                raise ValueError(f"ranking feature '{name}' uses unknown extractor {declaration.get('extractor')!r}")
+            if weight < 0:
+                raise ValueError(f"ranking weight '{name}' is negative")
+            features.append(extractor(name, float(weight) * total_points, declaration))
+        if not features:
+            raise ValueError("ranking model has no weighted features")
+        return cls(features, source)
+
+    def describe(self) -> Dict[str, float]:
+        """Feature -> points, e.g. for logs and the evaluation report"""
+        return {feature.name: feature.points for feature in self.features}
+
+    def score_python(self, results: List[Any], analysis: Dict) -> List[Any]:
+        """Per-row scoring; sets comprehensive_score / scoring_factors in place"""
+        features = [(feature.name, feature.value, feature.points) for feature in self.features]
+        for result in results:
+            score = 0.0
+            factor_sum = 0.0
+            factors = {}
+            for name, value, points in features:
+                score += value(result, analysis) * points
+                # Factors are the score increments, exactly as the running total sees them
+                factor = score - factor_sum
+                factors[name] = factor
+                factor_sum += factor
+            result['comprehensive_score'] = score
+            result['scoring_factors'] = factors
+        return results
+
+    def score_vectorized(self, results: List[Any], analysis: Dict):
+        """Column-wise equivalent of score_python; also returns the score array"""
+        columns = ResultColumns(results)
+        score = np.zeros(columns.count)
+        factor_sum = np.zeros(columns.count)
+        factor_columns = []
+        for feature in self.features:
+            score = score + feature.column(columns, analysis) * feature.points
+            factor = score - factor_sum
+            factor_columns.append(factor.tolist())
+            factor_sum = factor_sum + factor
+
+        # Write back the same per-result fields the per-row path produces
+        names = [feature.name for feature in self.features]
+        for result, total, row_factors in zip(results, score.tolist(), zip(*factor_columns)):
+            factors = dict(zip(names, row_factors))
+            if columns.providers_only:
+                result.comprehensive_score = total
+                result.scoring_factors = factors
+            else:
+                result['comprehensive_score'] = total
+                result['scoring_factors'] = factors
+
+        return results, score
+
+    def rank(self, results: List[Any], analysis: Dict, limit: Optional[int] = None) -> List[Any]:
+        """Score every result and return them best first (only the top `limit` when given)"""
+        if not results:
+            return results
+
+        if np is None or len(results) < VECTORIZE_MIN_RESULTS:
+            self.score_python(results, analysis)
+            # Sort by comprehensive score (descending)
+            ranked = sorted(results, key=lambda x: x.get('comprehensive_score', 0), reverse=True)
+            return ranked if limit is None else ranked[:limit]
+
+        _, score = self.score_vectorized(results, analysis)
+        order = _top_k_indices(score, len(results) if limit is None else max(0, limit))
+        return [results[i] for i in order.tolist()]
+
+
+def _top_k_indices(score, limit: int):
+    """Indices of the `limit` best scores, ordered as a stable descending sort would order them"""
+    count = len(score)
+    if limit <= 0:
+        return np.array([], dtype=np.intp)
+    if limit >= count:
+        return np.argsort(-score, kind='stable')
+
+    partition = np.argpartition(-score, limit - 1)[:limit]
+    threshold = score[partition].min()
+    # Ties at the cut-off keep their original order, exactly like the full stable sort
+    above = np.flatnonzero(score > threshold)
+    tied = np.flatnonzero(score == threshold)[:limit - len(above)]
+    selected = np.concatenate([above, tied])
+    return selected[np.lexsort((selected, -score[selected]))]
+
+
+# ----------------------------------------------------------------------
+# LOADING AND HOT RELOAD
+# ----------------------------------------------------------------------
+
+def _resolve_path(path: Optional[str]) -> Optional[str]:
+    """Relative paths live next to the app, like the other data files"""
+    if not path:
+        return None
+    return path if os.path.isabs(path) else os.path.join(os.path.dirname(os.path.abspath(__file__)), path)
+
+
+def _mtime(path: Optional[str]) -> Optional[float]:
+    try:
+        return os.path.getmtime(path) if path else None
+    except OSError:
+        return None
+
+
+def apply_overrides(weights: Dict[str, float], ranking_config: Dict, overrides: Dict) -> Tuple[Dict, Dict]:
+    """Overlay {"weights": {...}, "features": {name: {param: value}}} onto a declaration"""
+    weights = dict(weights)
+    ranking_config = copy.deepcopy(ranking_config)
+    weights.update(overrides.get('weights', {}))
+    features = ranking_config.setdefault('features', {})
+    for name, params in overrides.get('features', {}).items():
+        features.setdefault(name, {}).update(params)
+    if 'total_points' in overrides:
+        ranking_config['total_points'] = overrides['total_points']
+    return weights, ranking_config
+
+
+def load_model_file(path: str, weights: Optional[Dict] = None, ranking_config: Optional[Dict] = None) -> RankingModel:
+    """Compile the config declaration with a JSON override file applied on top"""
+    with open(path, 'r', encoding='utf-8') as handle:
+        overrides = json.load(handle)
+    weights, ranking_config = apply_overrides(
+        config.SERVICE_SORTING_WEIGHTS if weights is None else weights,
+        config.RANKING_CONFIG if ranking_config is None else ranking_config,
+        overrides
+    )
+    return RankingModel.compile(weights, ranking_config, source=os.path.basename(path))
+
+
+class RankingModelLoader:
+    """Holds the compiled model and recompiles it when the override file changes on disk"""
+
+    def __init__(self):
+        self._model: Optional[RankingModel] = None
+        self._stamp = None
+        self._checked_at = 0.0
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _override_file() -> Optional[str]:
+        return _resolve_path(config.RANKING_CONFIG.get('override_file'))
+
+    def current(self) -> RankingModel:
+        model = self._model
+        interval = config.RANKING_CONFIG.get('reload_check_seconds', 2.0)
+        if model is not None and (interval is None or time.monotonic() - self._checked_at < interval):
+            return model
+
+        with self._lock:
+            if self._model is None or time.monotonic() - self._checked_at >= (interval or 0):
+                stamp = _mtime(self._override_file())
+                if self._model is None or stamp != self._stamp:
+                    self._load(stamp)
+                self._checked_at = time.monotonic()
+            return self._model
+
+    def reload(self) -> RankingModel:
+        """Recompile now (re-reading the override file)"""
+        with self._lock:
+            self._load(_mtime(self._override_file()))
+            self._checked_at = time.monotonic()
+            return self._model
+
+    def _load(self, stamp):
+        try:
+            override_file = self._override_file()
+            if override_file and os.path.exists(override_file):
+                model = load_model_file(override_file)
+            else:
+                model = RankingModel.compile(config.SERVICE_SORTING_WEIGHTS, config.RANKING_CONFIG)
+        except Exception as e:  # a half-saved override must not fail the search that noticed it
+            if self._model is None:
+                raise
+            print(f"⚠️ Ranking model reload failed, keeping the previous model: {e}")
+            # Do not retry the same broken files on every search
+            self._stamp = stamp
+            return
+
+        if self._model is not None:
+            print(f"✅ Ranking model reloaded from {model.source}: {model.describe()}")
+        self._model = model
+        self._stamp = stamp
+
+
+_loader = RankingModelLoader()
+
+
+def get_ranking_model() -> RankingModel:
+    """The current compiled model (recompiled if the override file changed)"""
+    return _loader.current()
+
+
+def reload_ranking_model() -> RankingModel:
+    return _loader.reload()
+
+
+def score_providers_python(results: List[Any], analysis: Dict, model: Optional[RankingModel] = None) -> List[Any]:
+    """Per-row scoring with the current (or given) model"""
+    return (model or get_ranking_model()).score_python(results, analysis)
+
+
+def score_providers_vectorized(results: List[Any], analysis: Dict, model: Optional[RankingModel] = None):
+    """Column-wise scoring with the current (or given) model; returns (results, scores)"""
+    return (model or get_ranking_model()).score_vectorized(results, analysis)
+
+
+def rank_providers(results: List[Any], analysis: Dict, limit: Optional[int] = None,
+                   model: Optional[RankingModel] = None) -> List[Any]:
+    """Score every result and return them best first (only the top `limit` when given)"""
+    if not results:
+        return results
+    return (model or get_ranking_model()).rank(results, analysis, limit)
+
+
+# ----------------------------------------------------------------------
+# QUERY LOG (input for ranking_evaluation.py)
+# ----------------------------------------------------------------------
+
+_log_lock = threading.Lock()
+
+# Scores are recomputed on replay; only the inputs are logged
+_UNLOGGED_FIELDS = ('comprehensive_score', 'scoring_factors')
+
+
+def _json_value(value):
+    if isinstance(value, Decimal):
+        return float(value)
+    if isinstance(value, (datetime, date)):
+        return value.isoformat()
+    return str(value)
+
+
+def log_ranking_query(user_query: str, analysis: Dict, ranked: List[Any], shown: int = 20):
+    """Append one search (query, analysis, candidates, shown order) to RANKING_CONFIG['query_log']"""
+    path = _resolve_path(config.RANKING_CONFIG.get('query_log'))
+    if not path or not ranked:
+        return
+
+    entry = {
+        'logged_at': datetime.now().isoformat(timespec='seconds'),
+        'query': user_query,
+        'analysis': {
+            'urgency': analysis.get('urgency', 'medium'),
+            'recommended_provider_type': analysis.get('recommended_provider_type', 'both'),
+        },
+        'model': get_ranking_model().describe(),
+        'shown': [provider_key(result) for result in ranked[:shown]],
+        'candidates': [
+            {key: value for key, value in result.items() if key not in _UNLOGGED_FIELDS}
+            for result in ranked
+        ],
+    }
+    try:
+        line = json.dumps(entry, default=_json_value)
+        with _log_lock, open(path, 'a', encoding='utf-8') as handle:
+            handle.write(line + '\n')
+    except (OSError, TypeError, ValueError) as e:
+        print(f"Warning: could not log ranking query: {e}")
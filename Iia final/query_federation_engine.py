@@ -211,11 +211,16 @@
 from __future__ import annotations
 
 import json
+import threading
+import time
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Any, Callable, Dict, List, Optional
 
+from config import CACHE_CONFIG
 from distributed_database_manager import DistributedDatabaseManager
 from distributed_llm_service import DistributedLLMService
+from provider_scoring import log_ranking_query
+from result_cache import TTLResultCache
 
 
 class PromptRewriteEngine:
@@ -308,6 +313,110 @@ class ResearchCatalog:
         return matches[:5]
 
 
+class SearchRun:
+    """
+    Memoized stages of one federated search.
+
+    Every stage (LLM analysis, rewrite, plan, federated fetch + dedup, scoring,
+    integration, recommendation) is computed on first access and then reused,
+    so the GUI and the sorting-service reports built from the same run hit
+    each database node and the LLM at most once.
+    """
+
+    def __init__(self, engine: "QueryFederationEngine", user_query: str,
+                 search_preference: str = "both", data_version: int = 0):
+        self.engine = engine
+        self.user_query = user_query
+        self.search_preference = search_preference
+        self.data_version = data_version
+        self.stage_timings: Dict[str, float] = {}  # stage -> seconds
+        self._stages: Dict[str, Any] = {}
+        self._stage_locks: Dict[str, threading.Lock] = {}
+        self._lock = threading.Lock()
+
+    def _stage(self, name: str, compute: Callable[[], Any]) -> Any:
+        if name in self._stages:
+            return self._stages[name]
+        with self._lock:
+            stage_lock = self._stage_locks.setdefault(name, threading.Lock())
+        # Callers asking for a stage that is still running wait for it instead of recomputing.
+        # Locks are per stage so a slow LLM stage never blocks reads of finished ones.
+        with stage_lock:
+            if name not in self._stages:
+                started = time.perf_counter()
+                self._stages[name] = compute()
+                self.stage_timings[name] = time.perf_counter() - started
+        return self._stages[name]
+
+    @property
+    def partial(self) -> bool:
+        """True once the federated fetch came back without every node"""
+        return bool((self._stages.get("federated_fetch") or {}).get("partial_result"))
+
+    def analysis(self) -> Dict[str, Any]:
+        return self._stage("analysis", lambda: self.engine.llm_service.analyze_distributed_service_request(
+            self.user_query, self.search_preference
+        ))
+
+    def rewritten(self) -> Dict[str, Any]:
+        return self._stage("rewrite", lambda: self.engine.prompt_rewriter.rewrite(
+            self.user_query, self.analysis()
+        ))
+
+    def plan(self) -> Dict[str, Any]:
+        return self._stage("plan", lambda: self.engine._build_federated_plan(  # pylint: disable=protected-access
+            self.analysis(), self.rewritten()
+        ))
+
+    def search_results(self) -> Dict[str, Any]:
+        """Raw federated view from both nodes (already de-duplicated by the DB manager)"""
+        return self._stage("federated_fetch", lambda: self.engine.db_manager.get_cross_laptop_results(
+            self.plan()["service_focus"], self.plan().get("region")
+        ))
+
+    def sorted_results(self) -> List[Dict[str, Any]]:
+        def compute():
+            combined = self.search_results().get("combined_results", []) or []
+            if not combined:
+                return []
+            # Sort a copy so combined_results keeps the DB order for "standard" views
+            ranked = self.engine.sorting_service._apply_intelligent_sorting(  # pylint: disable=protected-access
+                list(combined), self.analysis()
+            )
+            # No-op unless RANKING_CONFIG['query_log'] is set
+            log_ranking_query(self.user_query, self.analysis(), ranked)
+            return ranked
+        return self._stage("scoring", compute)
+
+    def integration_summary(self) -> Dict[str, Any]:
+        return self._stage("integration", lambda: self.engine._integrate_results(  # pylint: disable=protected-access
+            self.sorted_results(), self.search_results(), self.plan(), self.search_results()
+        ))
+
+    def research_highlights(self) -> List[Dict[str, Any]]:
+        return self._stage("research", lambda: self.engine.research_catalog.match(
+            self.plan()["service_focus"]
+        ))
+
+    def recommendation(self) -> Dict[str, Any]:
+        """Provider-type advice derived from the analysis (no extra LLM round trip)"""
+        def compute():
+            analysis = self.analysis()
+            return {
+                "recommended_type": analysis.get("recommended_provider_type", "both"),
+                "confidence": float(analysis.get("confidence_score", 0.0) or 0.0),
+                "reasoning": analysis.get("reasoning", ""),
+            }
+        return self._stage("recommendation", compute)
+
+    def cross_analysis(self) -> Dict[str, Any]:
+        return self._stage("cross_analysis", lambda: self.engine.llm_service.analyze_cross_database_results(
+            self.search_results().get("companies", []),
+            self.search_results().get("employees", []),
+            self.user_query,
+        ))
+
+
 class QueryFederationEngine:
     """Coordinates prompt rewriting, distributed querying, and result integration."""
 
@@ -323,9 +432,28 @@ class QueryFederationEngine:
         self.prompt_rewriter = PromptRewriteEngine()
         self.research_catalog = ResearchCatalog()
 
+        # Recent runs, so every consumer of the same query shares one set of stages
+        self._runs = TTLResultCache(
+            max_entries=32, ttl_seconds=CACHE_CONFIG.get("ttl_seconds", 60)
+        )
+        self._runs_lock = threading.Lock()
+
     # --------------------------------------------------------------------- #
     # PUBLIC API
     # --------------------------------------------------------------------- #
+    def get_search_run(self, user_query: str, search_preference: str = "both") -> SearchRun:
+        """Return the memoized run for this query, starting a new one if needed"""
+        key = (" ".join(user_query.lower().split()), search_preference)
+        data_version = getattr(self.db_manager, "data_version", 0)
+        with self._runs_lock:
+            run = self._runs.get(key)
+            # A write since the run started (new order, feedback...) makes it stale, and a
+            # partial fetch is never reused: the slow node may answer for the next caller
+            if run is None or run.data_version != data_version or run.partial:
+                run = SearchRun(self, user_query, search_preference, data_version)
+                self._runs.set(key, run)
+        return run
+
     def run_federated_search(self, user_query: str, limit: int = 10) -> Dict[str, Any]:
         """
         End-to-end federated search:
@@ -335,40 +463,22 @@ class QueryFederationEngine:
         - intelligent sorting
         - integration summary
         """
-        # 1) Analyze the request
-        analysis = self.llm_service.analyze_distributed_service_request(
-            user_query, "both"
-        )
+        run = self.get_search_run(user_query)
 
-        # 2) Rewrite the prompt into a structured representation
-        rewritten = self.prompt_rewriter.rewrite(user_query, analysis)
-
-        # 3) Build a federated plan (for introspection / debugging)
-        plan = self._build_federated_plan(analysis, rewritten)
-
-        # 4) Hit both databases via the distributed DB manager
-        search_results = self.db_manager.get_cross_laptop_results(
-            plan["service_focus"], plan.get("region")
-        )  # -> {companies, employees, combined_results, counts...}
-
-        combined = search_results.get("combined_results", []) or []
+        # 1-4) Analysis, rewrite, plan and the federated fetch all happen once per run
+        analysis = run.analysis()
+        rewritten = run.rewritten()
+        plan = run.plan()
+        search_results = run.search_results()  # -> {companies, employees, combined_results, counts...}
 
         # 5) Apply intelligent sorting over the normalized combined results
-        if combined:
-            sorted_results = self.sorting_service._apply_intelligent_sorting(  # pylint: disable=protected-access
-                combined,
-                analysis,
-            )
-        else:
-            sorted_results = []
+        sorted_results = run.sorted_results()
 
         # 6) Integrate results into a compact summary
-        integration_summary = self._integrate_results(
-            sorted_results, search_results, plan, search_results
-        )
+        integration_summary = run.integration_summary()
 
         # 7) Optional: attach external research highlights
-        research_highlights = self.research_catalog.match(plan["service_focus"])
+        research_highlights = run.research_highlights()
 
         # 8) Derive some cheap meta-signals for the UI
         coverage = integration_summary.get("coverage", {})
@@ -395,10 +505,10 @@ class QueryFederationEngine:
             # raw DB view (includes companies/employees counts)
             "search_results": search_results,
             # sorted, normalized providers: this is what the GUI should render
-            "sorted_results": sorted_results,
+            "sorted_results": list(sorted_results),
             # deprecated / backward-compat aliases
             "results": sorted_results[:limit],
-            "combined_results": sorted_results,
+            "combined_results": list(sorted_results),
             # summaries & meta
             "integration_summary": integration_summary,
             "search_coverage": coverage,
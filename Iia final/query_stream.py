@@ -0,0 +1,84 @@
+"""
+Row factories for streamed query results.
+
+DistributedDatabaseManager.iter_query reads rows through an unbuffered cursor
+in fetchmany batches; the factories here turn each raw value tuple into the
+row shape the caller asked for without building a dict per row first:
+
+- 'dict'   : plain dicts, same as execute_query
+- 'tuple'  : the raw value tuples (smallest, positional access only)
+- 'record' : __slots__ objects that also answer row['col'] / row.get('col'),
+             so code written against dict rows keeps working
+"""
+
+import keyword
+from functools import lru_cache
+from typing import Any, Callable, Dict, Sequence, Tuple
+
+ROW_TYPES = ('dict', 'tuple', 'record')
+
+
+class RowRecord:
+    """Base of the generated __slots__ row classes; dict-style read access"""
+
+    __slots__ = ()
+    _fields: Tuple[str, ...] = ()
+
+    def __getitem__(self, key: str) -> Any:
+        if key not in self._fields:
+            raise KeyError(key)
+        return getattr(self, key)
+
+    def get(self, key: str, default: Any = None) -> Any:
+        return getattr(self, key) if key in self._fields else default
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._fields
+
+    def keys(self) -> Tuple[str, ...]:
+        return self._fields
+
+    def to_dict(self) -> Dict[str, Any]:
+        return {name: getattr(self, name) for name in self._fields}
+
+    def __repr__(self) -> str:
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+def _slot_safe(columns: Tuple[str, ...]) -> bool:
+    reserved = set(dir(RowRecord))
+    return (
+        len(set(columns)) == len(columns)
+        and all(name.isidentifier() and not keyword.iskeyword(name) for name in columns)
+        and not reserved.intersection(columns)
+    )
+
+
+@lru_cache(maxsize=128)
+def make_record_type(columns: Tuple[str, ...]):
+    """__slots__ row class for one column list (cached, queries repeat their shape)"""
+    record_type = type('Row', (RowRecord,), {'__slots__': columns, '_fields': columns})
+    setters = [getattr(record_type, name).__set__ for name in columns]
+
+    def make(values: Sequence[Any]) -> RowRecord:
+        row = record_type.__new__(record_type)
+        for setter, value in zip(setters, values):
+            setter(row, value)
+        return row
+
+    return make
+
+
+def row_factory(columns: Sequence[str], row_type: str = 'dict') -> Callable[[Sequence[Any]], Any]:
+    """Converter from a raw value tuple to the requested row shape"""
+    if row_type not in ROW_TYPES:
+        raise ValueError(f"row_type must be one of {ROW_TYPES}, got {row_type!r}")
+
+    columns = tuple(columns)
+    if row_type == 'tuple':
+        return tuple
+    # Aliases like COUNT(*) cannot be slots; such queries fall back to dict rows
+    if row_type == 'record' and _slot_safe(columns):
+        return make_record_type(columns)
+    return lambda values: dict(zip(columns, values))
@@ -0,0 +1,162 @@
+#!/usr/bin/env python3
+"""
+Offline evaluation of the provider ranking model
+
+Replays searches recorded with RANKING_CONFIG['query_log'] (one JSON line per
+search: query, analysis, candidates and the order that was shown) through the
+ranking model from config and, optionally, a candidate model file in the same
+format as RANKING_CONFIG['override_file']. For each model it reports:
+
+  * ranking quality, for entries that carry relevance labels: NDCG@k, MRR
+    and precision@k. Labels are a "relevant" field added to a log line,
+    either a list of provider keys ("Company:12", "Individual Worker:7") or a
+    {key: grade} mapping, e.g. filled in from the providers that were booked;
+  * agreement with what users were shown (overlap@k with the logged order);
+  * scoring time per query (mean / p95) and per result.
+
+    python ranking_evaluation.py --log ranking_queries.jsonl
+    python ranking_evaluation.py --log ranking_queries.jsonl --model ranking_candidate.json --k 10
+"""
+
+import argparse
+import json
+import math
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.abspath(__file__)))
+
+import config
+from provider_record import Provider
+from provider_scoring import RankingModel, load_model_file, provider_key
+
+
+def load_log(path: str):
+    entries = []
+    with open(path, 'r', encoding='utf-8') as handle:
+        for line_number, line in enumerate(handle, 1):
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                print(f"Warning: skipping unreadable log line {line_number}")
+    return entries
+
+
+def relevance_grades(entry) -> dict:
+    labels = entry.get('relevant') or {}
+    if isinstance(labels, list):
+        return {key: 1.0 for key in labels}
+    return {key: float(grade) for key, grade in labels.items()}
+
+
+def dcg(gains) -> float:
+    return sum(gain / math.log2(position + 2) for position, gain in enumerate(gains))
+
+
+def ndcg_at(ranked_keys, grades: dict, k: int) -> float:
+    ideal = dcg(sorted(grades.values(), reverse=True)[:k])
+    return dcg([grades.get(key, 0.0) for key in ranked_keys[:k]]) / ideal if ideal else 0.0
+
+
+def reciprocal_rank(ranked_keys, grades: dict) -> float:
+    for position, key in enumerate(ranked_keys, 1):
+        if grades.get(key, 0.0) > 0:
+            return 1.0 / position
+    return 0.0
+
+
+def precision_at(ranked_keys, grades: dict, k: int) -> float:
+    top = ranked_keys[:k]
+    return sum(1 for key in top if grades.get(key, 0.0) > 0) / len(top) if top else 0.0
+
+
+def overlap_at(ranked_keys, shown_keys, k: int) -> float:
+    shown = set(shown_keys[:k])
+    return len(shown.intersection(ranked_keys[:k])) / len(shown) if shown else 0.0
+
+
+def replay(model: RankingModel, entries, k: int, repeat: int) -> dict:
+    metrics = {'ndcg': [], 'mrr': [], 'precision': [], 'overlap': [], 'query_ms': [], 'results': 0}
+    for entry in entries:
+        candidates = [Provider(**row) for row in entry.get('candidates', [])]
+        if not candidates:
+            continue
+        analysis = entry.get('analysis', {})
+
+        # Best of `repeat` runs keeps one-off pauses out of the timing
+        best = None
+        for _ in range(max(1, repeat)):
+            started = time.perf_counter()
+            ranked = model.rank(list(candidates), analysis)
+            elapsed = time.perf_counter() - started
+            best = elapsed if best is None else min(best, elapsed)
+        metrics['query_ms'].append(best * 1000)
+        metrics['results'] += len(candidates)
+
+        ranked_keys = [provider_key(result) for result in ranked]
+        if entry.get('shown'):
+            metrics['overlap'].append(overlap_at(ranked_keys, entry['shown'], k))
+        grades = relevance_grades(entry)
+        if grades:
+            metrics['ndcg'].append(ndcg_at(ranked_keys, grades, k))
+            metrics['mrr'].append(reciprocal_rank(ranked_keys, grades))
+            metrics['precision'].append(precision_at(ranked_keys, grades, k))
+    return metrics
+
+
+def summarize(label: str, metrics: dict, k: int):
+    def mean(values):
+        return f"{statistics.fmean(values):.4f}" if values else "-"
+
+    times = sorted(metrics['query_ms'])
+    p95 = times[min(len(times) - 1, int(0.95 * len(times)))] if times else 0.0
+    per_result_us = sum(times) * 1000 / metrics['results'] if metrics['results'] else 0.0
+    print(f"\n{label}")
+    print(f"  queries replayed   {len(times):>10}   labelled {len(metrics['ndcg'])}")
+    print(f"  NDCG@{k:<13}{mean(metrics['ndcg']):>10}")
+    print(f"  MRR                {mean(metrics['mrr']):>10}")
+    print(f"  precision@{k:<8}{mean(metrics['precision']):>10}")
+    print(f"  overlap@{k} w/ shown{mean(metrics['overlap']):>9}")
+    print(f"  ms/query mean      {statistics.fmean(times) if times else 0.0:>10.3f}   p95 {p95:.3f}")
+    print(f"  us/result          {per_result_us:>10.2f}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--log', default=config.RANKING_CONFIG.get('query_log') or 'ranking_queries.jsonl',
+                        help='JSON-lines query log written by the app')
+    parser.add_argument('--model', help='candidate model overrides (JSON) to compare with the config model')
+    parser.add_argument('--k', type=int, default=10, help='cut-off for NDCG / precision / overlap')
+    parser.add_argument('--repeat', type=int, default=3, help='timing runs per query (best is kept)')
+    args = parser.parse_args()
+
+    if not os.path.exists(args.log):
+        print(f"❌ Query log not found: {args.log} (set RANKING_CONFIG['query_log'] to record searches)")
+        return
+
+    entries = load_log(args.log)
+    print("=" * 60)
+    print(f"Ranking evaluation: {len(entries)} logged queries from {args.log}")
+    print("=" * 60)
+
+    models = [('config model', RankingModel.compile(config.SERVICE_SORTING_WEIGHTS, config.RANKING_CONFIG))]
+    if args.model:
+        try:
+            models.append((f"candidate ({args.model})", load_model_file(args.model)))
+        except (OSError, ValueError, TypeError, KeyError) as e:
+            print(f"❌ Could not load candidate model: {e}")
+            return
+
+    for label, model in models:
+        print(f"\n{label}: {model.describe()}")
+    for label, model in models:
+        summarize(label, replay(model, entries, args.k, args.repeat), args.k)
+
+
+if __name__ == "__main__":
+    main()
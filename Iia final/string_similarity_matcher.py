@@ -1,12 +1,567 @@
 """
 String Similarity and Deduplication Matcher using Jaro-Winkler-like approach.
 Uses difflib.SequenceMatcher for similarity matching and deduplication across federated databases.
+
+Names are compared through a cached canonical key (lowercase, punctuation and
+legal suffixes such as "LLC" / "Co." / "Services" removed, tokens sorted).
+
+Pair search is driven by a CandidateIndex (prefix-filtered inverted index over
+character multisets) so only plausible pairs are scored; the filter is exact for
+the SequenceMatcher ratio, so no pair above the threshold is ever skipped.
+CharacterCountIndex applies the same bound exhaustively (with NumPy) when a
+few changed names are probed against a large stored set.
+
+Large pair searches can be spread over a process pool (workers=N): every
+worker gets the (id, normalized name) tuples once, builds the same index and
+scores a block of probes; the pairs are merged back in serial order.
+
+Scores come from a pluggable SimilarityScorer. The default keeps the
+SequenceMatcher ratio (the thresholds and candidate indexes are built on it)
+but rejects pairs on the exact 2 * LCS / (len1 + len2) bound first, computed
+by rapidfuzz when it is installed and by a bit-parallel kernel otherwise;
+the backend is chosen at import time.
 """
 
 import difflib
-from typing import Dict, List, Tuple, Any
+import math
+import os
+import re
+from collections import Counter, defaultdict
+from concurrent.futures import ProcessPoolExecutor
+from functools import lru_cache
+from typing import Dict, List, Optional, Sequence, Tuple, Any
 from decimal import Decimal
 
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; CharacterCountIndex falls back to a CandidateIndex
+    np = None
+
+try:
+    from rapidfuzz.distance import Indel as _rapidfuzz_indel, JaroWinkler as _rapidfuzz_jaro_winkler
+except ImportError:  # rapidfuzz is optional; the scorers fall back to pure-Python kernels
+    _rapidfuzz_indel = _rapidfuzz_jaro_winkler = None
+
+
+# Tokens that describe the legal form / generic business kind rather than the provider itself
+LEGAL_SUFFIXES = frozenset({
+    "llc", "inc", "incorporated", "ltd", "limited", "co", "corp", "corporation",
+    "company", "plc", "group", "service", "services", "solutions",
+})
+
+# Maximum number of distinct provider names whose canonical key is kept in memory
+CANONICAL_CACHE_SIZE = 8192
+
+_APOSTROPHES = re.compile(r"['\u2019`]")
+_PUNCTUATION = re.compile(r"[^\w\s]|_")
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def _canonical_key(name: str) -> str:
+    lowered = _APOSTROPHES.sub("", name.lower())
+    tokens = _PUNCTUATION.sub(" ", lowered).split()
+    # Names made only of suffix words ("Services") keep them rather than becoming blank
+    core = [token for token in tokens if token not in LEGAL_SUFFIXES] or tokens
+    return " ".join(sorted(core))
+
+
+@lru_cache(maxsize=CANONICAL_CACHE_SIZE)
+def _lcs_masks(text: str) -> Dict[str, int]:
+    """Bit mask of the positions of each character, for _lcs_length (shared: do not modify)"""
+    masks = {}
+    for position, char in enumerate(text):
+        masks[char] = masks.get(char, 0) | (1 << position)
+    return masks
+
+
+def _lcs_length(masks: Dict[str, int], length: int, other: str) -> int:
+    """Longest common subsequence of the masked text (of `length`) and `other` (Hyyro's bit-vector LCS)"""
+    lookup = masks.get
+    vector = (1 << length) - 1
+    for char in other:
+        match = vector & lookup(char, 0)
+        # Carries past bit `length` never reach the low bits, so they are masked off once at the end
+        vector = (vector + match) | (vector - match)
+    # Each zero bit of the low `length` bits is one character of the LCS
+    return length - bin(vector & ((1 << length) - 1)).count("1")
+
+
+def _jaro_winkler(s1: str, s2: str, min_score: float = 0.0, prefix_scale: float = 0.1) -> float:
+    """
+    Jaro-Winkler similarity of two non-empty normalized strings; the prefix
+    boost applies above a Jaro score of 0.7, as in Winkler's definition.
+
+    Returns 0.0 early when the length bound or the running match count
+    shows the pair cannot reach `min_score`.
+    """
+    if s1 == s2:
+        return 1.0
+
+    len1, len2 = len(s1), len(s2)
+    if len1 > len2:
+        s1, s2, len1, len2 = s2, s1, len2, len1
+
+    # Fewest matches that could still reach min_score (with no transpositions and the full prefix boost)
+    required = 0
+    if min_score > 0.0 and 4 * prefix_scale < 1.0:
+        jaro_needed = (min_score - 4 * prefix_scale) / (1.0 - 4 * prefix_scale)
+        required = math.ceil((3.0 * jaro_needed - 1.0) / (1.0 / len1 + 1.0 / len2) - 1e-9)
+        # Length-bound pruning: even if every char of the shorter string matched
+        if required > len1:
+            return 0.0
+
+    positions = defaultdict(list)
+    for j, char in enumerate(s2):
+        positions[char].append(j)
+
+    window = max(0, len2 // 2 - 1)
+    s2_flags = [False] * len2
+    s1_matched = []
+    for i, char in enumerate(s1):
+        for j in positions.get(char, ()):
+            if j > i + window:
+                break
+            if j >= i - window and not s2_flags[j]:
+                s2_flags[j] = True
+                s1_matched.append(char)
+                break
+        else:
+            # No match for this char: exit early once the remaining characters cannot lift the score enough
+            if len(s1_matched) + len1 - i - 1 < required:
+                return 0.0
+
+    matches = len(s1_matched)
+    if matches == 0:
+        return 0.0
+
+    s2_matched = [s2[j] for j in range(len2) if s2_flags[j]]
+    transpositions = sum(a != b for a, b in zip(s1_matched, s2_matched)) // 2
+
+    jaro = (matches / len1 + matches / len2 + (matches - transpositions) / matches) / 3.0
+    if jaro <= 0.7:
+        return jaro if jaro >= min_score else 0.0
+
+    prefix = 0
+    for a, b in zip(s1[:4], s2[:4]):
+        if a != b:
+            break
+        prefix += 1
+
+    similarity = jaro + prefix * prefix_scale * (1.0 - jaro)
+    return similarity if similarity >= min_score else 0.0
+
+
+class SimilarityScorer:
+    """
+    Similarity of two normalized names between 0.0 and 1.0.
+
+    score() may return 0.0 for any pair below min_score (that is what lets a
+    scorer stop early); score_many() scores one query against many candidates.
+    ratio_bounded tells whether the SequenceMatcher bounds of the candidate
+    indexes hold for the scores, i.e. whether index-driven pair searches are exact.
+    """
+
+    name = ""
+    backend = "python"
+    ratio_bounded = False
+
+    def score(self, s1: str, s2: str, min_score: float = 0.0) -> float:
+        raise NotImplementedError
+
+    def score_many(self, query: str, candidates: Sequence[str], min_score: float = 0.0,
+                   query_first: bool = False) -> List[float]:
+        """Scores of `query` against every candidate; query_first puts the query on the left"""
+        if query_first:
+            return [self.score(query, candidate, min_score) for candidate in candidates]
+        return [self.score(candidate, query, min_score) for candidate in candidates]
+
+
+class SequenceMatcherScorer(SimilarityScorer):
+    """
+    difflib.SequenceMatcher ratio, the metric of the duplicate thresholds.
+
+    The matching blocks of SequenceMatcher form a common subsequence, so
+    ratio <= 2 * LCS / (len1 + len2). Below min_score, pairs are rejected on
+    that bound (rapidfuzz's Indel distance, or a bit-parallel kernel) before
+    the far slower ratio() runs; scores and decisions are unchanged.
+    backend='difflib' skips the bound and only uses SequenceMatcher's own
+    quick ratios (the reference implementation).
+    """
+
+    name = "sequence"
+    ratio_bounded = True
+
+    def __init__(self, backend: Optional[str] = None):
+        if backend is None:
+            backend = "rapidfuzz" if _rapidfuzz_indel is not None else "python"
+        if backend not in ("rapidfuzz", "python", "difflib"):
+            raise ValueError(f"Unknown SequenceMatcherScorer backend: {backend}")
+        if backend == "rapidfuzz" and _rapidfuzz_indel is None:
+            raise ImportError("rapidfuzz is not installed")
+        self.backend = backend
+
+    def _below(self, s1: str, s2: str, min_score: float) -> bool:
+        """True if the LCS bound already shows ratio() < min_score"""
+        total = len(s1) + len(s2)
+        if 2.0 * min(len(s1), len(s2)) / total < min_score:
+            return True
+        if self.backend == "rapidfuzz":
+            # Indel distance = len1 + len2 - 2 * LCS
+            return (total - _rapidfuzz_indel.distance(s1, s2)) / total < min_score
+        if len(s1) > len(s2):
+            s1, s2 = s2, s1
+        return 2.0 * _lcs_length(_lcs_masks(s1), len(s1), s2) / total < min_score
+
+    def score(self, s1: str, s2: str, min_score: float = 0.0) -> float:
+        if not s1 or not s2:
+            return 0.0
+        # Quick check for exact match
+        if s1 == s2:
+            return 1.0
+
+        if self.backend != "difflib":
+            if min_score > 0.0 and self._below(s1, s2, min_score):
+                return 0.0
+            return difflib.SequenceMatcher(None, s1, s2).ratio()
+
+        matcher = difflib.SequenceMatcher(None, s1, s2)
+        if min_score > 0.0 and (
+            matcher.real_quick_ratio() < min_score or matcher.quick_ratio() < min_score
+        ):
+            return 0.0
+        return matcher.ratio()
+
+    def score_many(self, query: str, candidates: Sequence[str], min_score: float = 0.0,
+                   query_first: bool = False) -> List[float]:
+        """
+        As score() for each candidate; the query's bit masks and, as the second
+        sequence, SequenceMatcher's lookup table are built once.
+        """
+        if not query:
+            return [0.0] * len(candidates)
+        matcher = difflib.SequenceMatcher(None)
+        if not query_first:
+            matcher.set_seq2(query)
+        masks = _lcs_masks(query) if self.backend == "python" else None
+        scores = []
+        for candidate in candidates:
+            if not candidate:
+                scores.append(0.0)
+                continue
+            if query == candidate:
+                scores.append(1.0)
+                continue
+
+            if min_score > 0.0 and self.backend != "difflib":
+                total = len(query) + len(candidate)
+                if self.backend == "rapidfuzz":
+                    common = total - _rapidfuzz_indel.distance(query, candidate)
+                else:
+                    common = 2 * _lcs_length(masks, len(query), candidate)
+                if common / total < min_score:
+                    scores.append(0.0)
+                    continue
+
+            if query_first:
+                matcher.set_seqs(query, candidate)
+            else:
+                matcher.set_seq1(candidate)
+            if self.backend == "difflib" and min_score > 0.0 and (
+                matcher.real_quick_ratio() < min_score or matcher.quick_ratio() < min_score
+            ):
+                scores.append(0.0)
+            else:
+                scores.append(matcher.ratio())
+        return scores
+
+
+class JaroWinklerScorer(SimilarityScorer):
+    """
+    Jaro-Winkler similarity: rapidfuzz when installed, otherwise the pure-Python
+    version with early termination and length-bound pruning.
+
+    A different metric from the SequenceMatcher ratio (typically higher on
+    names sharing a prefix), so the duplicate thresholds do not carry over and
+    index-driven pair searches compare every pair under it.
+    """
+
+    name = "jaro_winkler"
+
+    def __init__(self, backend: Optional[str] = None, prefix_scale: float = 0.1):
+        if backend is None:
+            backend = "rapidfuzz" if _rapidfuzz_jaro_winkler is not None else "python"
+        if backend not in ("rapidfuzz", "python"):
+            raise ValueError(f"Unknown JaroWinklerScorer backend: {backend}")
+        if backend == "rapidfuzz" and _rapidfuzz_jaro_winkler is None:
+            raise ImportError("rapidfuzz is not installed")
+        self.backend = backend
+        self.prefix_scale = prefix_scale
+
+    def score(self, s1: str, s2: str, min_score: float = 0.0) -> float:
+        if not s1 or not s2:
+            return 0.0
+        if self.backend == "rapidfuzz":
+            return _rapidfuzz_jaro_winkler.normalized_similarity(
+                s1, s2, prefix_weight=self.prefix_scale, score_cutoff=min_score or None
+            )
+        return _jaro_winkler(s1, s2, min_score, self.prefix_scale)
+
+
+# Backends picked at import time: rapidfuzz when installed, pure Python otherwise
+SCORERS = {
+    "sequence": SequenceMatcherScorer(),
+    "jaro_winkler": JaroWinklerScorer(),
+}
+
+
+class CandidateIndex:
+    """
+    Candidate generation for similarity joins over provider names.
+
+    Every name is turned into the set of its (character, occurrence) tokens.
+    SequenceMatcher.ratio() can never exceed 2 * overlap / (len1 + len2) of
+    those multisets, so two names can only reach `threshold` if:
+      - their lengths are within a factor of threshold / (2 - threshold), and
+      - they share a token within the first `len - ceil(threshold * len / (2 - threshold)) + 1`
+        tokens of each name (tokens ordered rarest first) -- the prefix filter.
+    Only the prefix tokens are indexed, so rare characters drive the lookups.
+    """
+
+    _EPSILON = 1e-9
+
+    def __init__(self, threshold: float, token_frequencies: Counter):
+        self.threshold = threshold
+        self.token_frequencies = token_frequencies
+        self._postings = defaultdict(list)  # token -> [(record_id, length)]
+
+    @staticmethod
+    def tokenize(normalized: str) -> List[Tuple[str, int]]:
+        seen = Counter()
+        tokens = []
+        for char in normalized:
+            seen[char] += 1
+            tokens.append((char, seen[char]))
+        return tokens
+
+    @classmethod
+    def count_tokens(cls, normalized_names: Sequence[str]) -> Counter:
+        frequencies = Counter()
+        for name in normalized_names:
+            frequencies.update(cls.tokenize(name))
+        return frequencies
+
+    def length_bounds(self, length: int) -> Tuple[float, float]:
+        """Range of partner lengths that can still reach the threshold"""
+        factor = self.threshold / (2.0 - self.threshold)
+        return length * factor - self._EPSILON, length / factor + self._EPSILON
+
+    def prefix(self, normalized: str) -> List[Tuple[str, int]]:
+        tokens = self.tokenize(normalized)
+        tokens.sort(key=lambda token: (self.token_frequencies[token], token))
+        required_overlap = math.ceil(
+            self.threshold * len(tokens) / (2.0 - self.threshold) - self._EPSILON
+        )
+        return tokens[:max(1, len(tokens) - required_overlap + 1)]
+
+    def add(self, record_id: int, normalized: str):
+        length = len(normalized)
+        for token in self.prefix(normalized):
+            self._postings[token].append((record_id, length))
+
+    def candidates(self, normalized: str) -> set:
+        """Record ids that share a prefix token and pass the length filter"""
+        low, high = self.length_bounds(len(normalized))
+        found = set()
+        for token in self.prefix(normalized):
+            for record_id, length in self._postings.get(token, ()):
+                if low <= length <= high:
+                    found.add(record_id)
+        return found
+
+
+class CharacterCountIndex:
+    """
+    Candidate lookup for probing a few names against many stored ones.
+
+    SequenceMatcher.ratio() <= quick_ratio() = 2 * (shared characters) / (len1 + len2).
+    The stored names are kept sorted by length as one count array per character
+    class, so a probe takes the length window as a slice and evaluates that bound
+    for every stored name in a handful of vector operations. Characters other
+    than a-z, 0-9 and space share one class, which only loosens the bound.
+
+    The matching blocks of SequenceMatcher form a common subsequence, so
+    ratio() <= 2 * LCS / (len1 + len2) as well. That much tighter bound is then
+    computed for the remaining names at once (bit-parallel LCS, one 64-bit word
+    per name), leaving few pairs for the real ratio.
+
+    Without NumPy the same lookups go through CandidateIndex (built per threshold).
+    """
+
+    _CLASSES = 38  # a-z, 0-9, space, everything else
+    _EPSILON = 1e-9
+    _LCS_MAX_LENGTH = 63  # probe length that fits the bit-parallel LCS word
+
+    def __init__(self, normalized_names: Sequence[str], keys: Sequence[Any]):
+        pairs = sorted(zip(normalized_names, keys), key=lambda pair: len(pair[0]))
+        self.names = [name for name, _ in pairs]
+        self.keys = [key for _, key in pairs]
+        self._fallback = {}
+        if np is None:
+            return
+
+        self.lengths = np.fromiter((len(name) for name in self.names), dtype=np.int64, count=len(self.names))
+        self.offsets = np.cumsum(self.lengths) - self.lengths
+        self.code_points = np.frombuffer("".join(self.names).encode("utf-32-le"), dtype=np.uint32)
+        codes = self._classes(self.code_points)
+        rows = np.repeat(np.arange(len(self.names)), self.lengths)
+        self.counts = np.bincount(
+            codes * len(self.names) + rows, minlength=self._CLASSES * len(self.names)
+        ).reshape(self._CLASSES, len(self.names)).astype(np.int32)
+
+    @classmethod
+    def _classes(cls, code_points):
+        code_points = code_points.astype(np.int64)
+        return np.select(
+            [(code_points >= 97) & (code_points <= 122), (code_points >= 48) & (code_points <= 57), code_points == 32],
+            [code_points - 97, code_points - 48 + 26, 36],
+            37,
+        )
+
+    def candidates(self, normalized: str, threshold: float) -> List[Tuple[Any, str]]:
+        """(key, name) of stored names whose quick_ratio bound with `normalized` reaches threshold"""
+        if not normalized or not self.names:
+            return []
+        if np is None:
+            index = self._fallback.get(threshold)
+            if index is None:
+                index = CandidateIndex(threshold, CandidateIndex.count_tokens(self.names))
+                for position, name in enumerate(self.names):
+                    if name:
+                        index.add(position, name)
+                self._fallback[threshold] = index
+            return [(self.keys[position], self.names[position]) for position in index.candidates(normalized)]
+
+        length = len(normalized)
+        factor = threshold / (2.0 - threshold)
+        low = int(np.searchsorted(self.lengths, max(1, length * factor - self._EPSILON), side="left"))
+        high = int(np.searchsorted(self.lengths, length / factor + self._EPSILON, side="right"))
+        if low >= high:
+            return []
+
+        probe = np.bincount(
+            self._classes(np.frombuffer(normalized.encode("utf-32-le"), dtype=np.uint32)), minlength=self._CLASSES
+        )
+        shared = np.zeros(high - low, dtype=np.int64)
+        for char_class in np.nonzero(probe)[0]:
+            shared += np.minimum(self.counts[char_class, low:high], probe[char_class])
+        rows = low + np.nonzero(2.0 * shared >= threshold * (length + self.lengths[low:high]) - self._EPSILON)[0]
+        if len(rows) and length <= self._LCS_MAX_LENGTH:
+            common = self._lcs_lengths(normalized, rows)
+            rows = rows[2.0 * common >= threshold * (length + self.lengths[rows]) - self._EPSILON]
+        return [(self.keys[row], self.names[row]) for row in rows.tolist()]
+
+    def _lcs_lengths(self, probe: str, rows):
+        """Longest common subsequence of `probe` with each stored name in `rows` (Hyyro's bit-vector LCS)"""
+        probe_points = np.frombuffer(probe.encode("utf-32-le"), dtype=np.uint32)
+        alphabet = np.unique(probe_points)
+        masks = np.zeros(len(alphabet), dtype=np.uint64)
+        for position, point in enumerate(probe_points):
+            masks[np.searchsorted(alphabet, point)] |= np.uint64(1 << position)
+
+        full = np.uint64((1 << len(probe)) - 1)
+        vector = np.full(len(rows), full, dtype=np.uint64)
+        starts, lengths = self.offsets[rows], self.lengths[rows]
+        for position in range(int(lengths.max())):
+            active = lengths > position
+            points = self.code_points[np.where(active, starts + position, 0)]
+            slot = np.minimum(np.searchsorted(alphabet, points), len(alphabet) - 1)
+            match = np.where(active & (alphabet[slot] == points), masks[slot], np.uint64(0))
+            step = vector & match
+            vector = ((vector + step) | (vector - step)) & full
+        # Each zero bit of the vector is one character of the LCS
+        return len(probe) - np.unpackbits(vector.view(np.uint8)).reshape(-1, 64).sum(axis=1)
+
+
+class DuplicateClusters:
+    """
+    Disjoint-set (union-find) over result indices.
+
+    Duplicate pairs are unioned into groups, so chains such as A ~ B ~ C end
+    up in one group whatever order the pairs were found in. Path halving plus
+    union by size keep every operation near constant time.
+    """
+
+    def __init__(self, size: int):
+        self._parent = list(range(size))
+        self._size = [1] * size
+
+    def find(self, item: int) -> int:
+        parent = self._parent
+        while parent[item] != item:
+            parent[item] = parent[parent[item]]
+            item = parent[item]
+        return item
+
+    def union(self, first: int, second: int) -> int:
+        """Merge the groups of both items; returns the root of the merged group"""
+        first, second = self.find(first), self.find(second)
+        if first == second:
+            return first
+        if self._size[first] < self._size[second]:
+            first, second = second, first
+        self._parent[second] = first
+        self._size[first] += self._size[second]
+        return first
+
+    def groups(self) -> List[List[int]]:
+        """Groups with more than one member, members ascending, ordered by first member"""
+        members = defaultdict(list)
+        for item in range(len(self._parent)):
+            members[self.find(item)].append(item)
+        return [group for group in members.values() if len(group) > 1]
+
+
+# Per-process state of pair-search workers (see _init_pair_worker)
+_pair_worker = {}
+
+
+def _init_pair_worker(left: List[Tuple[int, str]], right: Optional[List[Tuple[int, str]]],
+                      threshold: float, groups: Optional[Sequence[Any]], scorer: "SimilarityScorer"):
+    """Build the candidate index of a pair search once per worker process"""
+    StringSimplicityMatcher.scorer = scorer
+    left_names = dict(left)
+    right_names = left_names if right is None else dict(right)
+    frequencies = CandidateIndex.count_tokens(left_names.values())
+    if right is not None:
+        frequencies.update(CandidateIndex.count_tokens(right_names.values()))
+    index = CandidateIndex(threshold, frequencies)
+    for record_id, name in (left if right is None else right):
+        index.add(record_id, name)
+    _pair_worker.update(left=left, right_names=right_names, self_join=right is None,
+                        threshold=threshold, groups=groups, index=index)
+
+
+def _score_pair_block(start: int, stop: int) -> List[Tuple[int, int, float]]:
+    """Pairs of the probes left[start:stop]; a self join only pairs a probe with lower ids"""
+    state = _pair_worker
+    score = StringSimplicityMatcher._score_normalized
+    threshold, groups, right_names = state['threshold'], state['groups'], state['right_names']
+    pairs = []
+    for i, name in state['left'][start:stop]:
+        for j in state['index'].candidates(name):
+            if state['self_join']:
+                if j >= i or (groups is not None and groups[i] == groups[j]):
+                    continue
+                # Same argument order as the serial scan, so the scores are bit-identical
+                similarity = score(right_names[j], name, threshold)
+                if similarity >= threshold:
+                    pairs.append((j, i, similarity))
+            else:
+                similarity = score(name, right_names[j], threshold)
+                if similarity >= threshold:
+                    pairs.append((i, j, similarity))
+    return pairs
+
 
 class StringSimplicityMatcher:
     """
@@ -20,6 +575,14 @@ class StringSimplicityMatcher:
     # Similarity threshold for detecting possible duplicates (to flag for review)
     POSSIBLE_DUPLICATE_THRESHOLD = 0.70
 
+    # Scorer behind every similarity of this class (see set_scorer)
+    scorer: SimilarityScorer = SCORERS["sequence"]
+
+    # Below this many probe names a process pool costs more than it saves
+    PARALLEL_MIN_NAMES = 2000
+    # Probe blocks per worker: enough to balance uneven blocks, few enough to keep dispatch cheap
+    PARALLEL_BLOCKS_PER_WORKER = 8
+
     @staticmethod
     def calculate_similarity(str1: str, str2: str) -> float:
         """
@@ -36,17 +599,211 @@ class StringSimplicityMatcher:
         if not str1 or not str2:
             return 0.0
 
-        # Normalize strings: lowercase, strip whitespace
-        s1 = str1.lower().strip()
-        s2 = str2.lower().strip()
+        # Compare canonical keys (lowercase, no punctuation / legal suffixes, sorted tokens)
+        return StringSimplicityMatcher._score_normalized(
+            StringSimplicityMatcher._normalize(str1),
+            StringSimplicityMatcher._normalize(str2),
+        )
 
-        # Quick check for exact match
-        if s1 == s2:
-            return 1.0
+    @staticmethod
+    def canonical_name(name: Any) -> str:
+        """
+        Canonical matching key for a provider name, cached with LRU eviction.
 
-        # Calculate similarity using SequenceMatcher (similar to Jaro-Winkler logic)
-        matcher = difflib.SequenceMatcher(None, s1, s2)
-        return matcher.ratio()
+        "Blue Peak Plumbing LLC" and "Plumbing, Blue Peak" both become
+        "blue peak plumbing", so repeated dedup runs over the same providers
+        only pay for the scoring itself.
+        """
+        return _canonical_key(str(name or ""))
+
+    @staticmethod
+    def canonical_cache_info():
+        """Hit/miss/size statistics of the canonical-name cache"""
+        return _canonical_key.cache_info()
+
+    @staticmethod
+    def clear_canonical_cache():
+        _canonical_key.cache_clear()
+
+    _normalize = canonical_name
+
+    @staticmethod
+    def set_scorer(scorer: Any) -> SimilarityScorer:
+        """
+        Switch the scorer used by every similarity of this class: a
+        SimilarityScorer or a SCORERS name ("sequence", "jaro_winkler").
+        Returns the previous scorer.
+        """
+        previous = StringSimplicityMatcher.scorer
+        StringSimplicityMatcher.scorer = SCORERS[scorer] if isinstance(scorer, str) else scorer
+        return previous
+
+    @staticmethod
+    def _score_normalized(s1: str, s2: str, min_score: float = 0.0) -> float:
+        """
+        Similarity of two already-normalized strings with the active scorer.
+        May return 0.0 as soon as the pair provably cannot reach `min_score`.
+        """
+        return StringSimplicityMatcher.scorer.score(s1, s2, min_score)
+
+    @staticmethod
+    def score_many(query: str, candidates: Sequence[str], min_score: float = 0.0,
+                   query_first: bool = False) -> List[float]:
+        """
+        Similarities of one normalized name against many normalized candidates
+        (0.0 below min_score). Scores need not be symmetric, so query_first
+        picks the side the query is on (left, as in calculate_similarity(query, c)).
+        """
+        return StringSimplicityMatcher.scorer.score_many(query, candidates, min_score, query_first)
+
+    @staticmethod
+    def jaro_winkler_similarity(
+        str1: str, str2: str, min_score: float = 0.0, prefix_scale: float = 0.1
+    ) -> float:
+        """
+        Jaro-Winkler similarity between 0.0 and 1.0 of the canonical names.
+
+        Returns 0.0 early when the pair cannot reach `min_score`.
+        """
+        s1 = StringSimplicityMatcher._normalize(str1)
+        s2 = StringSimplicityMatcher._normalize(str2)
+        scorer = SCORERS["jaro_winkler"]
+        if prefix_scale != scorer.prefix_scale:
+            scorer = JaroWinklerScorer(scorer.backend, prefix_scale)
+        return scorer.score(s1, s2, min_score)
+
+    @staticmethod
+    def find_similar_pairs(
+        names: Sequence[str],
+        other_names: Optional[Sequence[str]] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        groups: Optional[Sequence[Any]] = None,
+        workers: int = 1,
+    ) -> List[Tuple[int, int, float]]:
+        """
+        Find all name pairs whose similarity is >= similarity_threshold.
+
+        Args:
+            names: Names to compare
+            other_names: If given, compare names x other_names (cross join);
+                otherwise compare names with themselves (i < j)
+            similarity_threshold: Minimum similarity to report
+            groups: Optional group label per entry of `names` (self join only);
+                pairs within the same group are skipped
+            workers: Processes to score with (0 = one per CPU); the result is
+                identical to the serial scan
+
+        Returns:
+            List of (index1, index2, similarity) sorted by (index1, index2),
+            i.e. the same order a nested-loop scan would produce
+        """
+        normalize = StringSimplicityMatcher._normalize
+        score = StringSimplicityMatcher._score_normalized
+
+        left = [normalize(n) for n in names]
+        right = left if other_names is None else [normalize(n) for n in other_names]
+
+        # Non-positive thresholds match everything, and other metrics escape the index bounds
+        if similarity_threshold <= 0.0 or not StringSimplicityMatcher.scorer.ratio_bounded:
+            return StringSimplicityMatcher._brute_force_pairs(
+                names, other_names, similarity_threshold, groups
+            )
+
+        workers = workers or os.cpu_count() or 1
+        if workers > 1 and len(left) >= StringSimplicityMatcher.PARALLEL_MIN_NAMES:
+            pairs = StringSimplicityMatcher._parallel_pairs(
+                left, None if other_names is None else right, similarity_threshold, groups, workers
+            )
+            if pairs is not None:
+                return pairs
+
+        frequencies = CandidateIndex.count_tokens(left)
+        if other_names is not None:
+            frequencies.update(CandidateIndex.count_tokens(right))
+        index = CandidateIndex(similarity_threshold, frequencies)
+
+        pairs = []
+        if other_names is None:
+            # Self join: probe with each name, then index it
+            for i, name in enumerate(left):
+                if name:
+                    for j in index.candidates(name):
+                        if groups is not None and groups[i] == groups[j]:
+                            continue
+                        similarity = score(right[j], name, similarity_threshold)
+                        if similarity >= similarity_threshold:
+                            pairs.append((j, i, similarity))
+                    index.add(i, name)
+        else:
+            for j, name in enumerate(right):
+                if name:
+                    index.add(j, name)
+            for i, name in enumerate(left):
+                if name:
+                    for j in index.candidates(name):
+                        similarity = score(name, right[j], similarity_threshold)
+                        if similarity >= similarity_threshold:
+                            pairs.append((i, j, similarity))
+
+        pairs.sort(key=lambda pair: (pair[0], pair[1]))
+        return pairs
+
+    @staticmethod
+    def _parallel_pairs(
+        left: List[str],
+        right: Optional[List[str]],
+        similarity_threshold: float,
+        groups: Optional[Sequence[Any]],
+        workers: int,
+    ) -> Optional[List[Tuple[int, int, float]]]:
+        """
+        find_similar_pairs over a process pool (None if no pool can be started).
+        Workers receive only (id, normalized name) tuples and score contiguous
+        blocks of probes; the merged pairs are sorted like the serial result.
+        """
+        probes = [(i, name) for i, name in enumerate(left) if name]
+        others = None if right is None else [(j, name) for j, name in enumerate(right) if name]
+        block = max(1, math.ceil(len(probes) / (workers * StringSimplicityMatcher.PARALLEL_BLOCKS_PER_WORKER)))
+        starts = range(0, len(probes), block)
+        try:
+            with ProcessPoolExecutor(
+                max_workers=workers,
+                initializer=_init_pair_worker,
+                initargs=(probes, others, similarity_threshold, groups, StringSimplicityMatcher.scorer),
+            ) as pool:
+                blocks = list(pool.map(_score_pair_block, starts, [start + block for start in starts]))
+        except (OSError, NotImplementedError) as e:
+            print(f"⚠️ Parallel pair search unavailable ({e}), scanning in one process")
+            return None
+
+        pairs = [pair for found in blocks for pair in found]
+        pairs.sort(key=lambda pair: (pair[0], pair[1]))
+        return pairs
+
+    @staticmethod
+    def _brute_force_pairs(
+        names: Sequence[str],
+        other_names: Optional[Sequence[str]] = None,
+        similarity_threshold: float = DEFAULT_SIMILARITY_THRESHOLD,
+        groups: Optional[Sequence[Any]] = None,
+    ) -> List[Tuple[int, int, float]]:
+        """Reference nested-loop implementation of find_similar_pairs (used for recall checks)"""
+        pairs = []
+        if other_names is None:
+            for i in range(len(names)):
+                for j in range(i + 1, len(names)):
+                    if groups is not None and groups[i] == groups[j]:
+                        continue
+                    similarity = StringSimplicityMatcher.calculate_similarity(names[i], names[j])
+                    if similarity >= similarity_threshold:
+                        pairs.append((i, j, similarity))
+        else:
+            for i in range(len(names)):
+                for j in range(len(other_names)):
+                    similarity = StringSimplicityMatcher.calculate_similarity(names[i], other_names[j])
+                    if similarity >= similarity_threshold:
+                        pairs.append((i, j, similarity))
+        return pairs
 
     @staticmethod
     def are_duplicates(
@@ -83,26 +840,12 @@ class StringSimplicityMatcher:
         Returns:
             List of tuples: (index1, index2, similarity_score) for potential duplicates
         """
-        duplicates = []
-
-        for i in range(len(combined_results)):
-            for j in range(i + 1, len(combined_results)):
-                result_i = combined_results[i]
-                result_j = combined_results[j]
-
-                # Only cross-check between different data sources
-                if result_i.get("data_source") == result_j.get("data_source"):
-                    continue
-
-                name_i = result_i.get("name", "")
-                name_j = result_j.get("name", "")
-
-                similarity = StringSimplicityMatcher.calculate_similarity(name_i, name_j)
-
-                if similarity >= similarity_threshold:
-                    duplicates.append((i, j, similarity))
-
-        return duplicates
+        # Only cross-check between different data sources
+        return StringSimplicityMatcher.find_similar_pairs(
+            [result.get("name", "") for result in combined_results],
+            similarity_threshold=similarity_threshold,
+            groups=[result.get("data_source") for result in combined_results],
+        )
 
     @staticmethod
     def deduplicate_federated_results(
@@ -114,6 +857,9 @@ class StringSimplicityMatcher:
         Deduplicate federated results by identifying duplicates across databases.
         Returns deduplicated list and a list of merged duplicates (for reference).
 
+        Duplicate pairs are clustered into groups (union-find), so A ~ B ~ C
+        chains keep exactly one entry whatever order the pairs were found in.
+
         Args:
             combined_results: List of provider dictionaries
             similarity_threshold: Threshold for detecting duplicates
@@ -123,12 +869,12 @@ class StringSimplicityMatcher:
                 - 'most_reviews': Keep the entry with most reviews/orders
 
         Returns:
-            Tuple of (deduplicated_results, duplicate_merges_metadata)
+            Tuple of (deduplicated_results, duplicate_merges_metadata); each merge
+            names the group it belongs to ("group", "group_size")
         """
         if not combined_results:
             return [], []
 
-        # Find duplicates
         duplicates = StringSimplicityMatcher.find_duplicates_in_results(
             combined_results, similarity_threshold
         )
@@ -136,64 +882,81 @@ class StringSimplicityMatcher:
         if not duplicates:
             return combined_results, []
 
-        # Track which indices to remove
+        # Whole duplicate groups (not single pairs) get one survivor each
+        groups = StringSimplicityMatcher.cluster_duplicates(len(combined_results), duplicates)
+        best_link = {}
+        for idx1, idx2, similarity in duplicates:
+            for idx in (idx1, idx2):
+                best_link[idx] = max(best_link.get(idx, 0.0), similarity)
+
         to_remove = set()
         duplicate_merges = []
+        for group_id, members in enumerate(groups):
+            keep_idx = StringSimplicityMatcher._choose_survivor(combined_results, members, keep_strategy)
+            kept = combined_results[keep_idx]
+            for remove_idx in members:
+                if remove_idx == keep_idx:
+                    continue
+                to_remove.add(remove_idx)
+                removed = combined_results[remove_idx]
 
-        for idx1, idx2, similarity in duplicates:
-            if idx1 in to_remove or idx2 in to_remove:
-                continue  # Already marked for removal
-
-            result1 = combined_results[idx1]
-            result2 = combined_results[idx2]
-
-            # Determine which to keep based on strategy
-            if keep_strategy == "highest_rated":
-                rating1 = float(result1.get("rating", 0))
-                rating2 = float(result2.get("rating", 0))
-                keep_idx, remove_idx = (idx1, idx2) if rating1 >= rating2 else (idx2, idx1)
-
-            elif keep_strategy == "primary_first":
-                # Primary database (companies) take precedence
-                is_primary1 = result1.get("data_source") == "Primary"
-                is_primary2 = result2.get("data_source") == "Primary"
-                if is_primary1 and not is_primary2:
-                    keep_idx, remove_idx = idx1, idx2
-                elif is_primary2 and not is_primary1:
-                    keep_idx, remove_idx = idx2, idx1
-                else:
-                    # Both same source, use rating
-                    rating1 = float(result1.get("rating", 0))
-                    rating2 = float(result2.get("rating", 0))
-                    keep_idx, remove_idx = (idx1, idx2) if rating1 >= rating2 else (idx2, idx1)
+                # Record the merge for reference
+                duplicate_merges.append({
+                    "kept": kept.get("name", "Unknown"),
+                    "kept_source": kept.get("data_source", "Unknown"),
+                    "removed": removed.get("name", "Unknown"),
+                    "removed_source": removed.get("data_source", "Unknown"),
+                    # Strongest pair linking the removed entry into its group
+                    "similarity": round(best_link[remove_idx], 3),
+                    "group": group_id,
+                    "group_size": len(members),
+                })
 
-            elif keep_strategy == "most_reviews":
-                reviews1 = result1.get("total_reviews", result1.get("total_orders", 0))
-                reviews2 = result2.get("total_reviews", result2.get("total_orders", 0))
-                keep_idx, remove_idx = (idx1, idx2) if reviews1 >= reviews2 else (idx2, idx1)
+        # Create deduplicated results
+        deduplicated = [r for i, r in enumerate(combined_results) if i not in to_remove]
 
-            else:
-                keep_idx, remove_idx = idx1, idx2
+        return deduplicated, duplicate_merges
 
-            to_remove.add(remove_idx)
+    @staticmethod
+    def cluster_duplicates(count: int, duplicates: Sequence[Tuple[int, int, float]]) -> List[List[int]]:
+        """
+        Duplicate groups (connected components of the pairs) among `count` results.
 
-            # Record the merge for reference
-            duplicate_merges.append({
-                "kept": combined_results[keep_idx].get("name", "Unknown"),
-                "kept_source": combined_results[keep_idx].get("data_source", "Unknown"),
-                "removed": combined_results[remove_idx].get("name", "Unknown"),
-                "removed_source": combined_results[remove_idx].get("data_source", "Unknown"),
-                "similarity": round(similarity, 3),
-            })
+        Returns:
+            Lists of result indices, members ascending, groups ordered by first member
+        """
+        clusters = DuplicateClusters(count)
+        for idx1, idx2, _ in duplicates:
+            clusters.union(idx1, idx2)
+        return clusters.groups()
 
-        # Create deduplicated results
-        deduplicated = [r for i, r in enumerate(combined_results) if i not in to_remove]
+    @staticmethod
+    def _choose_survivor(results: List[Dict[str, Any]], members: List[int], keep_strategy: str) -> int:
+        """
+        Index of the group member to keep:
+            - 'highest_rated': highest rating
+            - 'primary_first': Primary (Company) entries first, then highest rating
+            - 'most_reviews': most reviews/orders
+            - anything else: the first member
+        Ties go to the earliest result.
+        """
+        def rating(idx: int) -> float:
+            return float(results[idx].get("rating", 0) or 0)
 
-        return deduplicated, duplicate_merges
+        if keep_strategy == "highest_rated":
+            key = rating
+        elif keep_strategy == "primary_first":
+            key = lambda idx: (results[idx].get("data_source") == "Primary", rating(idx))
+        elif keep_strategy == "most_reviews":
+            key = lambda idx: results[idx].get("total_reviews", results[idx].get("total_orders", 0)) or 0
+        else:
+            return members[0]
+        # max() keeps the first of equal keys; members are ascending
+        return max(members, key=key)
 
     @staticmethod
     def enhance_result_with_cross_source_info(
-        result: Dict[str, Any], other_sources: List[Dict[str, Any]]
+        result: Dict[str, Any], other_sources: List[Dict[str, Any]], similarity_threshold: float = 0.75
     ) -> Dict[str, Any]:
         """
         Enhance a result with information from similar entries in other data sources.
@@ -202,12 +965,12 @@ class StringSimplicityMatcher:
         Args:
             result: Provider result from one database
             other_sources: List of results from other database sources
+            similarity_threshold: Minimum similarity of a cross-source match
 
         Returns:
             Enhanced result with additional metadata
         """
         name = result.get("name", "")
-        similarity_threshold = 0.75
 
         # Find similar entries from other sources
         similar_entries = []
@@ -227,25 +990,82 @@ class StringSimplicityMatcher:
 
         # Add cross-source info
         if similar_entries:
-            best_match = similar_entries[0]["entry"]
-            result["cross_source_match"] = {
-                "matched_name": best_match.get("name"),
-                "matched_source": best_match.get("data_source"),
-                "similarity": round(similar_entries[0]["similarity"], 3),
-                "combined_rating": round(
-                    (
-                        float(result.get("rating", 0))
-                        + float(best_match.get("rating", 0))
-                    )
-                    / 2,
-                    2,
-                ),
-            }
-
-            result["found_in_both_sources"] = True
+            StringSimplicityMatcher._set_cross_source_match(
+                result, similar_entries[0]["entry"], similar_entries[0]["similarity"]
+            )
 
         return result
 
+    @staticmethod
+    def enhance_results_with_cross_source_info(
+        results: List[Dict[str, Any]],
+        other_sources: List[Dict[str, Any]],
+        similarity_threshold: float = 0.75,
+    ) -> List[Dict[str, Any]]:
+        """
+        enhance_result_with_cross_source_info for a whole result list in one pass.
+
+        The other-source names are indexed once (CharacterCountIndex) and each
+        result only scores the candidates that can reach the threshold, instead
+        of every other entry. Matches, ties and fields are the same as calling
+        the per-result method for each result.
+
+        Args:
+            results: Provider results to enrich (updated in place)
+            other_sources: Results from the other database source(s)
+            similarity_threshold: Minimum similarity of a cross-source match
+
+        Returns:
+            The enriched results
+        """
+        if similarity_threshold <= 0.0 or not StringSimplicityMatcher.scorer.ratio_bounded:
+            # Everything matches, or the index bounds do not hold for the scorer: compare every entry
+            for result in results:
+                StringSimplicityMatcher.enhance_result_with_cross_source_info(
+                    result, other_sources, similarity_threshold
+                )
+            return results
+
+        normalize = StringSimplicityMatcher._normalize
+        index = CharacterCountIndex([normalize(other.get("name", "")) for other in other_sources],
+                                    range(len(other_sources)))
+        for result in results:
+            name = normalize(result.get("name", ""))
+            source = result.get("data_source")
+            # Ascending positions: the first of equally similar entries wins, as in the per-result sort
+            found = sorted(
+                (position, candidate) for position, candidate in index.candidates(name, similarity_threshold)
+                if other_sources[position].get("data_source") != source
+            )
+            scores = StringSimplicityMatcher.score_many(
+                name, [candidate for _, candidate in found], similarity_threshold, query_first=True
+            )
+            best = None
+            for (position, _), similarity in zip(found, scores):
+                if similarity >= similarity_threshold and (best is None or similarity > best[1]):
+                    best = (position, similarity)
+            if best is not None:
+                StringSimplicityMatcher._set_cross_source_match(result, other_sources[best[0]], best[1])
+        return results
+
+    @staticmethod
+    def _set_cross_source_match(result: Dict[str, Any], best_match: Dict[str, Any], similarity: float):
+        result["cross_source_match"] = {
+            "matched_name": best_match.get("name"),
+            "matched_source": best_match.get("data_source"),
+            "similarity": round(similarity, 3),
+            "combined_rating": round(
+                (
+                    float(result.get("rating", 0))
+                    + float(best_match.get("rating", 0))
+                )
+                / 2,
+                2,
+            ),
+        }
+
+        result["found_in_both_sources"] = True
+
     @staticmethod
     def get_similarity_report(
         combined_results: List[Dict[str, Any]],
@@ -273,11 +1093,23 @@ class StringSimplicityMatcher:
 
         confirmed_duplicates = [d for d in duplicates if d[2] >= (similarity_threshold + 0.10)]
 
+        groups = StringSimplicityMatcher.cluster_duplicates(len(combined_results), duplicates)
+
         return {
             "total_results": len(combined_results),
             "total_duplicates_found": len(duplicates),
             "possible_duplicates": len(possible_duplicates),
             "confirmed_duplicates": len(confirmed_duplicates),
+            "duplicate_groups": [
+                [
+                    {
+                        "name": combined_results[idx].get("name"),
+                        "source": combined_results[idx].get("data_source"),
+                    }
+                    for idx in members
+                ]
+                for members in groups
+            ],
             "duplicate_details": [
                 {
                     "name1": combined_results[d[0]].get("name"),
@@ -0,0 +1,42 @@
+"""
+Typed sort keys for rows shown in Treeviews.
+
+The results view used to sort by reading every row back out of the tree and
+parsing the display strings ("4.5 ⭐", "$80.0/hr 💰") into numbers again.
+Rows are now kept as objects (see virtual_tree.VirtualTreeview) with their
+sort keys computed once, when the row is added.
+
+Sort fields are functions row -> comparable value, or None when the row has
+no value; rows without a value always sort last, whatever the direction.
+"""
+
+from typing import Any, Callable, Dict, List, Sequence, Tuple
+
+# (field, descending) pairs, most significant first
+SortSpec = Sequence[Tuple[str, bool]]
+
+
+def row_sort_keys(sort_fields: Dict[str, Callable[[Any], Any]], row: Any) -> Dict[str, Tuple[bool, Any]]:
+    """Typed (missing, value) key of every sort field for one row"""
+    keys = {}
+    for field, extract in sort_fields.items():
+        try:
+            value = extract(row)
+        except (TypeError, ValueError, KeyError):
+            value = None
+        # Missing values compare on the flag alone
+        keys[field] = (True, 0) if value is None else (False, value)
+    return keys
+
+
+def sort_by_keys(items: List[Any], keys_of: Callable[[Any], Dict[str, Tuple[bool, Any]]], spec: SortSpec) -> List[Any]:
+    """Items ordered by a multi-key spec, stable for equal keys, missing values last"""
+    order = list(items)
+    # Stable sorts from the least to the most significant key allow mixed directions
+    for field, descending in reversed(spec):
+        if descending:
+            # Present rows (flag False) still first: sort on (present, value) reversed
+            order.sort(key=lambda item: (not keys_of(item)[field][0], keys_of(item)[field][1]), reverse=True)
+        else:
+            order.sort(key=lambda item: keys_of(item)[field])
+    return order
@@ -0,0 +1,80 @@
+"""
+Lazy, keyset-paginated filling of virtualized Treeviews.
+
+The order and admin listings used to load every row up front. A LazyTreePager
+asks for one page at a time (fetch_page(cursor) -> (rows, next_cursor)),
+appends it to a virtual_tree.VirtualTreeview and loads the next page when the
+user scrolls close to the end of what is loaded.
+"""
+
+from typing import Callable, Dict, List, Optional, Tuple
+
+from config import PAGINATION_CONFIG
+
+
+class LazyTreePager:
+    """Feeds a VirtualTreeview from a keyset-paginated source as the user scrolls"""
+
+    def __init__(
+        self,
+        view,
+        fetch_page: Callable[[Optional[Tuple]], Tuple[List[Dict], Optional[Tuple]]],
+        prefetch_at: float = None,
+        on_error: Optional[Callable[[Exception], None]] = None,
+    ):
+        self.view = view
+        self.fetch_page = fetch_page
+        self.on_error = on_error
+
+        self.cursor: Optional[Tuple] = None
+        self.exhausted = False
+        self.rows_loaded = 0
+        self.pages_loaded = 0
+        self._loading = False
+        self._scheduled = False
+
+        # The view reports when its window reaches the prefetch point of the loaded rows
+        self.view.prefetch_at = PAGINATION_CONFIG.get('prefetch_at', 0.9) if prefetch_at is None else prefetch_at
+        self.view.on_near_end = self._on_near_end
+
+    @staticmethod
+    def page_size() -> int:
+        return PAGINATION_CONFIG.get('page_size', 50)
+
+    def reset(self):
+        """Clear the view and load the first page again"""
+        self.cursor = None
+        self.exhausted = False
+        self.rows_loaded = 0
+        self.pages_loaded = 0
+        self.view.clear()
+        self.load_next_page()
+
+    def load_next_page(self):
+        self._scheduled = False
+        if self._loading or self.exhausted:
+            return
+
+        self._loading = True
+        try:
+            rows, next_cursor = self.fetch_page(self.cursor)
+        except Exception as e:
+            # Stop paging until the next reset() rather than retrying on every scroll event
+            self.exhausted = True
+            if self.on_error:
+                self.on_error(e)
+            return
+        finally:
+            self._loading = False
+
+        self.rows_loaded += len(rows)
+        self.pages_loaded += 1
+        self.cursor = next_cursor
+        self.exhausted = next_cursor is None
+        self.view.extend(rows)
+
+    def _on_near_end(self):
+        # A first page shorter than the view also counts as near the end, so the view fills itself
+        if not (self.exhausted or self._loading or self._scheduled):
+            self._scheduled = True
+            self.view.tree.after_idle(self.load_next_page)
@@ -0,0 +1,277 @@
+"""
+Virtualized ttk.Treeview for long result lists.
+
+Search results, order lists and the admin listings can grow to thousands of
+rows. A VirtualTreeview keeps the rows as Python objects and materializes
+only a window of Treeview items (the rows in view plus a small buffer) whose
+values are rewritten as the view moves. Scrolling, appending pages and
+re-sorting therefore touch the same handful of items whatever the number of
+rows.
+
+Because the Treeview only ever holds the window, the view drives the
+scrollbar, mouse wheel and arrow keys itself, and tracks the selection by row
+so a selected row stays selected while it scrolls out of view and back.
+"""
+
+import tkinter as tk
+from tkinter import ttk
+from typing import Any, Callable, Dict, Iterable, List, Optional, Sequence
+
+from config import VIRTUAL_TREE_CONFIG
+from tree_model import SortSpec, row_sort_keys, sort_by_keys
+
+# Slot content when the list is empty and a placeholder row is shown
+_PLACEHOLDER = object()
+
+
+class VirtualTreeview:
+    """Shows a row list in a Treeview by materializing only the visible window"""
+
+    def __init__(
+        self,
+        tree,
+        format_row: Callable[[Any], Sequence[Any]],
+        scrollbar=None,
+        empty_values: Sequence[Any] = (),
+        sort_fields: Optional[Dict[str, Callable[[Any], Any]]] = None,
+        buffer_rows: int = None,
+    ):
+        self.tree = tree
+        self.format_row = format_row
+        self.scrollbar = scrollbar
+        self.empty_values = tuple(empty_values)
+        self.sort_fields = sort_fields or {}
+        self.buffer_rows = VIRTUAL_TREE_CONFIG.get('buffer_rows', 10) if buffer_rows is None else buffer_rows
+
+        # Called (at most once per refresh) when the view reaches `prefetch_at` of the rows; see LazyTreePager
+        self.on_near_end: Optional[Callable[[], None]] = None
+        self.prefetch_at = 1.0
+
+        self._rows: List[Any] = []
+        self._keys: List[Dict] = []
+        self._top = 0
+        self._slots: List[str] = []          # pooled item ids, in display order
+        self._slot_rows: List[Any] = []      # row object currently shown by each slot
+        self._selected: Dict[int, Any] = {}  # id(row) -> row
+        self._applied_selection = set()
+        self._row_height = self._style_row_height()
+
+        self.tree.configure(yscrollcommand='')
+        if self.scrollbar is not None:
+            self.scrollbar.configure(command=self.yview)
+        self.tree.bind('<<TreeviewSelect>>', self._on_select)
+        self.tree.bind('<Configure>', lambda event: self.refresh())
+        self.tree.bind('<MouseWheel>', self._on_mousewheel)
+        self.tree.bind('<Button-4>', lambda event: self._scroll_units(-VIRTUAL_TREE_CONFIG.get('wheel_rows', 3)))
+        self.tree.bind('<Button-5>', lambda event: self._scroll_units(VIRTUAL_TREE_CONFIG.get('wheel_rows', 3)))
+        for key, step in (('<Up>', -1), ('<Down>', 1), ('<Prior>', 'page_up'), ('<Next>', 'page_down'),
+                          ('<Home>', 'home'), ('<End>', 'end')):
+            self.tree.bind(key, lambda event, step=step: self._on_key(step))
+
+    def _style_row_height(self) -> int:
+        try:
+            return int(ttk.Style(self.tree).lookup('Treeview', 'rowheight') or 20)
+        except (tk.TclError, ValueError, TypeError, AttributeError):
+            return 20
+
+    # ------------------------------------------------------------------
+    # ROWS
+    # ------------------------------------------------------------------
+
+    def set_rows(self, rows: Iterable[Any], format_row: Callable[[Any], Sequence[Any]] = None):
+        """Replace every row (and optionally the formatter) and show the top of the list"""
+        if format_row is not None:
+            self.format_row = format_row
+        self._rows = list(rows)
+        self._keys = [row_sort_keys(self.sort_fields, row) for row in self._rows] if self.sort_fields else []
+        self._top = 0
+        self._selected.clear()
+        self._slot_rows = [None] * len(self._slots)
+        self.refresh()
+
+    def extend(self, rows: Iterable[Any]):
+        """Append rows (e.g. the next page) without moving the view"""
+        rows = list(rows)
+        self._rows.extend(rows)
+        if self.sort_fields:
+            self._keys.extend(row_sort_keys(self.sort_fields, row) for row in rows)
+        self.refresh()
+
+    def clear(self):
+        self.set_rows([])
+
+    def rows(self) -> List[Any]:
+        """Rows in their current display order"""
+        return list(self._rows)
+
+    def __len__(self) -> int:
+        return len(self._rows)
+
+    def row(self, iid: str) -> Optional[Any]:
+        """Row shown by a materialized item, None for unknown items and the placeholder"""
+        try:
+            row = self._slot_rows[self._slots.index(iid)]
+        except ValueError:
+            return None
+        return None if row is _PLACEHOLDER else row
+
+    def selected_rows(self) -> List[Any]:
+        """Selected rows in display order, including ones scrolled out of view"""
+        if not self._selected:
+            return []
+        return [row for row in self._rows if id(row) in self._selected]
+
+    def sort(self, spec: SortSpec):
+        """Reorder the rows by their precomputed sort keys and show the top of the list"""
+        if not self._rows or not self.sort_fields:
+            return
+        pairs = sort_by_keys(list(zip(self._rows, self._keys)), lambda pair: pair[1], spec)
+        self._rows = [row for row, _ in pairs]
+        self._keys = [keys for _, keys in pairs]
+        self._top = 0
+        self.refresh()
+
+    # ------------------------------------------------------------------
+    # WINDOW
+    # ------------------------------------------------------------------
+
+    def visible_rows(self) -> int:
+        try:
+            configured = int(self.tree.cget('height'))
+        except (tk.TclError, ValueError, TypeError):
+            configured = 10
+        # Packed with expand=True the widget can be taller than its configured height (minus the heading row)
+        measured = self.tree.winfo_height() // self._row_height - 1
+        return max(configured, measured, 1)
+
+    def refresh(self):
+        """Materialize the window at the current position"""
+        visible = self.visible_rows()
+        count = len(self._rows)
+        self._top = max(0, min(self._top, count - visible))
+
+        if count:
+            shown = self._rows[self._top:self._top + visible + self.buffer_rows]
+        else:
+            shown = [_PLACEHOLDER] if self.empty_values else []
+
+        # Grow or shrink the item pool to the window size
+        while len(self._slots) < len(shown):
+            self._slots.append(self.tree.insert('', tk.END, values=()))
+            self._slot_rows.append(None)
+        if len(self._slots) > len(shown):
+            self.tree.delete(*self._slots[len(shown):])
+            del self._slots[len(shown):]
+            del self._slot_rows[len(shown):]
+
+        # Only slots whose row changed are reformatted
+        for position, row in enumerate(shown):
+            if self._slot_rows[position] is not row:
+                values = self.empty_values if row is _PLACEHOLDER else tuple(self.format_row(row))
+                self.tree.item(self._slots[position], values=values)
+                self._slot_rows[position] = row
+
+        selected = [slot for slot, row in zip(self._slots, self._slot_rows) if id(row) in self._selected]
+        if set(selected) != set(self.tree.selection()):
+            self.tree.selection_set(selected)
+        self._applied_selection = set(selected)
+        self.tree.yview_moveto(0)
+
+        if self.scrollbar is not None:
+            self.scrollbar.set(*self.yview())
+        # A list shorter than the view also counts as near the end, so the view fills itself
+        if count and self.on_near_end is not None and self._top + visible >= self.prefetch_at * count:
+            self.on_near_end()
+
+    def yview(self, *args):
+        """Scrollbar protocol: no args -> (first, last) fractions; 'moveto' / 'scroll' move the window"""
+        count = len(self._rows)
+        visible = self.visible_rows()
+        if not args:
+            if count <= visible:
+                return 0.0, 1.0
+            return self._top / count, min(1.0, (self._top + visible) / count)
+
+        if args[0] == 'moveto':
+            self.scroll_to(int(float(args[1]) * count))
+        elif args[0] == 'scroll':
+            step = visible if args[2] == 'pages' else 1
+            self.scroll_to(self._top + int(args[1]) * step)
+        return None
+
+    def scroll_to(self, index: int):
+        """Put row `index` at the top of the view (clamped)"""
+        top = max(0, min(index, len(self._rows) - self.visible_rows()))
+        if top != self._top:
+            self._top = top
+            self.refresh()
+
+    def see(self, index: int):
+        """Scroll just enough for row `index` to be visible"""
+        visible = self.visible_rows()
+        if index < self._top:
+            self.scroll_to(index)
+        elif index >= self._top + visible:
+            self.scroll_to(index - visible + 1)
+
+    # ------------------------------------------------------------------
+    # INPUT
+    # ------------------------------------------------------------------
+
+    def _scroll_units(self, units: int):
+        self.scroll_to(self._top + units)
+        return 'break'
+
+    def _on_mousewheel(self, event):
+        # Windows reports multiples of 120 per notch, macOS small deltas
+        notches = int(event.delta / 120) or (1 if event.delta > 0 else -1)
+        return self._scroll_units(-notches * VIRTUAL_TREE_CONFIG.get('wheel_rows', 3))
+
+    def _on_key(self, step):
+        count = len(self._rows)
+        if not count:
+            return 'break'
+        current = self._focus_index()
+        visible = self.visible_rows()
+        if step == 'home':
+            index = 0
+        elif step == 'end':
+            index = count - 1
+        elif step == 'page_up':
+            index = current - visible
+        elif step == 'page_down':
+            index = current + visible
+        else:
+            index = current + step
+        index = max(0, min(index, count - 1))
+
+        row = self._rows[index]
+        self._selected = {id(row): row}
+        self.see(index)
+        self.refresh()
+        slot = self._slots[index - self._top]
+        self.tree.focus(slot)
+        self.tree.event_generate('<<TreeviewSelect>>')
+        return 'break'
+
+    def _focus_index(self) -> int:
+        """Row index of the (first) selected row, or just above the view when nothing is selected"""
+        for position, row in enumerate(self._slot_rows):
+            if id(row) in self._selected:
+                return self._top + position
+        if self._selected:
+            for index, row in enumerate(self._rows):
+                if id(row) in self._selected:
+                    return index
+        return self._top - 1
+
+    def _on_select(self, event=None):
+        current = set(self.tree.selection())
+        if current == self._applied_selection:
+            # Echo of a selection the view applied itself
+            return
+        self._selected = {
+            id(row): row for slot, row in zip(self._slots, self._slot_rows)
+            if slot in current and row is not _PLACEHOLDER and row is not None
+        }
+        self._applied_selection = current